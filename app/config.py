@@ -0,0 +1,29 @@
+import os
+
+
+class Settings:
+    ingest_batch_size = int(os.environ.get("SWIFT_INGEST_BATCH_SIZE", "5000"))
+    db_mode = os.environ.get("SWIFT_DB_MODE", "threaded")
+    db_threads = int(os.environ.get("SWIFT_DB_THREADS", "8"))
+    db_pool_size = int(os.environ.get("SWIFT_DB_POOL_SIZE", "5"))
+    db_max_overflow = int(os.environ.get("SWIFT_DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout = float(os.environ.get("SWIFT_DB_POOL_TIMEOUT", "30"))
+    database_url = os.environ.get("DATABASE_URL")
+    database_path = os.environ.get("DATABASE_PATH")
+    sqlite_profile = os.environ.get("SWIFT_SQLITE_PROFILE", "performance")
+    db_read_pool_size = int(os.environ.get("SWIFT_DB_READ_POOL_SIZE", "10"))
+    db_read_max_overflow = int(os.environ.get("SWIFT_DB_READ_MAX_OVERFLOW", "20"))
+    lookup_max_codes = int(os.environ.get("SWIFT_LOOKUP_MAX_CODES", "1000"))
+    country_page_max_limit = int(os.environ.get("SWIFT_COUNTRY_PAGE_MAX_LIMIT", "1000"))
+    stream_batch_size = int(os.environ.get("SWIFT_STREAM_BATCH_SIZE", "1000"))
+    search_max_limit = int(os.environ.get("SWIFT_SEARCH_MAX_LIMIT", "100"))
+    bank_search_include_address = os.environ.get("SWIFT_BANK_SEARCH_INCLUDE_ADDRESS", "false").lower() in ("1", "true", "yes")
+    reload_poll_interval = float(os.environ.get("SWIFT_RELOAD_POLL_INTERVAL", "30"))
+    admin_token = os.environ.get("SWIFT_ADMIN_TOKEN")
+    parser_snapshot = os.environ.get("SWIFT_PARSER_SNAPSHOT", "true").lower() in ("1", "true", "yes")
+    readiness_retry_after = int(os.environ.get("SWIFT_READINESS_RETRY_AFTER", "5"))
+    import_workers = int(os.environ.get("SWIFT_IMPORT_WORKERS", "1"))
+    import_dir = os.environ.get("SWIFT_IMPORT_DIR")
+    bulk_max_items = int(os.environ.get("SWIFT_BULK_MAX_ITEMS", "50000"))
+    write_batch_window_ms = float(os.environ.get("SWIFT_WRITE_BATCH_WINDOW_MS", "0"))
+    write_batch_size = int(os.environ.get("SWIFT_WRITE_BATCH_SIZE", "100"))
@@ -0,0 +1,39 @@
+import hmac
+from typing import Optional
+from fastapi import HTTPException
+from app.config import Settings
+from app.services.dataset_reloader import DatasetReloader
+from app.services.swift_service import SwiftCodeService
+
+
+class AdminController:
+    def __init__(self, dataset_reloader: DatasetReloader, swift_service: SwiftCodeService):
+        self.dataset_reloader = dataset_reloader
+        self.swift_service = swift_service
+
+    @staticmethod
+    def authorize(admin_token: Optional[str]) -> None:
+        """
+        Admin calls need X-Admin-Token when SWIFT_ADMIN_TOKEN is set.
+        """
+        if Settings.admin_token and not hmac.compare_digest(admin_token or "", Settings.admin_token):
+            raise HTTPException(status_code=401, detail="Invalid admin token")
+
+    async def reload_dataset(self, admin_token: Optional[str] = None):
+        self.authorize(admin_token)
+
+        if self.dataset_reloader.reloading:
+            raise HTTPException(status_code=409, detail="A dataset reload is already running")
+
+        try:
+            return await self.dataset_reloader.reload()
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error reloading dataset: {str(e)}")
+
+    async def relink_branches(self, admin_token: Optional[str] = None):
+        self.authorize(admin_token)
+
+        try:
+            return await self.swift_service.relink_branches()
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error rebuilding branch links: {str(e)}")
@@ -1,17 +1,25 @@
-from app.models.types import SwiftCodeBase
+from app.models.types import SwiftCodeBase, SwiftCodeLookupRequest
+from app.config import Settings
 from app.services.swift_service import SwiftCodeService
-from fastapi import HTTPException
-from app.models.swift_code import SwiftCode
-from app.models.branch_association import BranchAssociation
+from app.services.import_jobs import ImportJobManager
+from fastapi import HTTPException, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from typing import Any, Dict, List, Optional
+from app.repositories.swift_code_repository import SwiftCodeAlreadyExistsError
+from app.utils.validation import SWIFT_CODE_PATTERN, record_rejection
+import json
 import re
-import uuid
 
-SWIFT_CODE_PATTERN = re.compile(r'^[A-Z0-9]{4,11}(?:XXX)?$')
+SWIFT_PREFIX_PATTERN = re.compile(r'^[A-Z0-9]{1,11}$')
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
 
 
 class SwiftCodeController:
-    def __init__(self, swift_service: SwiftCodeService):
+    def __init__(self, swift_service: SwiftCodeService, import_jobs: Optional[ImportJobManager] = None):
         self.swift_service = swift_service
+        self.import_jobs = import_jobs
 
     def validate_swift_code(self, swift_code: str) -> bool:
         if not SWIFT_CODE_PATTERN.match(swift_code):
@@ -24,7 +32,6 @@ class SwiftCodeController:
         return swift_code.endswith('XXX')
     
     async def create_swift_code(self, swift_data: SwiftCodeBase):
-        print(f"Creating SWIFT code: {swift_data}")
         swift_code = swift_data.swift_code.upper()
         
         try:
@@ -33,21 +40,41 @@ class SwiftCodeController:
             raise HTTPException(status_code=400, detail=str(e))
         
         try:
-            existing = await self.swift_service.get_swift_code(swift_code)
-            if existing:
-                raise HTTPException(status_code=409, detail=f"Swift code {swift_code} already exists.")
-            
             await self.swift_service.create_swift_code(swift_data.model_dump())
             return {"message": f"SWIFT code {swift_code} created successfully"}
-            
-        except HTTPException:
-            raise
+
+        except SwiftCodeAlreadyExistsError as e:
+            raise HTTPException(status_code=409, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error creating SWIFT code: {str(e)}")
 
+    async def upsert_swift_code(self, swift_code: str, swift_data: SwiftCodeBase):
+        """
+        Idempotent create-or-replace of the code in the path; returns the message and whether it was
+        created, updated or already unchanged.
+        """
+        swift_code = swift_code.upper()
+
+        if swift_data.swift_code.upper() != swift_code:
+            raise HTTPException(
+                status_code=400,
+                detail=f"SWIFT code in the body ({swift_data.swift_code}) does not match the path ({swift_code})"
+            )
+
+        try:
+            self.validate_swift_code(swift_code)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        try:
+            status = await self.swift_service.upsert_swift_code(swift_data.model_dump())
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error saving SWIFT code: {str(e)}")
+
+        return {"message": f"SWIFT code {swift_code} {status}", "status": status}
+
 
     async def get_swift_code(self, swift_code: str):
-        print(f"Getting SWIFT code from controller: {swift_code}")
         result = await self.swift_service.get_swift_code(swift_code)
 
         if not result:
@@ -55,61 +82,199 @@ class SwiftCodeController:
 
         return result
     
+    async def get_swift_code_response(self, swift_code: str) -> Response:
+        cache = self.swift_service.response_cache
+        body = cache.get_swift_code(swift_code)
+
+        if body is None:
+            generation = cache.generation
+            result = await self.get_swift_code(swift_code)
+            body = cache.put_swift_code(swift_code, result, generation)
+
+        return Response(content=body, media_type="application/json")
+
+    async def lookup_swift_codes(self, lookup: SwiftCodeLookupRequest):
+        if len(lookup.swift_codes) > Settings.lookup_max_codes:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many SWIFT codes: {len(lookup.swift_codes)} (limit {Settings.lookup_max_codes})"
+            )
+
+        return await self.swift_service.get_swift_codes(lookup.swift_codes)
+
+    async def search_prefix(self, prefix: str, limit: int):
+        prefix = prefix.strip().upper()
+
+        if not SWIFT_PREFIX_PATTERN.match(prefix):
+            raise HTTPException(status_code=400, detail=f"Invalid SWIFT code prefix: {prefix}")
+
+        return {
+            'query': prefix,
+            'swift_codes': await self.swift_service.search_prefix(prefix, limit)
+        }
+
+    async def search_bank_name(self, query: str, limit: int, country_iso2: Optional[str] = None):
+        return {
+            'query': query,
+            'swift_codes': await self.swift_service.search_bank_name(query, limit, country_iso2)
+        }
+
     async def get_country_swift_codes(self, country_iso2: str):
         result = await self.swift_service.get_country_swift_codes(country_iso2)
 
         if not result:
             raise HTTPException(status_code=404, detail=f"No SWIFT codes found for country {country_iso2}")
         return result
+
+    async def get_country_swift_codes_response(self, country_iso2: str) -> Response:
+        cache = self.swift_service.response_cache
+        body = cache.get_country(country_iso2)
+
+        if body is None:
+            generation = cache.generation
+            result = await self.get_country_swift_codes(country_iso2)
+            body = cache.put_country(country_iso2, result, generation)
+
+        return Response(content=body, media_type="application/json")
     
+    async def get_country_swift_codes_page(self, country_iso2: str, limit: int, after: Optional[str] = None):
+        return await self.swift_service.get_country_swift_codes_page(country_iso2, limit, after)
+
+    def stream_country_swift_codes(self, country_iso2: str) -> StreamingResponse:
+        return StreamingResponse(
+            self.swift_service.stream_country_swift_codes(country_iso2),
+            media_type="application/x-ndjson"
+        )
+
+    async def import_swift_codes(self, file: UploadFile):
+        if self.import_jobs is None:
+            raise HTTPException(status_code=503, detail="Imports are not enabled")
+
+        try:
+            return await self.import_jobs.submit(file.filename, file.read)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        finally:
+            await file.close()
+
+    def get_import_job(self, job_id: str):
+        job = self.import_jobs.get_job(job_id) if self.import_jobs is not None else None
+
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Import job {job_id} not found")
+        return job
+
     async def delete_swift_code(self, swift_code: str):
         if await self.swift_service.delete_swift_code(swift_code):
             return {"message": f"SWIFT code {swift_code} deleted successfully"}
         else:
             raise HTTPException(status_code=404, detail=f"SWIFT code {swift_code} not found")
         
-    async def bulk_create_swift_codes(self, swift_codes: list[SwiftCodeBase]):
-        swift_code_models = []
-        associations = []
-        branch_hq_map = {}
-        
-        for data in swift_codes:
-            swift_code_str = data['swift_code'].upper()
+    async def read_bulk_items(self, request: Request) -> List[Any]:
+        """
+        Read a bulk body: a JSON array, or NDJSON (one object per line) parsed as it streams in.
+        """
+        content_type = request.headers.get('content-type', '').split(';')[0].strip().lower()
 
+        if content_type in NDJSON_CONTENT_TYPES:
+            items, buffer, line_number = [], b'', 0
+            async for chunk in request.stream():
+                *lines, buffer = (buffer + chunk).split(b'\n')
+                for line in lines:
+                    line_number += 1
+                    if line.strip():
+                        items.append(self._parse_ndjson_line(line, line_number))
+                self._check_bulk_size(items)
+            if buffer.strip():
+                items.append(self._parse_ndjson_line(buffer, line_number + 1))
+        else:
             try:
-                self.SwiftCodeController.validate_swift_code(swift_code_str)
-            except ValueError:
-                continue
+                items = json.loads(await request.body())
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+            if not isinstance(items, list):
+                raise HTTPException(status_code=400, detail="Expected a JSON array of SWIFT codes")
 
+        self._check_bulk_size(items)
+        return items
 
-            swift_code_model = SwiftCode(
-                swift_code=data['swift_code'],
-                bank_name=data['bank_name'],
-                address=data['address'],
-                country_iso2=data['country_iso2'],
-                country_name=data['country_name'],
-                is_headquarters=data['is_headquarters']
+    @staticmethod
+    def _parse_ndjson_line(line: bytes, line_number: int) -> Any:
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON on line {line_number}: {e}")
+
+    @staticmethod
+    def _check_bulk_size(items: List[Any]) -> None:
+        if len(items) > Settings.bulk_max_items:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Too many SWIFT codes: more than {Settings.bulk_max_items} in one request"
             )
-            swift_code_models.append(swift_code_model)
-        
-            if not data['is_headquarters']:
-                potential_hq = swift_code_str[:-3] + 'XXX'
-                if potential_hq not in branch_hq_map:
-                    branch_hq_map[potential_hq] = []
-                branch_hq_map[potential_hq].append(swift_code_str)
-        
-        self.swift_service.add_many_swift_codes(swift_code_models)
-    
-        for hq_code, branch_codes in branch_hq_map.items():
-            hq = self.db.query(SwiftCode).filter(SwiftCode.swift_code == hq_code).first()
-            if hq:
-                for branch_code in branch_codes:
-                    association = BranchAssociation(
-                        id=str(uuid.uuid4()),
-                        headquarter_swift=hq_code,
-                        branch_swift=branch_code
-                    )
-                    associations.append(association)
-        
-        self.swift_service.add_many_associations(associations)
-    
\ No newline at end of file
+
+    async def bulk_create_swift_codes(self, items: List[Any]):
+        """
+        Validate every item up front, then insert the valid, new ones in one transaction.
+        Each item gets a result: created, invalid, duplicate (repeated in the request) or exists.
+        """
+        results: List[Dict[str, Any]] = []
+        records: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Dict[str, Any]] = {}
+
+        for index, item in enumerate(items):
+            swift_code = item.get('swift_code') if isinstance(item, dict) else None
+            result = {'index': index, 'swift_code': swift_code if isinstance(swift_code, str) else None}
+            results.append(result)
+
+            try:
+                data = SwiftCodeBase.model_validate(item)
+            except ValidationError as e:
+                error = e.errors()[0]
+                result.update(status='invalid', error=f"{'.'.join(map(str, error['loc'])) or 'item'}: {error['msg']}")
+                continue
+
+            record = {
+                'swift_code': data.swift_code.strip().upper(),
+                'bank_name': data.bank_name.strip(),
+                'address': data.address.strip(),
+                'country_iso2': data.country_iso2.strip().upper(),
+                'country_name': data.country_name.strip().upper(),
+                'is_headquarters': data.is_headquarters
+            }
+            result['swift_code'] = record['swift_code']
+
+            reason = record_rejection(record)
+            if reason is not None:
+                result.update(status='invalid', error=reason)
+            elif record['swift_code'] in records:
+                result.update(status='duplicate', error=f"Swift code {record['swift_code']} appears more than once")
+            else:
+                records[record['swift_code']] = record
+                pending[record['swift_code']] = result
+
+        for swift_code in await self.swift_service.get_existing_codes(list(records)):
+            del records[swift_code]
+            pending.pop(swift_code).update(status='exists', error=f"Swift code {swift_code} already exists.")
+
+        linked = 0
+        if records:
+            try:
+                linked = await self.swift_service.bulk_create_swift_codes(list(records.values()))
+            except IntegrityError:
+                raise HTTPException(status_code=409, detail="Some SWIFT codes were created concurrently; nothing was inserted")
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error creating SWIFT codes: {str(e)}")
+
+        for result in pending.values():
+            result['status'] = 'created'
+
+        # Rendered here rather than through BulkCreateResponse: validating tens of thousands of
+        # result objects would cost more than the insert itself.
+        body = {
+            'created': len(records),
+            'rejected': len(results) - len(records),
+            'linked': linked,
+            'results': results
+        }
+        return Response(content=json.dumps(body, ensure_ascii=False), media_type="application/json")
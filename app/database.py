@@ -1,32 +1,282 @@
+import logging
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import threading
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import declarative_base, sessionmaker, scoped_session
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.schema import CreateColumn
+from app.config import Settings
 
-def ensure_db_directory_exists():
-    db_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database")
+_session_scope: ContextVar[Optional[object]] = ContextVar("swift_db_session_scope", default=None)
+
+# Tables earlier versions created and nothing reads any more; dropped by create_tables.
+#   branch_associations  branch links, now derived from the first 8 characters of the codes
+RETIRED_TABLES = ("branch_associations",)
+
+# Name prefix of the per-sync staging tables (SwiftCodeRepository.sync_swift_codes); a sync drops its own
+# when done, create_tables drops any a crashed process left behind.
+SYNC_STAGING_PREFIX = "sync_staging_"
+
+SQLITE_PRAGMA_PROFILES: Dict[str, Dict[str, Any]] = {
+    # SQLite defaults: rollback journal, full fsync on every commit, ~2 MB page cache.
+    "default": {},
+    # WAL so readers are never blocked by the writer, fsync only at checkpoints,
+    # 64 MB page cache and 256 MB of memory-mapped I/O.
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000
+    },
+    # WAL concurrency, but every commit is fsynced.
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16384,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000
+    }
+}
+
+def ensure_db_directory_exists(database_path: Optional[str] = None):
+    if database_path:
+        db_dir = os.path.dirname(os.path.abspath(database_path))
+    else:
+        db_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database")
     if not os.path.exists(db_dir):
         print(f"Creating database directory: {db_dir}")
         os.makedirs(db_dir, exist_ok=True)
     return db_dir
 
+def current_session_scope():
+    """
+    Scope key for ScopedSession: the current request if one is active, otherwise the current thread.
+    """
+    scope = _session_scope.get()
+    return scope if scope is not None else threading.get_ident()
+
+def resolve_database_url() -> str:
+    """
+    DATABASE_URL wins; otherwise an SQLite file at DATABASE_PATH, defaulting to <repo>/database/swift_codes.db.
+    """
+    if Settings.database_url:
+        return Settings.database_url
+
+    database_path = Settings.database_path or os.path.join(ensure_db_directory_exists(), "swift_codes.db")
+    ensure_db_directory_exists(database_path)
+    return f"sqlite:///{database_path}"
+
+def resolve_read_database_url(database_url: str) -> Optional[str]:
+    """
+    Read-only URL for an SQLite file (mode=ro URI); None when reads must share the write engine
+    (in-memory databases) and the write URL for other backends.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return database_url
+
+    if not url.database or url.database == ":memory:" or url.database.startswith("file:"):
+        return None
+
+    return f"sqlite:///file:{os.path.abspath(url.database)}?mode=ro&uri=true"
+
+def engine_options(database_url: str, pool_size: int, max_overflow: int) -> Dict[str, Any]:
+    """
+    create_engine keyword arguments for database_url. The pool sizing is passed only when the dialect
+    pools connections in a QueuePool; in-memory SQLite uses a SingletonThreadPool, which rejects it.
+    """
+    url = make_url(database_url)
+    options: Dict[str, Any] = {}
+
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+    if issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+        options.update(pool_size=pool_size, max_overflow=max_overflow, pool_timeout=Settings.db_pool_timeout)
+
+    return options
+
+def apply_sqlite_pragmas(engine: Engine, profile: str, read_only: bool = False) -> None:
+    """
+    Run the named pragma profile on every new connection of an SQLite engine.
+    Read-only connections skip journal_mode, which only the writer may change.
+    """
+    if profile not in SQLITE_PRAGMA_PROFILES:
+        raise ValueError(f"Unknown SQLite profile '{profile}'. Available: {', '.join(SQLITE_PRAGMA_PROFILES)}")
+
+    pragmas = {
+        name: value for name, value in SQLITE_PRAGMA_PROFILES[profile].items()
+        if not (read_only and name == "journal_mode")
+    }
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
 class DatabaseManager:
-    db_dir = ensure_db_directory_exists()
-    database_path = os.path.join(db_dir, "swift_codes.db")
-    database_url = f"sqlite:///{database_path}"
+    """
+    Engines are created on first use (init_engine, called from the app lifespan), not at import,
+    so importing the models or the app touches neither the filesystem nor the database.
+    The session factories exist up front, unbound, and are bound when the engines are created.
+    """
+    database_url: Optional[str] = None
+    read_database_url: Optional[str] = None
+    engine: Optional[Engine] = None
+    read_engine: Optional[Engine] = None
+
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+    ScopedSession = scoped_session(SessionLocal, scopefunc=current_session_scope)
 
-    engine = create_engine(database_url, connect_args={"check_same_thread": False})
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+    ScopedReadSession = scoped_session(ReadSessionLocal, scopefunc=current_session_scope)
 
     Base = declarative_base()
 
+    _init_lock = threading.Lock()
+
+    @classmethod
+    def init_engine(cls) -> Engine:
+        """
+        Create the write and read engines from the settings and bind the session factories; idempotent.
+        """
+        with cls._init_lock:
+            if cls.engine is not None:
+                return cls.engine
+
+            database_url = resolve_database_url()
+            engine = create_engine(
+                database_url, **engine_options(database_url, Settings.db_pool_size, Settings.db_max_overflow)
+            )
+            apply_sqlite_pragmas(engine, Settings.sqlite_profile)
+
+            read_database_url = resolve_read_database_url(database_url)
+            if read_database_url is None:
+                read_engine = engine
+            else:
+                read_engine = create_engine(
+                    read_database_url,
+                    **engine_options(read_database_url, Settings.db_read_pool_size, Settings.db_read_max_overflow)
+                )
+                apply_sqlite_pragmas(read_engine, Settings.sqlite_profile, read_only=True)
+
+            cls.SessionLocal.configure(bind=engine)
+            cls.ReadSessionLocal.configure(bind=read_engine)
+
+            cls.database_url, cls.read_database_url = database_url, read_database_url
+            cls.read_engine = read_engine
+            cls.engine = engine
+
+            return engine
+
+    @classmethod
+    def dispose(cls) -> None:
+        """
+        Close pooled connections; the engines reconnect on next use.
+        """
+        for engine in {cls.engine, cls.read_engine} - {None}:
+            engine.dispose()
+
     @classmethod
     def create_tables(cls):
+        cls.init_engine()
         cls.Base.metadata.create_all(bind=cls.engine)
+        cls.add_missing_columns()
+        cls.move_country_names()
+        cls.drop_retired_tables()
+
+        # create_all skips tables that already exist; add indexes introduced since they were created.
+        for table in cls.Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=cls.engine, checkfirst=True)
+
+    @classmethod
+    def drop_retired_tables(cls) -> None:
+        """
+        Drop tables from earlier schema versions (RETIRED_TABLES) and sync staging tables left behind,
+        if this database has any.
+        """
+        inspector = inspect(cls.engine)
+        leftovers = [name for name in inspector.get_table_names() if name.startswith(SYNC_STAGING_PREFIX)]
+
+        with cls.engine.begin() as connection:
+            for table_name in RETIRED_TABLES:
+                if inspector.has_table(table_name):
+                    connection.execute(text(f"DROP TABLE {table_name}"))
+                    logging.info(f"Dropped retired table {table_name}")
+            for table_name in leftovers:
+                connection.execute(text(f"DROP TABLE {table_name}"))
+                logging.info(f"Dropped leftover sync staging table {table_name}")
+
+    @classmethod
+    def move_country_names(cls) -> None:
+        """
+        Databases from before the countries table repeat country_name on every swift_codes row:
+        copy one name per ISO2 code into countries and drop the column.
+        """
+        # create_all only makes the tables of imported models; countries must exist before the copy.
+        from app.models.country import Country
+
+        inspector = inspect(cls.engine)
+        if not inspector.has_table("swift_codes"):
+            return
+        if "country_name" not in {column['name'] for column in inspector.get_columns("swift_codes")}:
+            return
+
+        with cls.engine.begin() as connection:
+            Country.__table__.create(bind=connection, checkfirst=True)
+            connection.execute(text(
+                "INSERT INTO countries (iso2, name) "
+                "SELECT country_iso2, MAX(country_name) FROM swift_codes "
+                "WHERE country_iso2 NOT IN (SELECT iso2 FROM countries) GROUP BY country_iso2"
+            ))
+            connection.execute(text("ALTER TABLE swift_codes DROP COLUMN country_name"))
+        logging.info("Moved swift_codes.country_name into the countries table")
+
+    @classmethod
+    def add_missing_columns(cls) -> None:
+        """
+        create_all never alters existing tables; add (nullable) columns introduced since they were created.
+        """
+        inspector = inspect(cls.engine)
+
+        with cls.engine.begin() as connection:
+            for table in cls.Base.metadata.sorted_tables:
+                existing = {column['name'] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name not in existing:
+                        ddl = CreateColumn(column).compile(dialect=cls.engine.dialect)
+                        connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+                        logging.info(f"Added column {table.name}.{column.name}")
 
     @classmethod
     def get_db(cls):
+        cls.init_engine()
         db = cls.SessionLocal()
         try:
             yield db
         finally:
-            db.close()
\ No newline at end of file
+            db.close()
+
+    @classmethod
+    async def session_scope(cls):
+        """
+        FastAPI dependency opening a request scope: ScopedSession and ScopedReadSession hand this
+        request its own pooled sessions, which are closed and returned to their pools when it ends.
+        """
+        _session_scope.set(object())
+        try:
+            yield
+        finally:
+            cls.ScopedSession.remove()
+            cls.ScopedReadSession.remove()
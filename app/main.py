@@ -1,89 +1,104 @@
-import os
-import logging
-import uvicorn
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException, Response
 from contextlib import asynccontextmanager
 from app.routes.swift_codes import SwiftCodesRoutes
-from app.database import DatabaseManager, ensure_db_directory_exists
-from app.utils.parser import SwiftCodeParser
+from app.routes.admin import AdminRoutes
+from app.database import DatabaseManager
 from app.repositories.swift_code_repository import SwiftCodeRepository
+from app.repositories.async_swift_code_repository import AsyncSwiftCodeRepository
 from app.services.swift_service import SwiftCodeService
+from app.services.dataset_reloader import DatasetReloader
+from app.services.import_jobs import ImportJobManager
 from app.controllers.swift_controllers import SwiftCodeController
-from app.models.swift_code import SwiftCode
-
-ensure_db_directory_exists()
-
-swift_code_repository = SwiftCodeRepository(next(DatabaseManager.get_db()))
-swift_code_service = SwiftCodeService(swift_code_repository)
-swift_code_controller = SwiftCodeController(swift_code_service)
-swift_code_routes = SwiftCodesRoutes(swift_code_controller).router
-
-@asynccontextmanager
-async def lifespan(app:FastAPI):
-    DatabaseManager.create_tables()
-
-    db = next(DatabaseManager.get_db())
-    count = db.query(SwiftCode).count()
-
-    if count == 0:
-        data_path = os.environ.get("SWIFT_DATA_PATH", "data/swiftCodes.xlsx")
-        base_path, ext = os.path.splitext(data_path)
-
-        print("Checking for SWIFT data file...")
-        
-        if not os.path.exists(data_path) and os.path.exists(f"{base_path}.csv"):
-            data_path = f"{base_path}.csv"
-            logging.info(f"Excel file not found, using CSV file: {data_path}")
-        
-        if not os.path.exists(data_path):
-            alternatives = [
-                "data/swiftCodes.csv", 
-                "data/swift_data.xlsx", 
-                "data/swift_data.csv",
-                "data/swift_codes.xlsx",
-                "data/swift_codes.csv"
-            ]
-            
-            for alt_path in alternatives:
-                if os.path.exists(alt_path) and alt_path != data_path:
-                    data_path = alt_path
-                    logging.info(f"Using alternative data file: {data_path}")
-                    break
-        
-        logging.info(f"Checking for SWIFT data at: {data_path}")
-
-        if os.path.exists(data_path):
-            logging.info(f"Loading SWIFT data from: {data_path}")
-            parser = SwiftCodeParser(data_path)
-            
-            swift_data = parser.parse_files()
-            hq_map = parser.get_headquarters_map(swift_data)
-            branch_map = {}
-
-            for hq_code, branches in hq_map.items():
-                branch_map[hq_code] = [branch['swift_code'] for branch in branches]
-
-            associations = []
-            swift_code_repository.bulk_create_swift_codes(swift_data, branch_map, associations)
-            
-            logging.info(f"Loaded {len(swift_data)} SWIFT codes into the database.")
-        else:
-            logging.warning(f"WARNING: Swift data file not found at {data_path} or any alternative locations. Absolute path: {os.path.abspath(data_path)}")
-
-    yield
-
-app = FastAPI(
-    title="SWIFT Code API",
-    description="API for managing SWIFT codes and their associations.",
-    version="1.0.0",
-    lifespan=lifespan
-)
-
-app.include_router(swift_code_routes)
-
-@app.get("/health")
-def health_check():
-    return {"status": "healthy"}
+from app.controllers.admin_controller import AdminController
+from app.config import Settings
+
+def build_swift_code_repository():
+    if Settings.db_mode == "threaded":
+        return AsyncSwiftCodeRepository(DatabaseManager.SessionLocal, Settings.db_threads, DatabaseManager.ReadSessionLocal)
+    return SwiftCodeRepository(DatabaseManager.ScopedSession, DatabaseManager.ScopedReadSession)
+
+def create_app() -> FastAPI:
+    """
+    Wire repositories, services and routes into a FastAPI app. Nothing here touches the database;
+    engines are created and the schema migrated when the lifespan starts, and the dataset is loaded
+    in the background. Data endpoints answer 503 with Retry-After until the first load is published.
+    """
+    swift_code_repository = build_swift_code_repository()
+    swift_code_service = SwiftCodeService(swift_code_repository)
+    import_jobs = ImportJobManager(swift_code_service, lambda: DatabaseManager.database_url)
+    swift_code_controller = SwiftCodeController(swift_code_service, import_jobs)
+    swift_code_routes = SwiftCodesRoutes(swift_code_controller).router
+    dataset_reloader = DatasetReloader(swift_code_service, DatabaseManager.SessionLocal)
+    admin_routes = AdminRoutes(AdminController(dataset_reloader, swift_code_service)).router
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        DatabaseManager.init_engine()
+        DatabaseManager.create_tables()
+
+        dataset_reloader.start()
+
+        yield
+
+        await dataset_reloader.stop()
+        await import_jobs.close()
+        await swift_code_service.close()
+
+        if isinstance(swift_code_repository, AsyncSwiftCodeRepository):
+            swift_code_repository.close()
+        DatabaseManager.dispose()
+
+    app = FastAPI(
+        title="SWIFT Code API",
+        description="API for managing SWIFT codes and their associations.",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+
+    def require_ready():
+        if not dataset_reloader.ready:
+            raise HTTPException(
+                status_code=503,
+                detail="SWIFT dataset is still loading",
+                headers={"Retry-After": str(dataset_reloader.retry_after())}
+            )
+
+    app.include_router(swift_code_routes, dependencies=[Depends(require_ready), Depends(DatabaseManager.session_scope)])
+    app.include_router(admin_routes)
+
+    @app.get("/health")
+    def health_check():
+        version = dataset_reloader.version
+
+        return {
+            "status": "healthy" if dataset_reloader.ready else "loading",
+            "dataset_version": version['version'] if version else None,
+            "dataset_loaded_at": version['loaded_at'] if version else None,
+            "load": dataset_reloader.progress()
+        }
+
+    @app.get("/health/live")
+    def liveness_check():
+        return {"status": "alive"}
+
+    @app.get("/health/ready")
+    def readiness_check(response: Response):
+        if not dataset_reloader.ready:
+            response.status_code = 503
+            response.headers["Retry-After"] = str(dataset_reloader.retry_after())
+            return {"status": "loading", "load": dataset_reloader.progress()}
+
+        return {"status": "ready", "dataset_version": dataset_reloader.version['version'] if dataset_reloader.version else None}
+
+    app.state.swift_code_service = swift_code_service
+    app.state.dataset_reloader = dataset_reloader
+    app.state.import_jobs = import_jobs
+
+    return app
+
+app = create_app()
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run("app.main:app", host="0.0.0.0", port=8080, reload=True)
@@ -0,0 +1,8 @@
+from sqlalchemy import Column, String
+from app.database import DatabaseManager
+
+class Country(DatabaseManager.Base):
+    __tablename__ = "countries"
+
+    iso2 = Column(String(2), primary_key=True)
+    name = Column(String, nullable=False)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from app.database import DatabaseManager
+
+class ImportManifest(DatabaseManager.Base):
+    __tablename__ = "import_manifests"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    file_path = Column(String, nullable=False)
+    checksum = Column(String(64), nullable=False, index=True)
+    row_count = Column(Integer, nullable=False, default=0)
+    inserted = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    deleted = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=False)
@@ -1,20 +1,15 @@
-from sqlalchemy import Column, String, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Boolean, Index
 from app.database import DatabaseManager
 
 class SwiftCode(DatabaseManager.Base):
     __tablename__ = "swift_codes"
+    __table_args__ = (
+        Index("ix_swift_codes_country_iso2_swift_code", "country_iso2", "swift_code"),
+    )
 
     swift_code = Column(String, primary_key=True, index=True)
     bank_name = Column(String, nullable=False)
     address = Column(String, nullable=False)
     country_iso2 = Column(String(2), nullable=False, index=True)
-    country_name = Column(String, nullable=False)
     is_headquarters = Column(Boolean, default=False)
-
-    branches = relationship(
-        "BranchAssociation",
-        back_populates="headquarter",
-        foreign_keys="BranchAssociation.headquarter_swift",
-        cascade="all, delete-orphan"
-    )
+    row_hash = Column(String(40), nullable=True)
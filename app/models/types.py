@@ -1,4 +1,5 @@
-from typing import List
+from datetime import datetime
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 
 
@@ -23,4 +24,73 @@ class CountrySwiftCodesResponse(BaseModel):
     country_iso2: str
     country_name: str
     swift_codes: List[SwiftCodeResponse]
+    next_cursor: Optional[str] = None
 
+class SwiftCodeLookupRequest(BaseModel):
+    swift_codes: List[str]
+
+class SwiftCodeLookupResponse(BaseModel):
+    swift_codes: List[SwiftCodeWithBranchesResponse]
+    missing: List[str]
+
+class SwiftCodeSearchResponse(BaseModel):
+    query: str
+    swift_codes: List[SwiftCodeResponse]
+
+class BankSearchResult(SwiftCodeResponse):
+    score: float
+
+class BankSearchResponse(BaseModel):
+    query: str
+    swift_codes: List[BankSearchResult]
+
+class DatasetVersion(BaseModel):
+    version: str
+    file_path: str
+    row_count: int
+    loaded_at: datetime
+
+class DatasetReloadResponse(BaseModel):
+    status: str
+    changes: Optional[Dict[str, int]] = None
+    version: Optional[DatasetVersion] = None
+
+class BranchLinksResponse(BaseModel):
+    headquarters: int
+    branches: int
+    linked: int
+    orphaned: int
+    elapsed_seconds: float
+
+class ImportRejection(BaseModel):
+    row: int
+    reason: str
+
+class ImportJobResponse(BaseModel):
+    job_id: str
+    status: str
+    filename: str
+    size_bytes: int
+    submitted_at: datetime
+    finished_at: Optional[datetime] = None
+    row_count: Optional[int] = None
+    inserted: Optional[int] = None
+    duplicates: Optional[int] = None
+    rejected: Optional[int] = None
+    linked: Optional[int] = None
+    rejections: List[ImportRejection] = []
+    elapsed_seconds: Optional[float] = None
+    rows_per_second: Optional[float] = None
+    error: Optional[str] = None
+
+class BulkCreateResult(BaseModel):
+    index: int
+    swift_code: Optional[str] = None
+    status: str
+    error: Optional[str] = None
+
+class BulkCreateResponse(BaseModel):
+    created: int
+    rejected: int
+    linked: int
+    results: List[BulkCreateResult]
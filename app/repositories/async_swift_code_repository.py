@@ -0,0 +1,126 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+from app.repositories.country_names import CountryNames
+from app.repositories.swift_code_repository import SwiftCodeRepository
+
+
+class AsyncSwiftCodeRepository:
+    """
+    Asynchronous counterpart of SwiftCodeRepository.
+
+    Each call runs the synchronous repository method on a bounded thread pool with its
+    own short-lived session, so SQLite I/O never blocks the event loop and no session is
+    shared between concurrent requests. Lookups use read_session_factory when given.
+    The short-lived repositories share one in-memory country name map.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], max_workers: int = 8,
+                 read_session_factory: Optional[Callable[[], Session]] = None):
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory or session_factory
+        self.max_workers = max_workers
+        self.countries = CountryNames()
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def _call(self, method_name: str, *args) -> Any:
+        db = self.session_factory()
+        try:
+            return getattr(SwiftCodeRepository(db, countries=self.countries), method_name)(*args)
+        finally:
+            db.close()
+
+    def _call_read(self, method_name: str, *args) -> Any:
+        db = self.read_session_factory()
+        try:
+            return getattr(SwiftCodeRepository(db, db, self.countries), method_name)(*args)
+        finally:
+            db.close()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="swift-db")
+        return self.executor
+
+    async def _submit(self, call: Callable[..., Any], method_name: str, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), partial(call, method_name, *args))
+
+    async def _run(self, method_name: str, *args) -> Any:
+        return await self._submit(self._call, method_name, *args)
+
+    async def _run_read(self, method_name: str, *args) -> Any:
+        return await self._submit(self._call_read, method_name, *args)
+
+    def close(self) -> None:
+        executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    async def get_swift_code(self, swift_code: str) -> Optional[Dict[str, Any]]:
+        return await self._run_read('get_swift_code', swift_code)
+
+    async def get_swift_codes(self, swift_codes: List[str]) -> Dict[str, Dict[str, Any]]:
+        return await self._run_read('get_swift_codes', swift_codes)
+
+    async def get_country_swift_codes(self, country_iso2: str) -> Dict[str, Any]:
+        return await self._run_read('get_country_swift_codes', country_iso2)
+
+    async def get_country_swift_codes_page(self, country_iso2: str, limit: int, after: Optional[str] = None) -> Dict[str, Any]:
+        return await self._run_read('get_country_swift_codes_page', country_iso2, limit, after)
+
+    async def iter_country_swift_codes(self, country_iso2: str, batch_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Pull each batch of the streaming query on the thread pool; the read session lives until the stream ends.
+        """
+        db = self.read_session_factory()
+        batches = SwiftCodeRepository(db, db, self.countries).iter_country_swift_codes(country_iso2, batch_size)
+        loop = asyncio.get_running_loop()
+
+        try:
+            while True:
+                batch = await loop.run_in_executor(self._get_executor(), next, batches, None)
+                if batch is None:
+                    break
+                yield batch
+        finally:
+            batches.close()
+            db.close()
+
+    async def create_swift_code(self, swift_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._run('create_swift_code', swift_data)
+
+    async def upsert_swift_code(self, swift_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._run('upsert_swift_code', swift_data)
+
+    async def bulk_create_swift_codes(self, swift_data) -> List[Tuple[str, str]]:
+        return await self._run('bulk_create_swift_codes', swift_data)
+
+    async def get_existing_codes(self, swift_codes, headquarters_only: bool = False) -> Set[str]:
+        return await self._run('get_existing_codes', swift_codes, headquarters_only)
+
+    async def insert_swift_code_batch(self, swift_data: List[Dict[str, Any]]) -> int:
+        return await self._run('insert_swift_code_batch', swift_data)
+
+    async def insert_new_swift_codes(self, swift_data: List[Dict[str, Any]]) -> int:
+        return await self._run('insert_new_swift_codes', swift_data)
+
+    async def count_branch_links(self, swift_codes: Optional[Iterable[str]] = None) -> int:
+        return await self._run_read('count_branch_links', swift_codes)
+
+    async def get_branch_link_stats(self) -> Dict[str, int]:
+        return await self._run_read('get_branch_link_stats')
+
+    async def delete_swift_code(self, swift_code_id) -> bool:
+        return await self._run('delete_swift_code', swift_code_id)
+
+    async def apply_writes(self, operations: List[Tuple[str, Any]]) -> List[Any]:
+        return await self._run('apply_writes', operations)
+
+    async def load_snapshot_data(self) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        return await self._run_read('load_snapshot_data')
+
+    async def get_headquarter_swift(self, branch_swift: str) -> Optional[str]:
+        return await self._run('get_headquarter_swift', branch_swift)
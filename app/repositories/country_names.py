@@ -0,0 +1,34 @@
+import threading
+from typing import Dict, Optional
+
+
+class CountryNames:
+    """
+    In-memory copy of the countries table (ISO2 -> name).
+
+    Country names are stored once per country rather than on every swift_codes row, and joined
+    back in from this map when records are built. It is loaded on first use, writers merge the
+    names they store, and it is dropped on rollback so the next use reloads it. The map is
+    replaced, never mutated, so readers on other threads always see a complete version.
+    """
+
+    def __init__(self):
+        self._names: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[Dict[str, str]]:
+        """
+        The current map, or None when it has to be (re)loaded; callers must not mutate it.
+        """
+        return self._names
+
+    def replace(self, names: Dict[str, str]) -> None:
+        self._names = dict(names)
+
+    def merge(self, names: Dict[str, str]) -> None:
+        with self._lock:
+            if self._names is not None:
+                self._names = {**self._names, **names}
+
+    def invalidate(self) -> None:
+        self._names = None
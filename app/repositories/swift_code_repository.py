@@ -1,24 +1,141 @@
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from datetime import datetime, timezone
+from sqlalchemy import (Boolean, Column, MetaData, Select, String, Table, and_, case, delete, func, insert, or_,
+                        select, update)
+from sqlalchemy.orm import Session, aliased
+from typing import Callable, List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple, Union
+from app.database import SYNC_STAGING_PREFIX
 from app.models.swift_code import SwiftCode
-from app.models.branch_association import BranchAssociation
+from app.models.country import Country
+from app.models.import_manifest import ImportManifest
+from app.repositories.country_names import CountryNames
+from app.utils.validation import (INSTITUTION_CODE_LENGTH, branch_headquarters, has_branches, headquarters_code,
+                                  institution_range, record_rejection)
 
-import uuid
+import hashlib
 import logging
+import uuid
+
+
+SQLITE_MAX_VARIABLES = 500
+
+
+class SwiftCodeAlreadyExistsError(ValueError):
+    pass
 
 
 class SwiftCodeRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, read_db: Optional[Session] = None, countries: Optional[CountryNames] = None):
         self.db = db
+        self.read_db = read_db if read_db is not None else db
+        self.countries = countries if countries is not None else CountryNames()
+
+    @staticmethod
+    def _to_row(data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        The swift_codes row of a record. The country name goes to the countries table (see _store_countries)
+        but still counts towards the row hash, so a renamed country shows up as changed rows.
+        """
+        row = {
+            'swift_code': data['swift_code'].upper(),
+            'bank_name': data['bank_name'],
+            'address': data['address'],
+            'country_iso2': data['country_iso2'].upper(),
+            'is_headquarters': data['is_headquarters']
+        }
+        row['row_hash'] = SwiftCodeRepository.row_hash(dict(row, country_name=data['country_name'].upper()))
+
+        return row
+
+    def country_names(self) -> Dict[str, str]:
+        """
+        ISO2 -> country name, from memory; the countries table is read only when the map is not loaded.
+        """
+        names = self.countries.get()
+        if names is None:
+            names = self._load_country_names()
+
+        return names
+
+    def _load_country_names(self) -> Dict[str, str]:
+        names = dict(self.read_db.execute(select(Country.iso2, Country.name)).all())
+        self.countries.replace(names)
+
+        return names
+
+    def _country_name(self, country_iso2: str) -> str:
+        names = self.country_names()
+        if country_iso2 not in names:
+            # Stored by another process (an import job) since the map was loaded.
+            names = self._load_country_names()
+
+        return names.get(country_iso2, "")
+
+    def _with_stored_country_names(self, swift_data: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        The records with country_name replaced by the stored name of their country, so a single API write
+        never renames a country for every code in it; only the dataset reload does. A country not stored
+        yet takes the name of its first record.
+        """
+        swift_data = list(swift_data)
+        names = self.country_names()
+        if any(data['country_iso2'].upper() not in names for data in swift_data):
+            # Stored by another process (an import job) since the map was loaded.
+            names = self._load_country_names()
+
+        names = dict(names)
+        return [
+            dict(data, country_name=names.setdefault(data['country_iso2'].upper(), data['country_name'].upper()))
+            for data in swift_data
+        ]
+
+    def _store_countries(self, swift_data: Iterable[Dict[str, Any]], rename: bool = False) -> None:
+        """
+        Insert the countries of the given records missing from the in-memory map, in the current transaction;
+        with rename, also update those whose name differs (dataset reloads). Usually there are none and
+        nothing is written.
+        """
+        names = self.country_names()
+        changed = {}
+        for data in swift_data:
+            country_iso2, country_name = data['country_iso2'].upper(), data['country_name'].upper()
+            if country_iso2 not in names or (rename and names[country_iso2] != country_name):
+                changed[country_iso2] = country_name
+
+        if not changed:
+            return
+
+        statement = self._dialect_insert()(Country.__table__)
+        if rename:
+            statement = statement.on_conflict_do_update(index_elements=['iso2'], set_={'name': statement.excluded['name']})
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=['iso2'])
+        self.db.execute(
+            statement,
+            [{'iso2': country_iso2, 'name': country_name} for country_iso2, country_name in changed.items()]
+        )
+        self.countries.merge(changed)
+
+    def _rollback(self) -> None:
+        """
+        Roll back the write session and drop the country map, which may hold names merged in the transaction.
+        """
+        self.db.rollback()
+        self.countries.invalidate()
+
+    @staticmethod
+    def row_hash(row: Dict[str, Any]) -> str:
+        """
+        Fingerprint of a normalized row, stored alongside it so a reload can tell which rows changed.
+        """
+        fields = [row['swift_code'], row['bank_name'], row['address'], row['country_iso2'],
+                  row['country_name'], '1' if row['is_headquarters'] else '0']
+
+        return hashlib.sha1('\x1f'.join(fields).encode()).hexdigest()
 
     def get_swift_code(self, swift_code):
         swift_code = swift_code.upper()
 
-        print(f"Fetching SWIFT code: {swift_code}")
-        
-        entry = self.db.query(SwiftCode).filter(SwiftCode.swift_code == swift_code).first()
-
-        print(f"Entry: {entry}")
+        entry = self.read_db.query(SwiftCode).filter(SwiftCode.swift_code == swift_code).first()
 
         if not entry:
             return None
@@ -28,40 +145,78 @@ class SwiftCodeRepository:
             'bank_name': entry.bank_name,
             'address': entry.address,
             'country_iso2': entry.country_iso2,
-            'country_name': entry.country_name,
+            'country_name': self._country_name(entry.country_iso2),
             'is_headquarters': entry.is_headquarters,
             'branches': [] 
         }
 
-        if entry.is_headquarters:
-            associations = self.db.query(BranchAssociation).filter(
-                BranchAssociation.headquarter_swift == swift_code
-            ).all()
-
-            branches = []
-
-            for assoc in associations:
-                branch = self.db.query(SwiftCode).filter(
-                    SwiftCode.swift_code == assoc.branch_swift).first()
-                
-                if branch:
-                    branches.append({
-                        'swift_code': branch.swift_code,
-                        'bank_name': branch.bank_name,
-                        'address': branch.address,
-                        'country_iso2': branch.country_iso2,
-                        'country_name': branch.country_name,
-                        'is_headquarters': branch.is_headquarters
-                    })
-            
-            result['branches'] = branches
+        if entry.is_headquarters and has_branches(swift_code):
+            result['branches'] = [
+                self._to_record(branch) for branch in self.read_db.scalars(self._branches_query([swift_code]))
+            ]
 
         return result
 
+    @staticmethod
+    def _branches_query(hq_codes: List[str]):
+        """
+        Branches of the given headquarters: codes sharing their first 8 characters, found by
+        range scans of the primary key index rather than through a link table.
+        """
+        ranges = [
+            and_(SwiftCode.swift_code >= low, SwiftCode.swift_code < high)
+            for low, high in map(institution_range, hq_codes)
+        ]
+
+        return (
+            select(SwiftCode)
+            .where(or_(*ranges))
+            .where(SwiftCode.is_headquarters.is_(False))
+            .order_by(SwiftCode.swift_code)
+        )
+
+    def _to_record(self, entry) -> Dict[str, Any]:
+        return {
+            'swift_code': entry.swift_code,
+            'bank_name': entry.bank_name,
+            'address': entry.address,
+            'country_iso2': entry.country_iso2,
+            'country_name': self._country_name(entry.country_iso2),
+            'is_headquarters': entry.is_headquarters
+        }
+
+    def get_swift_codes(self, swift_codes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch many codes with their branches: one IN query for the codes and one range query
+        for the branches of the headquarters found (each chunked below SQLite's variable limit).
+        """
+        swift_codes = list(dict.fromkeys(code.upper() for code in swift_codes))
+        results = {}
+
+        for start in range(0, len(swift_codes), SQLITE_MAX_VARIABLES):
+            chunk = swift_codes[start:start + SQLITE_MAX_VARIABLES]
+            for entry in self.read_db.scalars(select(SwiftCode).where(SwiftCode.swift_code.in_(chunk))):
+                result = self._to_record(entry)
+                result['branches'] = []
+                results[entry.swift_code] = result
+
+        headquarters = [code for code, result in results.items() if result['is_headquarters'] and has_branches(code)]
+
+        # Two bound parameters per headquarters range.
+        chunk_size = SQLITE_MAX_VARIABLES // 2
+        for start in range(0, len(headquarters), chunk_size):
+            chunk = headquarters[start:start + chunk_size]
+            for branch in self.read_db.scalars(self._branches_query(chunk)):
+                results[branch_headquarters(branch.swift_code)]['branches'].append(self._to_record(branch))
+
+        return results
+
     def get_country_swift_codes(self, country_iso2):
         country_iso2 = country_iso2.upper()
-        entries = self.db.query(SwiftCode).filter(
-            SwiftCode.country_iso2 == country_iso2).all()
+        entries = self.read_db.execute(
+            select(SwiftCode.swift_code, SwiftCode.bank_name, SwiftCode.address, SwiftCode.is_headquarters)
+            .where(SwiftCode.country_iso2 == country_iso2)
+        ).all()
         
         if not entries:
             return {
@@ -70,7 +225,8 @@ class SwiftCodeRepository:
                 'swift_codes': []
             }
         
-        country_name = entries[0].country_name
+        # One name for the whole country, joined from memory rather than read with every row.
+        country_name = self._country_name(country_iso2)
 
         swift_codes = []
 
@@ -79,8 +235,8 @@ class SwiftCodeRepository:
                 'swift_code': entry.swift_code,
                 'bank_name': entry.bank_name,
                 'address': entry.address,
-                'country_iso2': entry.country_iso2,
-                'country_name': entry.country_name,
+                'country_iso2': country_iso2,
+                'country_name': country_name,
                 'is_headquarters': entry.is_headquarters
             })
         
@@ -90,122 +246,548 @@ class SwiftCodeRepository:
             'swift_codes': swift_codes
         }
 
-    def create_swift_code(self, swift_data):
-        swift_code = swift_data['swift_code'].upper()
-        
-        existing = self.db.query(SwiftCode).filter(SwiftCode.swift_code == swift_code).first()
-        if existing:
-            raise ValueError(f"Swift code {swift_code} already exists.")
-        
-        new_swift_code = SwiftCode(
-            swift_code=swift_code,
-            bank_name=swift_data['bank_name'],
-            address=swift_data['address'],
-            country_iso2=swift_data['country_iso2'].upper(),
-            country_name=swift_data['country_name'].upper(),
-            is_headquarters=swift_data['is_headquarters']
-        )
-        
-        self.db.add(new_swift_code)
-        self.db.commit()
-        self.db.refresh(new_swift_code)
-        
-        if not swift_data['is_headquarters']:
-            hq_code = swift_code[:6] + 'XXX'
-                
-            hq = self.db.query(SwiftCode).filter(SwiftCode.swift_code == hq_code).first()
-            
-            if hq:
-
-                association = BranchAssociation(
-                    id=str(uuid.uuid4()),
-                    headquarter_swift=hq_code,
-                    branch_swift=swift_code
-                )
-                self.db.add(association)
-                self.db.commit()
-                logging.info(f"Created branch association: {swift_code} -> {hq_code}")
-            else:
-                logging.warning(f"Could not find headquarters {hq_code} for branch {swift_code}")
-        
-        return new_swift_code
+    def get_country_swift_codes_page(self, country_iso2: str, limit: int, after: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Keyset page of a country ordered by swift_code, served by the (country_iso2, swift_code) index.
+        """
+        country_iso2 = country_iso2.upper()
+        query = select(SwiftCode).where(SwiftCode.country_iso2 == country_iso2)
 
+        if after:
+            query = query.where(SwiftCode.swift_code > after.upper())
 
-    def bulk_create_swift_codes(self, swift_data, branch_hq_map=None, associations=None):
-        branch_hq_map = branch_hq_map or {}
-        associations = associations or []
+        entries = list(self.read_db.scalars(query.order_by(SwiftCode.swift_code).limit(limit + 1)))
+        has_more = len(entries) > limit
+        entries = entries[:limit]
 
-        swift_code_models = []
-        for data in swift_data:
-            model = SwiftCode(
-                swift_code=data['swift_code'].upper(),
-                bank_name=data['bank_name'],
-                address=data['address'],
-                country_iso2=data['country_iso2'].upper(),
-                country_name=data['country_name'].upper(),
-                is_headquarters=data['is_headquarters']
+        return {
+            'country_iso2': country_iso2,
+            'country_name': self._country_name(country_iso2) if entries else "",
+            'swift_codes': [self._to_record(entry) for entry in entries],
+            'next_cursor': entries[-1].swift_code if has_more else None
+        }
+
+    def iter_country_swift_codes(self, country_iso2: str, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream a country's codes ordered by swift_code in batches, using yield_per so only one batch is held.
+        """
+        result = self.read_db.execute(
+            select(
+                SwiftCode.swift_code,
+                SwiftCode.bank_name,
+                SwiftCode.address,
+                SwiftCode.country_iso2,
+                SwiftCode.is_headquarters
             )
-            swift_code_models.append(model)
- 
-            if not branch_hq_map and not data['is_headquarters']:
-                potential_hq = data['swift_code'].upper()[:6] + 'XXX'
-                if potential_hq not in branch_hq_map:
-                    branch_hq_map[potential_hq] = []
-                branch_hq_map[potential_hq].append(data['swift_code'].upper())
-
-        self.db.add_all(swift_code_models)
-        self.db.commit()
-        logging.info(f"Added {len(swift_code_models)} SWIFT codes to database")
-
-        association_count = 0
-        for hq_code, branch_codes in branch_hq_map.items():
-            hq = self.db.query(SwiftCode).filter(SwiftCode.swift_code == hq_code).first()
-            if hq:
-                logging.info(f"Found HQ {hq_code} with {len(branch_codes)} branches")
-                for branch_code in branch_codes:
-                    association = BranchAssociation(
-                        id=str(uuid.uuid4()),
-                        headquarter_swift=hq_code,
-                        branch_swift=branch_code
-                    )
-                    self.db.add(association)
-                    association_count += 1
-
-        if association_count > 0:
-            self.db.commit()
-            logging.info(f"Created {association_count} branch associations")
+            .where(SwiftCode.country_iso2 == country_iso2.upper())
+            .order_by(SwiftCode.swift_code)
+            .execution_options(yield_per=batch_size)
+        )
+
+        for rows in result.partitions():
+            yield [self._to_record(row) for row in rows]
+
+    def _dialect_insert(self):
+        if self.db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
         else:
-            logging.warning("No branch associations were created")
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        return dialect_insert
+
+    def _headquarter_for(self, swift_code: str) -> Optional[str]:
+        """
+        The stored headquarters a branch code belongs to (same first 8 characters plus XXX), or None.
+        """
+        hq_code = branch_headquarters(swift_code)
+        if hq_code is None:
+            return None
+
+        return self.db.scalar(
+            select(SwiftCode.swift_code).where(SwiftCode.swift_code == hq_code, SwiftCode.is_headquarters.is_(True))
+        )
+
+    @staticmethod
+    def _created(row: Dict[str, Any], swift_data: Dict[str, Any], hq_code: Optional[str]) -> Dict[str, Any]:
+        record = {key: value for key, value in row.items() if key != 'row_hash'}
+        record['country_name'] = swift_data['country_name'].upper()
+        record['headquarter_swift'] = hq_code
+        return record
+
+    def create_swift_code(self, swift_data) -> Dict[str, Any]:
+        """
+        Insert one code with INSERT ... ON CONFLICT DO NOTHING, which tells an existing code apart without
+        a prior SELECT. Returns the stored record with the headquarter_swift it belongs to (or None).
+        Raises SwiftCodeAlreadyExistsError when the code exists.
+        """
+        try:
+            created = self._insert_one(swift_data)
+            self.db.commit()
+        except Exception:
+            self._rollback()
+            raise
+
+        return created
+
+    def _insert_one(self, swift_data) -> Dict[str, Any]:
+        [swift_data] = self._with_stored_country_names([swift_data])
+        row = self._to_row(swift_data)
+        swift_code = row['swift_code']
+
+        result = self.db.execute(
+            self._dialect_insert()(SwiftCode.__table__).values(row).on_conflict_do_nothing(index_elements=['swift_code'])
+        )
+        if result.rowcount == 0:
+            raise SwiftCodeAlreadyExistsError(f"Swift code {swift_code} already exists.")
+        self._store_countries([swift_data])
+
+        hq_code = None
+        if not row['is_headquarters']:
+            hq_code = self._headquarter_for(swift_code)
+            if hq_code is None:
+                logging.warning(f"Could not find headquarters for branch {swift_code}")
+
+        return self._created(row, swift_data, hq_code)
+
+    def upsert_swift_code(self, swift_data) -> Dict[str, Any]:
+        """
+        Create or replace one code in a single transaction (INSERT ... ON CONFLICT DO UPDATE). Returns the
+        stored record with its headquarter_swift, 'status' (created, updated or unchanged) and, when the code
+        existed, its 'previous' is_headquarters and country_iso2.
+        """
+        [swift_data] = self._with_stored_country_names([swift_data])
+        row = self._to_row(swift_data)
+        swift_code = row['swift_code']
+
+        try:
+            previous = self.db.execute(
+                select(SwiftCode.row_hash, SwiftCode.is_headquarters, SwiftCode.country_iso2)
+                .where(SwiftCode.swift_code == swift_code)
+            ).first()
+
+            if previous is not None and previous.row_hash == row['row_hash']:
+                hq_code = self.get_headquarter_swift(swift_code)
+                self.db.rollback()
+                return dict(self._created(row, swift_data, hq_code), status='unchanged', previous=self._previous(previous))
+
+            statement = self._dialect_insert()(SwiftCode.__table__).values(row)
+            self.db.execute(statement.on_conflict_do_update(
+                index_elements=['swift_code'],
+                set_={column: statement.excluded[column] for column in row if column != 'swift_code'}
+            ))
+            self._store_countries([swift_data])
+
+            hq_code = None if row['is_headquarters'] else self._headquarter_for(swift_code)
+
+            self.db.commit()
+        except Exception:
+            self._rollback()
+            raise
+
+        status = 'created' if previous is None else 'updated'
+        return dict(self._created(row, swift_data, hq_code), status=status, previous=self._previous(previous))
 
+    @staticmethod
+    def _previous(previous) -> Optional[Dict[str, Any]]:
+        if previous is None:
+            return None
+        return {'is_headquarters': previous.is_headquarters, 'country_iso2': previous.country_iso2}
+
+
+    def bulk_create_swift_codes(self, swift_data) -> List[Tuple[str, str]]:
+        """
+        Insert codes with one executemany in a single transaction. Returns the (headquarter_swift, branch_swift)
+        pairs the batch creates: its branches whose headquarters is in the batch or stored (looked up in the
+        batch first, only the others queried), plus stored orphan branches adopted by its new headquarters.
+        """
+        swift_data = self._with_stored_country_names(swift_data)
+        rows = [self._to_row(data) for data in swift_data]
+        batch = {row['swift_code']: row['is_headquarters'] for row in rows}
+
+        branch_hqs = {
+            row['swift_code']: branch_headquarters(row['swift_code'])
+            for row in rows if not row['is_headquarters']
+        }
+        wanted = {hq_code for hq_code in branch_hqs.values() if hq_code is not None}
+        known_hqs = {hq_code for hq_code in wanted if batch.get(hq_code)}
+        known_hqs |= self.get_existing_codes(wanted - set(batch), headquarters_only=True)
+        new_hqs = [code for code, is_hq in batch.items() if is_hq and has_branches(code)]
+
+        try:
+            if rows:
+                self.db.execute(insert(SwiftCode.__table__), rows)
+                self._store_countries(swift_data)
+            adopted = [code for code in self._stored_branches(new_hqs) if code not in batch]
+            self.db.commit()
+        except Exception:
+            self._rollback()
+            raise
+
+        links = [(hq_code, branch_code) for branch_code, hq_code in branch_hqs.items() if hq_code in known_hqs]
+        links += [(headquarters_code(branch_code), branch_code) for branch_code in adopted]
+        logging.info(f"Added {len(rows)} SWIFT codes to database, {len(links) - len(adopted)} of them branches "
+                     f"of a stored headquarters; {len(adopted)} orphan branches adopted by new headquarters")
+
+        return links
+
+    def _stored_branches(self, hq_codes: List[str]) -> List[str]:
+        """
+        Codes of the stored branches of the given stored headquarters, one statement per chunk: each
+        headquarters found by its key drives a primary key range scan over its first 8 characters.
+        """
+        headquarter = aliased(SwiftCode)
+        branch = aliased(SwiftCode)
+        prefix = func.substr(headquarter.swift_code, 1, INSTITUTION_CODE_LENGTH, type_=String)
+        branch_codes = []
+
+        for start in range(0, len(hq_codes), SQLITE_MAX_VARIABLES):
+            chunk = hq_codes[start:start + SQLITE_MAX_VARIABLES]
+            # Codes are [A-Z0-9]; '[' sorts right after 'Z', closing the range above every code with the prefix.
+            branch_codes.extend(self.db.scalars(
+                select(branch.swift_code)
+                .select_from(headquarter)
+                .join(branch, and_(branch.swift_code >= prefix, branch.swift_code < prefix.concat('[')))
+                .where(headquarter.swift_code.in_(chunk))
+                .where(branch.is_headquarters.is_(False))
+            ))
+
+        return branch_codes
+
+    def get_existing_codes(self, swift_codes, headquarters_only: bool = False) -> Set[str]:
+        """
+        Return the subset of swift_codes present in the database (only headquarters if asked),
+        querying in chunks below SQLite's variable limit.
+        """
+        swift_codes = list(swift_codes)
+        existing = set()
+
+        for start in range(0, len(swift_codes), SQLITE_MAX_VARIABLES):
+            chunk = swift_codes[start:start + SQLITE_MAX_VARIABLES]
+            query = select(SwiftCode.swift_code).where(SwiftCode.swift_code.in_(chunk))
+            if headquarters_only:
+                query = query.where(SwiftCode.is_headquarters.is_(True))
+            existing.update(self.db.scalars(query))
+
+        return existing
 
     def delete_swift_code(self, swift_code_id) -> bool:
-        entry = self.db.query(SwiftCode).filter(
-            SwiftCode.swift_code == swift_code_id).first()
-        
-        if not entry:
-            return False
-        
-        if entry.is_headquarters:
-            self.db.query(BranchAssociation).filter(
-                BranchAssociation.headquarter_swift == swift_code_id
-            ).delete()
-        else:
-            self.db.query(BranchAssociation).filter(
-                BranchAssociation.branch_swift == swift_code_id
-            ).delete()
+        try:
+            deleted = self._delete_one(swift_code_id)
+            self.db.commit()
+        except Exception:
+            self._rollback()
+            raise
+
+        return deleted
 
-        self.db.delete(entry)
+    def _delete_one(self, swift_code: str) -> bool:
+        result = self.db.execute(delete(SwiftCode).where(SwiftCode.swift_code == swift_code))
+
+        return result.rowcount > 0
+
+    def apply_writes(self, operations: List[Tuple[str, Any]]) -> List[Any]:
+        """
+        Apply ('create', swift_data) and ('delete', swift_code) operations in order, in one transaction
+        (group commit). Each slot of the result is the operation's return value or the error it raised;
+        an existing code fails only its own create. If the transaction itself fails, every operation
+        is retried in a transaction of its own so each caller still gets its own outcome.
+        """
+        results: List[Any] = []
+
+        try:
+            for kind, argument in operations:
+                try:
+                    results.append(self._insert_one(argument) if kind == 'create' else self._delete_one(argument))
+                except SwiftCodeAlreadyExistsError as e:
+                    results.append(e)
+            self.db.commit()
+        except Exception as e:
+            self._rollback()
+            if len(operations) == 1:
+                return [e]
+
+            logging.warning(f"Batch of {len(operations)} writes failed ({e}); applying them one by one")
+            return [self._apply_write(kind, argument) for kind, argument in operations]
+
+        return results
+
+    def _apply_write(self, kind: str, argument: Any) -> Any:
+        try:
+            return self.create_swift_code(argument) if kind == 'create' else self.delete_swift_code(argument)
+        except Exception as e:
+            return e
+
+    def insert_swift_code_batch(self, swift_data: List[Dict[str, Any]]) -> int:
+        """
+        Insert one batch of normalized records with a single executemany and commit it.
+        """
+        if not swift_data:
+            return 0
+
+        self.db.execute(insert(SwiftCode), [self._to_row(data) for data in swift_data])
+        self._store_countries(swift_data, rename=True)
         self.db.commit()
 
-        return True
-    
-    def add_many_swift_codes(self, swift_code_models: List[Dict[str, Any]]) -> None:
-        self.db.add_all(swift_code_models)
-        self.db.flush()
+        return len(swift_data)
+
+    def insert_new_swift_codes(self, swift_data: List[Dict[str, Any]]) -> int:
+        """
+        Insert one batch, skipping codes that already exist (ON CONFLICT DO NOTHING), and commit it.
+        Returns the number of rows actually inserted.
+        """
+        if not swift_data:
+            return 0
+
+        swift_data = self._with_stored_country_names(swift_data)
+        statement = self._dialect_insert()(SwiftCode.__table__).on_conflict_do_nothing(index_elements=['swift_code'])
+        result = self.db.execute(statement, [self._to_row(data) for data in swift_data])
+        self._store_countries(swift_data)
         self.db.commit()
 
-    def add_many_associations(self, associations: List[Dict[str, Any]]) -> None:
-        self.db.add_all(associations)
-        self.db.flush()
+        return result.rowcount
+
+    def get_branch_links(self) -> List[Tuple[str, str]]:
+        """
+        Every (headquarter_swift, branch_swift) pair, derived in one join: a branch belongs to the stored
+        headquarters whose code is the branch's first 8 characters plus XXX.
+        """
+        branch, headquarter, onclause = self._branch_link_join()
+
+        rows = self.db.execute(
+            select(headquarter.swift_code, branch.swift_code).join(headquarter, onclause)
+        )
+
+        return [tuple(row) for row in rows]
+
+    @staticmethod
+    def _branch_link_join():
+        """
+        Aliases and join condition pairing each branch row with its stored headquarters row.
+        """
+        branch = aliased(SwiftCode)
+        headquarter = aliased(SwiftCode)
+        hq_code = func.substr(branch.swift_code, 1, INSTITUTION_CODE_LENGTH, type_=String).concat('XXX')
+
+        onclause = and_(
+            headquarter.swift_code == hq_code,
+            headquarter.is_headquarters.is_(True),
+            branch.is_headquarters.is_(False),
+            func.length(branch.swift_code) >= INSTITUTION_CODE_LENGTH
+        )
+
+        return branch, headquarter, onclause
+
+    def get_branch_link_stats(self) -> Dict[str, int]:
+        """
+        Headquarters, branches, linked branches and orphans (branches without a stored headquarters),
+        counted in a single pass: the table left-joined to itself on the derived headquarters code.
+        """
+        branch, headquarter, onclause = self._branch_link_join()
+
+        total, branches, linked = self.read_db.execute(
+            select(
+                func.count(branch.swift_code),
+                func.coalesce(func.sum(case((branch.is_headquarters.is_(False), 1), else_=0)), 0),
+                func.count(headquarter.swift_code)
+            )
+            .select_from(branch)
+            .outerjoin(headquarter, onclause)
+        ).one()
+
+        return {
+            'headquarters': total - branches,
+            'branches': branches,
+            'linked': linked,
+            'orphaned': branches - linked
+        }
+
+    def count_branch_links(self, swift_codes: Optional[Union[Iterable[str], Select]] = None) -> int:
+        """
+        Number of branch links, counted by the database over the same join as get_branch_links; with
+        swift_codes (the codes, or a query selecting them) only the links whose headquarters or branch is
+        among them.
+        """
+        branch, headquarter, onclause = self._branch_link_join()
+        statement = select(func.count()).select_from(branch).join(headquarter, onclause)
+
+        if swift_codes is not None:
+            codes = swift_codes if isinstance(swift_codes, Select) else list(swift_codes)
+            statement = statement.where(or_(headquarter.swift_code.in_(codes), branch.swift_code.in_(codes)))
+
+        return self.db.execute(statement).scalar_one()
+
+    def get_latest_import_manifest(self) -> Optional[Dict[str, Any]]:
+        manifest = self.db.query(ImportManifest).order_by(ImportManifest.id.desc()).first()
+
+        if not manifest:
+            return None
+
+        return {
+            'file_path': manifest.file_path,
+            'checksum': manifest.checksum,
+            'row_count': manifest.row_count,
+            'inserted': manifest.inserted,
+            'updated': manifest.updated,
+            'deleted': manifest.deleted,
+            'started_at': manifest.started_at,
+            'finished_at': manifest.finished_at
+        }
+
+    def _create_staging_table(self) -> Table:
+        """
+        A fresh table for one sync's parsed rows, created and committed on its own.
+        """
+        staging = Table(
+            f"{SYNC_STAGING_PREFIX}{uuid.uuid4().hex[:12]}",
+            MetaData(),
+            Column('swift_code', String, primary_key=True),
+            Column('bank_name', String, nullable=False),
+            Column('address', String, nullable=False),
+            Column('country_iso2', String(2), nullable=False),
+            Column('is_headquarters', Boolean),
+            Column('row_hash', String(40)),
+            Column('is_new', Boolean, nullable=False, default=False)
+        )
+        staging.create(self.db.connection())
         self.db.commit()
 
+        return staging
+
+    def _drop_staging_table(self, staging: Table) -> None:
+        try:
+            staging.drop(self.db.connection(), checkfirst=True)
+            self.db.commit()
+        except Exception as e:
+            # create_tables drops leftover staging tables on the next start.
+            self.db.rollback()
+            logging.warning(f"Could not drop sync staging table {staging.name}: {e}")
+
+    def _apply_staged(self, staging: Table, counts: Dict[str, int]) -> Select:
+        """
+        Diff the staging table against swift_codes in set-based statements: insert the codes swift_codes
+        lacks, update those whose hash differs and delete those the dataset no longer has. Returns a query
+        selecting the inserted codes.
+        """
+        columns = ['swift_code', 'bank_name', 'address', 'country_iso2', 'is_headquarters', 'row_hash']
+        table = SwiftCode.__table__
+
+        self.db.execute(
+            update(staging).where(staging.c.swift_code.not_in(select(table.c.swift_code))).values(is_new=True)
+        )
+        counts['inserted'] = self.db.execute(
+            insert(table).from_select(columns, select(*[staging.c[column] for column in columns])
+                                      .where(staging.c.is_new.is_(True)))
+        ).rowcount
+        counts['updated'] = self.db.execute(
+            update(table)
+            .where(table.c.swift_code == staging.c.swift_code, table.c.row_hash.is_distinct_from(staging.c.row_hash))
+            .values({column: staging.c[column] for column in columns[1:]})
+        ).rowcount
+        counts['deleted'] = self.db.execute(
+            delete(table).where(table.c.swift_code.not_in(select(staging.c.swift_code)))
+        ).rowcount
+
+        return select(staging.c.swift_code).where(staging.c.is_new.is_(True))
+
+    def sync_swift_codes(self, batches: Iterable[List[Dict[str, Any]]], manifest: Dict[str, Any],
+                         on_batch: Optional[Callable[[Dict[str, int]], None]] = None) -> Dict[str, int]:
+        """
+        Make the table match a full dataset given as record batches: rows whose hash is unknown are inserted,
+        rows whose hash changed are updated and rows absent from the dataset are deleted. Rows failing the
+        import validation are skipped and counted as 'rejected'. 'linked' counts the branch links the
+        inserted rows take part in, 'staged' the distinct valid rows read. Records an ImportManifest.
+
+        The batches are parsed into a staging table, one short transaction each, so API writes go on
+        while the file is read; only the diff against swift_codes runs in a single write transaction.
+        on_batch receives the running counts after each batch is staged and once the diff is applied.
+        """
+        counts = {'row_count': 0, 'staged': 0, 'inserted': 0, 'updated': 0, 'deleted': 0, 'rejected': 0}
+        countries: Dict[str, str] = {}
+        staging = self._create_staging_table()
+
+        try:
+            for batch in batches:
+                rows = []
+
+                for data in batch:
+                    counts['row_count'] += 1
+                    reason = record_rejection(data)
+                    if reason is not None:
+                        counts['rejected'] += 1
+                        logging.warning(f"Skipping invalid row {counts['row_count']} in dataset: {reason}")
+                        continue
+
+                    rows.append(self._to_row(data))
+                    countries[data['country_iso2'].upper()] = data['country_name'].upper()
+
+                if rows:
+                    staged = self.db.execute(
+                        self._dialect_insert()(staging).on_conflict_do_nothing(index_elements=['swift_code']), rows
+                    ).rowcount
+                    counts['staged'] += staged
+                    if staged < len(rows):
+                        logging.warning(f"Skipping {len(rows) - staged} duplicate SWIFT codes in dataset")
+                self.db.commit()
+
+                if on_batch is not None:
+                    on_batch(dict(counts))
+
+            inserted = self._apply_staged(staging, counts)
+            self._store_countries(
+                [{'country_iso2': country_iso2, 'country_name': country_name}
+                 for country_iso2, country_name in countries.items()],
+                rename=True
+            )
+            counts['linked'] = self.count_branch_links(inserted) if counts['inserted'] else 0
+
+            self.db.add(ImportManifest(
+                **manifest,
+                row_count=counts['row_count'],
+                inserted=counts['inserted'],
+                updated=counts['updated'],
+                deleted=counts['deleted'],
+                finished_at=datetime.now(timezone.utc)
+            ))
+            self.db.commit()
+        except Exception:
+            self._rollback()
+            raise
+        finally:
+            self._drop_staging_table(staging)
+
+        if on_batch is not None:
+            on_batch(dict(counts))
+
+        return counts
+
+    def load_snapshot_data(self) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """
+        Read every SWIFT code in one query, for building a read snapshot, and reload the country names.
+        Records carry country_iso2 only; their country_name is in the returned ISO2 -> name map.
+        """
+        rows = self.read_db.query(
+            SwiftCode.swift_code,
+            SwiftCode.bank_name,
+            SwiftCode.address,
+            SwiftCode.country_iso2,
+            SwiftCode.is_headquarters
+        ).all()
+
+        records = [
+            {
+                'swift_code': row.swift_code,
+                'bank_name': row.bank_name,
+                'address': row.address,
+                'country_iso2': row.country_iso2,
+                'is_headquarters': row.is_headquarters
+            }
+            for row in rows
+        ]
+
+        return records, self._load_country_names()
+
+    def get_headquarter_swift(self, branch_swift: str) -> Optional[str]:
+        is_headquarters = self.db.scalar(select(SwiftCode.is_headquarters).where(SwiftCode.swift_code == branch_swift))
+        if is_headquarters is None or is_headquarters:
+            return None
+
+        return self._headquarter_for(branch_swift)
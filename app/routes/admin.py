@@ -0,0 +1,22 @@
+from typing import Optional
+from fastapi import APIRouter, Header
+from app.controllers.admin_controller import AdminController
+from app.models.types import BranchLinksResponse, DatasetReloadResponse
+
+class AdminRoutes:
+    def __init__(self, admin_controller: AdminController):
+        self.admin_controller = admin_controller
+        self.router = APIRouter(prefix="/v1/admin", tags=["admin"])
+
+        self.router.add_api_route("/reload", self.reload_dataset, methods=["POST"], response_model=DatasetReloadResponse)
+        self.router.add_api_route("/relink", self.relink_branches, methods=["POST"], response_model=BranchLinksResponse)
+
+    async def reload_dataset(self, x_admin_token: Optional[str] = Header(None)):
+        result = await self.admin_controller.reload_dataset(x_admin_token)
+
+        return result
+
+    async def relink_branches(self, x_admin_token: Optional[str] = Header(None)):
+        result = await self.admin_controller.relink_branches(x_admin_token)
+
+        return result
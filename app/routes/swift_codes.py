@@ -1,6 +1,8 @@
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, File, Query, Request, Response, UploadFile
+from app.config import Settings
 from app.controllers.swift_controllers import SwiftCodeController
-from app.models.types import SwiftCodeBase, SwiftCodeWithBranchesResponse, CountrySwiftCodesResponse, SwiftCodeBase
+from app.models.types import SwiftCodeBase, SwiftCodeWithBranchesResponse, CountrySwiftCodesResponse, SwiftCodeLookupRequest, SwiftCodeLookupResponse, SwiftCodeSearchResponse, BankSearchResponse, ImportJobResponse, BulkCreateResponse
 
 class SwiftCodesRoutes:
     def __init__(self, swift_controller: SwiftCodeController):
@@ -9,27 +11,95 @@ class SwiftCodesRoutes:
         self.router = APIRouter(prefix="/v1/swift-codes", tags=["swift-codes"])
         
         self.router.add_api_route("/", self.create_swift_code, methods=["POST"])
+        self.router.add_api_route("/bulk", self.bulk_create_swift_codes, methods=["POST"], response_model=BulkCreateResponse)
+        self.router.add_api_route("/import", self.import_swift_codes, methods=["POST"], status_code=202, response_model=ImportJobResponse)
+        self.router.add_api_route("/import/{job_id}", self.get_import_job, methods=["GET"], response_model=ImportJobResponse)
+        self.router.add_api_route("/lookup", self.lookup_swift_codes, methods=["POST"], response_model=SwiftCodeLookupResponse)
+        self.router.add_api_route("/search", self.search_prefix, methods=["GET"], response_model=SwiftCodeSearchResponse)
+        self.router.add_api_route("/search/bank", self.search_bank_name, methods=["GET"], response_model=BankSearchResponse)
         self.router.add_api_route("/{swift_code}", self.get_swift_code, methods=["GET"], response_model=SwiftCodeWithBranchesResponse)
+        self.router.add_api_route("/{swift_code}", self.upsert_swift_code, methods=["PUT"])
         self.router.add_api_route("/{swift_code}", self.delete_swift_code, methods=["DELETE"])
         self.router.add_api_route("/country/{country_iso2}", self.get_country_swift_codes, methods=["GET"], response_model=CountrySwiftCodesResponse)
     
     async def get_swift_code(self, swift_code: str):
         print(f"Getting SWIFT code: {swift_code}")
-        result = await self.swift_controller.get_swift_code(swift_code)
+        result = await self.swift_controller.get_swift_code_response(swift_code)
         
         return result
     
-    async def get_country_swift_codes(self, country_iso2: str):
-        result = await self.swift_controller.get_country_swift_codes(country_iso2)
+    async def search_prefix(
+        self,
+        prefix: str = Query(..., min_length=1, max_length=11),
+        limit: int = Query(10, ge=1, le=Settings.search_max_limit)
+    ):
+        result = await self.swift_controller.search_prefix(prefix, limit)
+
+        return result
+
+    async def search_bank_name(
+        self,
+        q: str = Query(..., min_length=2, max_length=200),
+        country: Optional[str] = Query(None, min_length=2, max_length=2),
+        limit: int = Query(10, ge=1, le=Settings.search_max_limit)
+    ):
+        result = await self.swift_controller.search_bank_name(q, limit, country)
+
+        return result
+
+    async def lookup_swift_codes(self, lookup: SwiftCodeLookupRequest):
+        result = await self.swift_controller.lookup_swift_codes(lookup)
+
+        return result
+    
+    async def get_country_swift_codes(
+        self,
+        country_iso2: str,
+        limit: Optional[int] = Query(None, ge=1, le=Settings.country_page_max_limit),
+        after: Optional[str] = None,
+        output_format: str = Query("json", alias="format", pattern="^(json|ndjson)$")
+    ):
+        if output_format == "ndjson":
+            return self.swift_controller.stream_country_swift_codes(country_iso2)
+
+        if limit is not None or after is not None:
+            return await self.swift_controller.get_country_swift_codes_page(
+                country_iso2, limit or Settings.country_page_max_limit, after
+            )
+
+        result = await self.swift_controller.get_country_swift_codes_response(country_iso2)
         
         return result
     
+    async def bulk_create_swift_codes(self, request: Request):
+        items = await self.swift_controller.read_bulk_items(request)
+        result = await self.swift_controller.bulk_create_swift_codes(items)
+
+        return result
+
+    async def import_swift_codes(self, file: UploadFile = File(...)):
+        result = await self.swift_controller.import_swift_codes(file)
+
+        return result
+
+    async def get_import_job(self, job_id: str):
+        result = self.swift_controller.get_import_job(job_id)
+
+        return result
+
     async def create_swift_code(self, swift_code: SwiftCodeBase):
         result = await self.swift_controller.create_swift_code(swift_code)
         
         return result
         
     
+    async def upsert_swift_code(self, swift_code: str, swift_data: SwiftCodeBase, response: Response):
+        result = await self.swift_controller.upsert_swift_code(swift_code, swift_data)
+        if result["status"] == "created":
+            response.status_code = 201
+
+        return result
+
     async def delete_swift_code(self, swift_code: str):
         result = await self.swift_controller.delete_swift_code(swift_code)
         
@@ -0,0 +1,260 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.config import Settings
+from app.repositories.swift_code_repository import SwiftCodeRepository
+from app.services.ingest_service import SwiftCodeIngestService
+from app.services.swift_service import SwiftCodeService
+from app.utils.parser import SwiftCodeParser
+
+DATA_PATH_ALTERNATIVES = [
+    "data/swiftCodes.csv",
+    "data/swift_data.xlsx",
+    "data/swift_data.csv",
+    "data/swift_codes.xlsx",
+    "data/swift_codes.csv"
+]
+
+
+def resolve_data_path() -> str:
+    """
+    SWIFT_DATA_PATH (default data/swiftCodes.xlsx), its .csv sibling, or the first existing alternative.
+    """
+    data_path = os.environ.get("SWIFT_DATA_PATH", "data/swiftCodes.xlsx")
+    base_path, ext = os.path.splitext(data_path)
+
+    if not os.path.exists(data_path) and os.path.exists(f"{base_path}.csv"):
+        data_path = f"{base_path}.csv"
+        logging.info(f"Excel file not found, using CSV file: {data_path}")
+
+    if not os.path.exists(data_path):
+        for alt_path in DATA_PATH_ALTERNATIVES:
+            if os.path.exists(alt_path) and alt_path != data_path:
+                data_path = alt_path
+                logging.info(f"Using alternative data file: {data_path}")
+                break
+
+    return data_path
+
+
+class DatasetReloader:
+    """
+    Keeps the served dataset in line with the data file without downtime.
+
+    A reload syncs the file into the database on a worker thread in one transaction, so
+    readers keep seeing the previous rows until it commits, then rebuilds the read snapshot
+    off to the side and swaps it in; requests already holding the old snapshot finish on it.
+    `watch` polls the file's mtime and reloads once a changed file has stopped changing.
+
+    `start` runs the first load in the background so the server accepts connections at once;
+    `ready` turns true when a dataset has been published, and `progress` reports the load.
+    """
+
+    def __init__(self, swift_service: SwiftCodeService, session_factory: Callable[[], Session],
+                 data_path: Optional[str] = None, poll_interval: Optional[float] = None):
+        self.swift_service = swift_service
+        self.session_factory = session_factory
+        self.data_path = data_path
+        self.poll_interval = Settings.reload_poll_interval if poll_interval is None else poll_interval
+        self.version: Optional[Dict[str, Any]] = None
+        self._lock = asyncio.Lock()
+        self._mtime: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._load_task: Optional[asyncio.Task] = None
+        self.ready = False
+        self._progress: Dict[str, Any] = {'state': 'idle'}
+        self._started: Optional[float] = None
+
+    @property
+    def reloading(self) -> bool:
+        return self._lock.locked()
+
+    def current_data_path(self) -> str:
+        return self.data_path or resolve_data_path()
+
+    def progress(self) -> Dict[str, Any]:
+        """
+        State of the current or last load: rows parsed and staged so far, rows applied (inserted or updated,
+        known once the staged rows are diffed into the table at the end), expected total, ETA in seconds.
+        """
+        progress = dict(self._progress)
+        if progress['state'] != 'loading':
+            return progress
+
+        elapsed = time.monotonic() - self._started
+        rows_total, rows_parsed = progress['rows_total'], progress['rows_parsed']
+        progress['elapsed_seconds'] = round(elapsed, 1)
+        progress['eta_seconds'] = None
+        if rows_total and rows_parsed:
+            progress['eta_seconds'] = round(max(0.0, elapsed * (rows_total - rows_parsed) / rows_parsed), 1)
+
+        return progress
+
+    def retry_after(self) -> int:
+        """
+        Seconds a client should wait before retrying while not ready: the ETA when known, capped at a minute.
+        """
+        eta = self.progress().get('eta_seconds')
+        if eta:
+            return max(1, min(60, math.ceil(eta)))
+        return Settings.readiness_retry_after
+
+    def _begin_progress(self) -> None:
+        self._started = time.monotonic()
+        self._progress = {
+            'state': 'loading',
+            'started_at': datetime.utcnow(),
+            'rows_parsed': 0,
+            'rows_staged': 0,
+            'rows_applied': 0,
+            'rows_total': None
+        }
+
+    def _on_batch(self, counts: Dict[str, int]) -> None:
+        # Called from the sync thread; replacing the dict keeps readers from seeing a half update.
+        self._progress = dict(
+            self._progress,
+            rows_parsed=counts['row_count'],
+            rows_staged=counts['staged'],
+            rows_applied=counts['inserted'] + counts['updated']
+        )
+
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.current_data_path()).st_mtime
+        except OSError:
+            return None
+
+    def _sync(self, data_path: str) -> Tuple[Optional[Dict[str, int]], Optional[Dict[str, Any]]]:
+        db = self.session_factory()
+        try:
+            repository = SwiftCodeRepository(db)
+            changes = None
+
+            if os.path.exists(data_path):
+                logging.info(f"Syncing SWIFT data from: {data_path}")
+                parser = SwiftCodeParser(data_path)
+                previous = repository.get_latest_import_manifest()
+                self._progress = dict(
+                    self._progress,
+                    rows_total=parser.estimate_rows() or (previous['row_count'] if previous else None)
+                )
+                changes = SwiftCodeIngestService(repository).sync(parser, self._on_batch)
+            else:
+                logging.warning(f"WARNING: Swift data file not found at {data_path} or any alternative locations. Absolute path: {os.path.abspath(data_path)}")
+
+            return changes, repository.get_latest_import_manifest()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _to_version(manifest: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if not manifest:
+            return None
+
+        return {
+            'version': manifest['checksum'][:12],
+            'file_path': manifest['file_path'],
+            'row_count': manifest['row_count'],
+            'loaded_at': manifest['finished_at']
+        }
+
+    async def reload(self) -> Dict[str, Any]:
+        """
+        Sync the data file and publish the result; concurrent calls run one after another.
+        """
+        async with self._lock:
+            data_path = self.current_data_path()
+            self._mtime = self._file_mtime()
+
+            self._begin_progress()
+
+            try:
+                changes, manifest = await asyncio.to_thread(self._sync, data_path)
+
+                if changes is not None or self.swift_service.snapshot is None:
+                    snapshot = await self.swift_service.refresh_snapshot()
+                    logging.info(f"Serving lookups from in-memory snapshot of {len(snapshot)} SWIFT codes.")
+            except Exception as e:
+                self._progress = dict(self._progress, state='failed', error=str(e))
+                raise
+
+            self.version = self._to_version(manifest)
+            self.ready = True
+            self._progress = dict(self._progress, state='ready', finished_at=datetime.utcnow())
+
+        return {
+            'status': 'reloaded' if changes is not None else 'unchanged',
+            'changes': changes,
+            'version': self.version
+        }
+
+    async def watch(self) -> None:
+        pending = None
+
+        while True:
+            await asyncio.sleep(self.poll_interval)
+
+            mtime = self._file_mtime()
+            if mtime is None or mtime == self._mtime:
+                pending = None
+                continue
+
+            # Only reload a file whose mtime held still for a whole interval, not one still being copied.
+            if mtime != pending:
+                pending = mtime
+                continue
+
+            try:
+                result = await self.reload()
+                logging.info(f"Data file changed, reload {result['status']}: {result['changes']}")
+            except Exception:
+                logging.exception("Reloading the changed data file failed; still serving the previous dataset")
+            pending = None
+
+    async def load(self) -> None:
+        """
+        First load at startup. When it fails but an earlier import is in the database, serve that.
+        """
+        try:
+            result = await self.reload()
+            logging.info(f"Dataset {result['status']} at startup: {result['version']}")
+            return
+        except Exception:
+            logging.exception("Loading the data file at startup failed")
+
+        manifest = await asyncio.to_thread(self._latest_manifest)
+        if manifest is not None:
+            await self.swift_service.refresh_snapshot()
+            self.version = self._to_version(manifest)
+            self.ready = True
+            logging.warning(f"Serving the previously imported dataset {self.version['version']}")
+
+    def _latest_manifest(self) -> Optional[Dict[str, Any]]:
+        db = self.session_factory()
+        try:
+            return SwiftCodeRepository(db).get_latest_import_manifest()
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        if self._load_task is None:
+            self._load_task = asyncio.create_task(self.load())
+        if self.poll_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self.watch())
+
+    async def stop(self) -> None:
+        tasks = [task for task in (self._load_task, self._task) if task is not None]
+        self._load_task = self._task = None
+
+        for task in tasks:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.config import Settings
+from app.database import apply_sqlite_pragmas
+from app.repositories.swift_code_repository import SwiftCodeRepository
+from app.services.ingest_service import SwiftCodeIngestService
+from app.services.swift_service import SwiftCodeService
+from app.utils.parser import SwiftCodeParser
+
+IMPORT_EXTENSIONS = ('.csv', '.xlsx')
+UPLOAD_CHUNK_SIZE = 1 << 20
+MAX_TRACKED_JOBS = 100
+
+
+def run_import(file_path: str, database_url: str, batch_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Import one file into the database at database_url. Runs in a worker process, so it opens
+    its own engine instead of touching the parent's.
+    """
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    )
+    apply_sqlite_pragmas(engine, Settings.sqlite_profile)
+
+    db = sessionmaker(bind=engine)()
+    try:
+        ingest_service = SwiftCodeIngestService(SwiftCodeRepository(db), batch_size)
+        return ingest_service.import_file(SwiftCodeParser(file_path, use_snapshot=False))
+    finally:
+        db.close()
+        engine.dispose()
+
+
+class ImportJobManager:
+    """
+    Runs uploaded-file imports as background jobs.
+
+    The upload is copied to a temp file chunk by chunk, then parsed and inserted by `run_import`
+    on a process pool, so neither the parse nor the inserts compete with the event loop.
+    Job state lives in memory and only the most recent MAX_TRACKED_JOBS jobs are kept.
+    """
+
+    def __init__(self, swift_service: SwiftCodeService, database_url: Callable[[], Optional[str]],
+                 executor_factory: Optional[Callable[[], Executor]] = None):
+        self.swift_service = swift_service
+        self.database_url = database_url
+        self.executor_factory = executor_factory or self._process_pool
+        self.executor: Optional[Executor] = None
+        self.jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def _process_pool() -> Executor:
+        # spawn, not fork: the server process holds threads and open connections a fork would copy.
+        return ProcessPoolExecutor(max_workers=Settings.import_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def _get_executor(self) -> Executor:
+        if self.executor is None:
+            self.executor = self.executor_factory()
+        return self.executor
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    async def submit(self, filename: str, read: Callable[[int], Any]) -> Dict[str, Any]:
+        """
+        Copy the upload (read(size) -> awaitable bytes) to a temp file and queue its import.
+        Raises ValueError for unsupported file types.
+        """
+        extension = os.path.splitext(filename or '')[1].lower()
+        if extension not in IMPORT_EXTENSIONS:
+            raise ValueError(f"Not a valid file type: {extension or filename}. Only .csv and .xlsx are supported.")
+
+        database_url = self.database_url()
+        if database_url is None:
+            raise RuntimeError("The database is not initialized")
+
+        handle = tempfile.NamedTemporaryFile(suffix=extension, prefix="swift-import-", dir=Settings.import_dir, delete=False)
+        size = 0
+        try:
+            with handle:
+                while chunk := await read(UPLOAD_CHUNK_SIZE):
+                    await asyncio.to_thread(handle.write, chunk)
+                    size += len(chunk)
+        except BaseException:
+            os.unlink(handle.name)
+            raise
+
+        job_id = uuid.uuid4().hex
+        self.jobs[job_id] = {
+            'job_id': job_id,
+            'status': 'queued',
+            'filename': filename,
+            'size_bytes': size,
+            'submitted_at': datetime.utcnow()
+        }
+        while len(self.jobs) > MAX_TRACKED_JOBS:
+            self.jobs.popitem(last=False)
+
+        self._tasks[job_id] = asyncio.create_task(self._run(job_id, handle.name, database_url))
+        return self.get_job(job_id)
+
+    async def _run(self, job_id: str, file_path: str, database_url: str) -> None:
+        job = self.jobs[job_id]
+        loop = asyncio.get_running_loop()
+        job['status'] = 'running'
+
+        try:
+            result = await loop.run_in_executor(self._get_executor(), run_import, file_path, database_url)
+            job.update(result, status='completed')
+
+            if result['inserted']:
+                await self.swift_service.refresh_snapshot()
+        except Exception as e:
+            logging.exception(f"Import job {job_id} ({job['filename']}) failed")
+            job.update(status='failed', error=str(e))
+        finally:
+            job['finished_at'] = datetime.utcnow()
+            self._tasks.pop(job_id, None)
+            try:
+                os.unlink(file_path)
+            except OSError:
+                pass
+
+    async def wait(self, job_id: str) -> Optional[Dict[str, Any]]:
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.shield(task)
+        return self.get_job(job_id)
+
+    async def close(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,111 @@
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+from app.config import Settings
+from app.repositories.swift_code_repository import SwiftCodeRepository
+from app.utils.parser import SwiftCodeParser
+from app.utils.validation import record_rejection
+
+MAX_REJECTION_SAMPLES = 20
+
+
+class SwiftCodeIngestService:
+    """
+    Chunked ingest pipeline: read_csv/openpyxl chunk -> normalize -> insert batch -> commit.
+    Branch links are not stored; they follow from the codes and are only counted for the logs.
+
+    `sync` is the incremental variant used at startup: it diffs the file against the stored
+    row hashes and applies only the changes, skipping files already imported.
+    `import_file` adds an uploaded file on top of the stored data, skipping invalid rows and
+    codes that already exist.
+    """
+
+    def __init__(self, swift_code_repository: SwiftCodeRepository, batch_size: Optional[int] = None):
+        self.swift_code_repository = swift_code_repository
+        self.batch_size = batch_size or Settings.ingest_batch_size
+
+    def ingest(self, parser: SwiftCodeParser) -> int:
+        started = time.perf_counter()
+        inserted = 0
+
+        for batch in parser.iter_records(self.batch_size):
+            inserted += self.swift_code_repository.insert_swift_code_batch(batch)
+            logging.info(f"Inserted {inserted} SWIFT codes so far from {parser.file_path}")
+
+        linked = self.swift_code_repository.count_branch_links()
+
+        elapsed = time.perf_counter() - started
+        logging.info(f"Ingested {inserted} SWIFT codes and {linked} branch links in {elapsed:.2f}s")
+        return inserted
+
+    def sync(self, parser: SwiftCodeParser,
+             on_batch: Optional[Callable[[Dict[str, int]], None]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Bring the database in line with the parser's file; returns the change counts, or None when
+        the file's checksum matches the last import and nothing was done. on_batch gets progress counts.
+        """
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        checksum = parser.checksum()
+
+        latest = self.swift_code_repository.get_latest_import_manifest()
+        if latest and latest['checksum'] == checksum:
+            logging.info(f"{parser.file_path} matches the last import ({checksum[:12]}), nothing to reload")
+            return None
+
+        counts = self.swift_code_repository.sync_swift_codes(
+            parser.iter_records(self.batch_size),
+            {'file_path': parser.file_path, 'checksum': checksum, 'started_at': started_at},
+            on_batch
+        )
+
+        elapsed = time.perf_counter() - started
+        logging.info(
+            f"Synced {counts['row_count']} rows from {parser.file_path} in {elapsed:.2f}s: "
+            f"{counts['inserted']} inserted, {counts['updated']} updated, {counts['deleted']} deleted, "
+            f"{counts['rejected']} rejected, {counts['linked']} branch links"
+        )
+        return counts
+
+    def import_file(self, parser: SwiftCodeParser) -> Dict[str, Any]:
+        """
+        Validate and insert every row of the file, leaving existing codes untouched; returns the
+        row counts (rejected rows with a sample of reasons), elapsed time and throughput.
+        """
+        started = time.perf_counter()
+        counts = {'row_count': 0, 'inserted': 0, 'duplicates': 0, 'rejected': 0}
+        rejections = []
+        # Imports only add rows, so the growth in links is exactly the links the new rows made.
+        links_before = self.swift_code_repository.count_branch_links()
+
+        for batch in parser.iter_records(self.batch_size):
+            valid = []
+            for offset, record in enumerate(batch):
+                reason = record_rejection(record)
+                if reason is None:
+                    valid.append(record)
+                    continue
+
+                counts['rejected'] += 1
+                if len(rejections) < MAX_REJECTION_SAMPLES:
+                    rejections.append({'row': counts['row_count'] + offset + 1, 'reason': reason})
+
+            inserted = self.swift_code_repository.insert_new_swift_codes(valid)
+            counts['row_count'] += len(batch)
+            counts['inserted'] += inserted
+            counts['duplicates'] += len(valid) - inserted
+
+        counts['linked'] = self.swift_code_repository.count_branch_links() - links_before
+
+        elapsed = time.perf_counter() - started
+        logging.info(
+            f"Imported {counts['inserted']} of {counts['row_count']} rows from {parser.file_path} in {elapsed:.2f}s "
+            f"({counts['duplicates']} duplicates, {counts['rejected']} rejected)"
+        )
+        return dict(
+            counts,
+            rejections=rejections,
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(counts['row_count'] / elapsed, 1) if elapsed > 0 else None
+        )
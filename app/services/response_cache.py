@@ -0,0 +1,75 @@
+import threading
+from typing import Any, Dict, Iterable, Optional
+from app.models.types import SwiftCodeWithBranchesResponse, CountrySwiftCodesResponse
+
+
+class JsonResponseCache:
+    """
+    Ready-to-send JSON bodies per SWIFT code and per country.
+
+    Bodies are rendered once through the response models and served as bytes afterwards.
+    Every invalidation bumps `generation`; a body rendered from data read before an
+    invalidation is returned to its caller but not stored. Countries without codes are
+    not stored either, so requests for arbitrary country paths cannot grow the cache.
+    """
+
+    def __init__(self):
+        self._swift_codes: Dict[str, bytes] = {}
+        self._countries: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    @staticmethod
+    def render_swift_code(result: Dict[str, Any]) -> bytes:
+        return SwiftCodeWithBranchesResponse.model_validate(result).model_dump_json().encode()
+
+    @staticmethod
+    def render_country(result: Dict[str, Any]) -> bytes:
+        return CountrySwiftCodesResponse.model_validate(result).model_dump_json().encode()
+
+    def get_swift_code(self, swift_code: str) -> Optional[bytes]:
+        return self._swift_codes.get(swift_code.upper())
+
+    def get_country(self, country_iso2: str) -> Optional[bytes]:
+        return self._countries.get(country_iso2.upper())
+
+    def put_swift_code(self, swift_code: str, result: Dict[str, Any], generation: int) -> bytes:
+        body = self.render_swift_code(result)
+
+        with self._lock:
+            if generation == self.generation:
+                self._swift_codes[swift_code.upper()] = body
+
+        return body
+
+    def put_country(self, country_iso2: str, result: Dict[str, Any], generation: int) -> bytes:
+        body = self.render_country(result)
+
+        with self._lock:
+            if generation == self.generation and result['swift_codes']:
+                self._countries[country_iso2.upper()] = body
+
+        return body
+
+    def invalidate(self, swift_codes: Iterable[Optional[str]] = (), countries: Optional[Iterable[str]] = None) -> None:
+        """
+        Drop the given SWIFT codes and countries; countries=None drops every country body.
+        """
+        with self._lock:
+            self.generation += 1
+
+            for swift_code in swift_codes:
+                if swift_code:
+                    self._swift_codes.pop(swift_code.upper(), None)
+
+            if countries is None:
+                self._countries.clear()
+            else:
+                for country_iso2 in countries:
+                    self._countries.pop(country_iso2.upper(), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._swift_codes.clear()
+            self._countries.clear()
@@ -1,42 +1,376 @@
-from typing import Dict, Any, Optional
+import asyncio
+import inspect
+import json
+import logging
+import threading
+import time
+from typing import Dict, Any, AsyncIterator, Iterable, List, Optional, Tuple, Union
+from app.config import Settings
 from app.repositories.swift_code_repository import SwiftCodeRepository
+from app.repositories.async_swift_code_repository import AsyncSwiftCodeRepository
+from app.services.swift_snapshot import SwiftCodeSnapshot
+from app.services.response_cache import JsonResponseCache
+from app.services.write_batcher import WriteBatcher
+from app.utils.trigram_index import TrigramIndex
+from app.utils.validation import headquarters_code
+
+
+async def _resolve(result):
+    """
+    Await repository results coming from AsyncSwiftCodeRepository; pass synchronous results through.
+    """
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+def _to_ndjson(records: List[Dict[str, Any]]) -> bytes:
+    return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode()
+
+
+def _to_record(swift_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The snapshot record of a written code, normalized the way the repository stores it.
+    """
+    return {
+        'swift_code': swift_data['swift_code'].upper(),
+        'bank_name': swift_data['bank_name'],
+        'address': swift_data['address'],
+        'country_iso2': swift_data['country_iso2'].upper(),
+        'country_name': swift_data['country_name'].upper(),
+        'is_headquarters': swift_data['is_headquarters']
+    }
+
+
+def _bank_search_text(record: Dict[str, Any]) -> str:
+    if Settings.bank_search_include_address:
+        return f"{record['bank_name']} {record['address']}"
+    return record['bank_name']
 
 
 class SwiftCodeService:
-    def __init__(self, swift_code_repository: SwiftCodeRepository):
+    def __init__(self, swift_code_repository: Union[SwiftCodeRepository, AsyncSwiftCodeRepository],
+                 write_batch_window_ms: Optional[float] = None, write_batch_size: Optional[int] = None):
         self.swift_code_repository = swift_code_repository
+        self.snapshot: Optional[SwiftCodeSnapshot] = None
+        self._snapshot_lock = threading.Lock()
+        self.response_cache = JsonResponseCache()
+        self.bank_name_index = TrigramIndex()
+        self._writes = 0
+        self._compaction: Optional[asyncio.Task] = None
+
+        # With a batch window, concurrent creates/deletes share one transaction (group commit).
+        window_ms = Settings.write_batch_window_ms if write_batch_window_ms is None else write_batch_window_ms
+        self.write_batcher: Optional[WriteBatcher] = None
+        if window_ms > 0:
+            self.write_batcher = WriteBatcher(
+                self._apply_writes, window_ms / 1000, write_batch_size or Settings.write_batch_size
+            )
+
+    async def _apply_writes(self, operations: List[Tuple[str, Any]]) -> List[Any]:
+        """
+        The write batcher's apply step: the batch in one transaction, then one snapshot patch and one
+        cache invalidation for all of its operations that succeeded.
+        """
+        delete_targets = {
+            swift_code: await self._delete_targets(swift_code) for kind, swift_code in operations if kind == 'delete'
+        }
+        results = await _resolve(self.swift_code_repository.apply_writes(operations))
+
+        # Final state per code, so a code created and deleted within the batch (in either order) ends up right.
+        changes: Dict[str, Optional[Dict[str, Any]]] = {}
+        stale_codes: List[Optional[str]] = []
+        countries: Optional[set] = set()
+
+        for (kind, argument), result in zip(operations, results):
+            if isinstance(result, BaseException) or not result:
+                continue
+
+            if kind == 'create':
+                record = _to_record(argument)
+                changes[record['swift_code']] = record
+                stale_codes += [record['swift_code'], result['headquarter_swift']]
+                if countries is not None:
+                    countries.add(record['country_iso2'])
+            else:
+                hq_code, deleted_countries = delete_targets[argument]
+                changes[argument.upper()] = None
+                stale_codes += [argument, hq_code]
+                countries = None if countries is None or deleted_countries is None else countries | set(deleted_countries)
+
+        if changes:
+            self._publish_writes(
+                [record for record in changes.values() if record is not None],
+                [swift_code for swift_code, record in changes.items() if record is None],
+                stale_codes,
+                countries
+            )
+
+        return results
+
+    async def close(self) -> None:
+        if self.write_batcher is not None:
+            await self.write_batcher.close()
+        if self._compaction is not None:
+            await self._compaction
+
+    def _compact_later(self) -> None:
+        """
+        Start folding the snapshot's overlay of recent writes into its base once it has grown large.
+        """
+        snapshot = self.snapshot
+        if self._compaction is None and snapshot is not None and snapshot.needs_compaction():
+            self._compaction = asyncio.create_task(self._compact(snapshot))
+
+    async def _compact(self, snapshot: SwiftCodeSnapshot) -> None:
+        """
+        Build the compacted snapshot on a worker thread, then swap it in with the writes published meanwhile.
+        """
+        try:
+            compacted = await asyncio.to_thread(snapshot.compacted)
+
+            with self._snapshot_lock:
+                rebased = self.snapshot.rebased(compacted, snapshot) if self.snapshot is not None else None
+                if rebased is not None:
+                    self.snapshot = rebased
+        finally:
+            self._compaction = None
+
+    @staticmethod
+    def _build_read_models(records, country_names):
+        snapshot = SwiftCodeSnapshot.build(records, country_names)
+        bank_name_index = TrigramIndex.build((record['swift_code'], _bank_search_text(record)) for record in records)
+
+        return snapshot, bank_name_index
+
+    async def refresh_snapshot(self, attempts: int = 3) -> SwiftCodeSnapshot:
+        """
+        Rebuild the read snapshot from the database off the event loop and publish it atomically.
+        Requests holding the previous snapshot finish on it. A create/delete landing mid-build
+        would be missing from the new snapshot, so the build is retried when one does.
+        """
+        for attempt in range(1, attempts + 1):
+            writes = self._writes
+            records, country_names = await _resolve(self.swift_code_repository.load_snapshot_data())
+            snapshot, bank_name_index = await asyncio.to_thread(self._build_read_models, records, country_names)
+
+            with self._snapshot_lock:
+                if self._writes == writes or attempt == attempts:
+                    if self._writes != writes:
+                        logging.warning("Publishing a snapshot built while writes were in flight")
+                    self.snapshot = snapshot
+                    self.bank_name_index = bank_name_index
+                    self.response_cache.clear()
+                    return snapshot
+
+    async def relink_branches(self) -> Dict[str, Any]:
+        """
+        Count headquarters, linked and orphaned branches with one statement. Links are derived from the
+        code prefixes on every read, so there is nothing to rebuild and the snapshot and cached bodies stay
+        as they are. Returns the counts and the time taken.
+        """
+        started = time.perf_counter()
+        stats = await _resolve(self.swift_code_repository.get_branch_link_stats())
+
+        return dict(stats, elapsed_seconds=round(time.perf_counter() - started, 3))
+
+    def _publish_record(self, swift_data: Dict[str, Any], hq_code: Optional[str],
+                        previous: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Patch the snapshot, bank-name index and response cache after one code was written.
+        previous holds the replaced row's is_headquarters and country_iso2 on an update.
+        """
+        record = _to_record(swift_data)
+        countries = {record['country_iso2']}
+        if previous is not None:
+            countries.add(previous['country_iso2'])
+
+        self._publish_writes([record], [], [record['swift_code'], hq_code], countries)
+
+    def _publish_writes(self, records: List[Dict[str, Any]], deleted: List[str],
+                        stale_codes: List[Optional[str]], countries: Optional[Iterable[str]]) -> None:
+        """
+        Patch the snapshot, bank-name index and response cache once for a set of writes: records were
+        created or replaced, deleted codes removed. stale_codes and countries name the cached bodies to
+        drop (countries=None: every country).
+        """
+        with self._snapshot_lock:
+            self._writes += 1
+            if self.snapshot is not None:
+                snapshot = self.snapshot
+                if records:
+                    snapshot = snapshot.with_records(records)
+                    for record in records:
+                        self.bank_name_index.add(record['swift_code'], _bank_search_text(record))
+                if deleted:
+                    snapshot = snapshot.without_records(deleted)
+                    for swift_code in deleted:
+                        self.bank_name_index.remove(swift_code)
+                self.snapshot = snapshot
+
+            self.response_cache.invalidate(stale_codes, countries)
+
+        self._compact_later()
 
     async def create_swift_code(self, swift_data: Dict[str, Any]):
-        new_swift_code = self.swift_code_repository.create_swift_code(swift_data)
+        if self.write_batcher is not None:
+            # Published together with the rest of its batch by _apply_writes.
+            return await self.write_batcher.submit('create', swift_data)
+
+        new_swift_code = await _resolve(self.swift_code_repository.create_swift_code(swift_data))
+
+        hq_code = None if swift_data['is_headquarters'] else new_swift_code['headquarter_swift']
+        self._publish_record(swift_data, hq_code)
 
         return new_swift_code
-    
-    
+
+
+    async def upsert_swift_code(self, swift_data: Dict[str, Any]) -> str:
+        """
+        Create or replace a code; returns 'created', 'updated' or 'unchanged'.
+        """
+        result = await _resolve(self.swift_code_repository.upsert_swift_code(swift_data))
+
+        if result['status'] != 'unchanged':
+            # Not result['headquarter_swift']: a code turned from branch into headquarters (or back) has none,
+            # yet the headquarters its prefix names listed (or now lists) it among its branches.
+            self._publish_record(result, headquarters_code(result['swift_code']), result['previous'])
+
+        return result['status']
+
+
+    async def bulk_create_swift_codes(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Insert normalized records in one transaction through the set-based repository path and
+        patch the snapshot, index and cache once for the whole batch. Returns the links the batch
+        created, including stored orphan branches adopted by its new headquarters.
+        """
+        links = await _resolve(self.swift_code_repository.bulk_create_swift_codes(records))
+
+        self._publish_writes(
+            records,
+            [],
+            [record['swift_code'] for record in records] + [hq_code for hq_code, _ in links],
+            {record['country_iso2'] for record in records}
+        )
+
+        return len(links)
+
+
+    async def get_existing_codes(self, swift_codes: List[str]) -> set:
+        snapshot = self.snapshot
+        if snapshot is not None:
+            return {code for code in swift_codes if code in snapshot}
+
+        return await _resolve(self.swift_code_repository.get_existing_codes(swift_codes))
+
+
     async def get_swift_code(self, swift_code: str) -> Optional[Dict[str, Any]]:
-        swift_code = self.swift_code_repository.get_swift_code(swift_code)
-    
+        snapshot = self.snapshot
+        if snapshot is not None:
+            return snapshot.get(swift_code)
+
+        swift_code = await _resolve(self.swift_code_repository.get_swift_code(swift_code))
+
         return swift_code
 
 
+    async def get_swift_codes(self, swift_codes: List[str]) -> Dict[str, Any]:
+        """
+        Resolve many codes at once; returns the found records (with branches) and the missing codes.
+        """
+        swift_codes = list(dict.fromkeys(code.strip().upper() for code in swift_codes))
+
+        snapshot = self.snapshot
+        if snapshot is not None:
+            found = {code: snapshot.get(code) for code in swift_codes}
+        else:
+            found = await _resolve(self.swift_code_repository.get_swift_codes(swift_codes))
+
+        return {
+            'swift_codes': [found[code] for code in swift_codes if found.get(code)],
+            'missing': [code for code in swift_codes if not found.get(code)]
+        }
+
+
+    async def search_prefix(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        snapshot = self.snapshot
+        if snapshot is None:
+            snapshot = await self.refresh_snapshot()
+
+        return snapshot.search_prefix(prefix, limit)
+
+
+    async def search_bank_name(self, query: str, limit: int, country_iso2: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Fuzzy bank-name search over the trigram index, best matches first, optionally within one country.
+        """
+        if self.snapshot is None:
+            await self.refresh_snapshot()
+
+        with self._snapshot_lock:
+            snapshot, bank_name_index = self.snapshot, self.bank_name_index
+
+        accept = None
+        if country_iso2:
+            country_iso2 = country_iso2.upper()
+
+            def accept(swift_code: str) -> bool:
+                return snapshot.country_of(swift_code) == country_iso2
+
+        results = []
+        for swift_code, score in bank_name_index.search(query, limit, accept):
+            record = snapshot.get_record(swift_code)
+            if record is not None:
+                results.append(dict(record, score=score))
+
+        return results
+
+
     async def get_country_swift_codes(self, country_iso2: str) -> Dict[str, Any]:
-        swift_codes_contries = self.swift_code_repository.get_country_swift_codes(country_iso2)
-        
+        swift_codes_contries = await _resolve(self.swift_code_repository.get_country_swift_codes(country_iso2))
+
         return swift_codes_contries
 
 
-    async def delete_swift_code(self, swift_code: str) -> bool:
-        deleted_swift_code = self.swift_code_repository.delete_swift_code(swift_code)
+    async def get_country_swift_codes_page(self, country_iso2: str, limit: int, after: Optional[str] = None) -> Dict[str, Any]:
+        return await _resolve(self.swift_code_repository.get_country_swift_codes_page(country_iso2, limit, after))
 
-        return deleted_swift_code
-    
-    async def add_many_swift_codes(self, swift_codes: list[Dict[str, Any]]):
-        many_swift_codes = self.swift_code_repository.add_many_swift_codes(swift_codes)
+    async def stream_country_swift_codes(self, country_iso2: str) -> AsyncIterator[bytes]:
+        """
+        Yield a country's codes as NDJSON, one chunk per database batch.
+        """
+        batches = self.swift_code_repository.iter_country_swift_codes(country_iso2, Settings.stream_batch_size)
+
+        if hasattr(batches, '__aiter__'):
+            async for batch in batches:
+                yield _to_ndjson(batch)
+        else:
+            for batch in batches:
+                yield _to_ndjson(batch)
+
+
+    async def _delete_targets(self, swift_code: str) -> Tuple[Optional[str], Optional[List[str]]]:
+        """
+        The headquarters and countries whose cached bodies a delete of swift_code makes stale;
+        countries is None (all) when there is no snapshot to look the code up in.
+        """
+        snapshot = self.snapshot
+        if snapshot is not None:
+            country_iso2 = snapshot.country_of(swift_code)
+            return snapshot.headquarter_of(swift_code), [country_iso2] if country_iso2 else []
 
-        return many_swift_codes
-    
-    async def add_many_associations(self, associations: list[Dict[str, Any]]):
-        many_associations = self.swift_code_repository.add_many_associations(associations)
+        return await _resolve(self.swift_code_repository.get_headquarter_swift(swift_code)), None
 
-        return many_associations
-    
+    async def delete_swift_code(self, swift_code: str) -> bool:
+        if self.write_batcher is not None:
+            # Published together with the rest of its batch by _apply_writes.
+            return await self.write_batcher.submit('delete', swift_code)
+
+        hq_code, countries = await self._delete_targets(swift_code)
+        deleted_swift_code = await _resolve(self.swift_code_repository.delete_swift_code(swift_code))
 
+        if deleted_swift_code:
+            self._publish_writes([], [swift_code.upper()], [swift_code, hq_code], countries)
+
+        return deleted_swift_code
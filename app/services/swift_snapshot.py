@@ -0,0 +1,251 @@
+import heapq
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from app.utils.validation import branch_headquarters, has_branches, institution_range
+
+_MISSING = object()
+
+
+class SwiftCodeSnapshot:
+    """
+    Immutable in-process view of the swift_codes table.
+
+    Holds every record keyed by SWIFT code and a sorted array of codes. A headquarters'
+    branches share its first 8 characters, so they are one bisected slice of that array,
+    the same range the repository scans on the primary key; prefix search bisects it too.
+    Records are held without their country name, which is kept once per country in an
+    ISO2 -> name map and joined back in by the methods returning records.
+
+    A published snapshot is never mutated. Writes since the base map was built live in a
+    small overlay (code -> record, or None for a deleted code) with its own sorted array:
+    `with_record(s)` / `without_record(s)` copy only the overlay and share the base, so a
+    write costs O(overlay) rather than O(dataset). Once the overlay outgrows OVERLAY_LIMIT,
+    the owner folds it into a new base with `compacted` (O(dataset), meant to run off the
+    event loop) and carries the writes made meanwhile over with `rebased`.
+    """
+
+    OVERLAY_LIMIT = 1024
+
+    def __init__(self, records: Dict[str, Dict[str, Any]], sorted_codes: Optional[List[str]] = None,
+                 country_names: Optional[Dict[str, str]] = None,
+                 overlay: Optional[Dict[str, Optional[Dict[str, Any]]]] = None,
+                 overlay_codes: Optional[List[str]] = None, size: Optional[int] = None):
+        self._records = records
+        self._sorted_codes = sorted_codes if sorted_codes is not None else sorted(records)
+        self._country_names = country_names if country_names is not None else {}
+        self._overlay = overlay if overlay is not None else {}
+        self._overlay_codes = overlay_codes if overlay_codes is not None else sorted(self._overlay)
+        self._size = size if size is not None else len(records)
+
+    @classmethod
+    def build(cls, records: Iterable[Dict[str, Any]],
+              country_names: Optional[Dict[str, str]] = None) -> "SwiftCodeSnapshot":
+        """
+        Records may leave their country name to country_names or carry it, in which case it is moved to the map.
+        """
+        records = list(records)
+        country_names = cls._merge_country_names(dict(country_names or {}), records)
+
+        return cls({record['swift_code']: cls._stored(record) for record in records}, country_names=country_names)
+
+    @staticmethod
+    def _stored(record: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in record.items() if key != 'country_name'}
+
+    @staticmethod
+    def _merge_country_names(country_names: Dict[str, str], records: Iterable[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        country_names plus the countries records name that it lacks (the first name given wins); a name it
+        already has is kept, as writes never rename a country. The same dict when nothing is added, a copy otherwise.
+        """
+        added: Dict[str, str] = {}
+        for record in records:
+            if 'country_name' in record and record['country_iso2'] not in country_names:
+                added.setdefault(record['country_iso2'], record['country_name'])
+
+        return {**country_names, **added} if added else country_names
+
+    def _with_country_name(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        result = dict(record)
+        result['country_name'] = self._country_names.get(record['country_iso2'], "")
+        return result
+
+    def _record(self, swift_code: str) -> Optional[Dict[str, Any]]:
+        """
+        The stored record of an upper-case code, overlay first; None when absent or deleted.
+        """
+        if swift_code in self._overlay:
+            return self._overlay[swift_code]
+        return self._records.get(swift_code)
+
+    def _codes_from(self, low: str) -> Iterator[str]:
+        """
+        Live codes from low upwards in order: the base and overlay arrays merged, deleted codes skipped.
+        """
+        codes = self._sorted_codes
+        base = (codes[index] for index in range(bisect_left(codes, low), len(codes)))
+        if not self._overlay:
+            yield from base
+            return
+
+        overlay = self._overlay_codes[bisect_left(self._overlay_codes, low):]
+        previous = None
+        for swift_code in heapq.merge(base, overlay):
+            if swift_code != previous and self._record(swift_code) is not None:
+                yield swift_code
+            previous = swift_code
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, swift_code: str) -> bool:
+        return self._record(swift_code.upper()) is not None
+
+    def _branch_codes(self, hq_code: str) -> List[str]:
+        if not has_branches(hq_code):
+            return []
+
+        low, high = institution_range(hq_code)
+        branch_codes = []
+        for swift_code in self._codes_from(low):
+            if swift_code >= high:
+                break
+            if swift_code != hq_code and not self._record(swift_code)['is_headquarters']:
+                branch_codes.append(swift_code)
+
+        return branch_codes
+
+    def get(self, swift_code: str) -> Optional[Dict[str, Any]]:
+        swift_code = swift_code.upper()
+        record = self._record(swift_code)
+
+        if record is None:
+            return None
+
+        result = self._with_country_name(record)
+        result['branches'] = []
+
+        if record['is_headquarters']:
+            result['branches'] = [
+                self._with_country_name(self._record(branch_code)) for branch_code in self._branch_codes(swift_code)
+            ]
+
+        return result
+
+    def get_record(self, swift_code: str) -> Optional[Dict[str, Any]]:
+        """
+        The record without branches.
+        """
+        record = self._record(swift_code.upper())
+        return self._with_country_name(record) if record is not None else None
+
+    def country_of(self, swift_code: str) -> Optional[str]:
+        record = self._record(swift_code.upper())
+        return record['country_iso2'] if record is not None else None
+
+    def search_prefix(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        prefix = prefix.upper()
+        results = []
+
+        for swift_code in self._codes_from(prefix):
+            if not swift_code.startswith(prefix) or len(results) >= limit:
+                break
+            results.append(self._with_country_name(self._record(swift_code)))
+
+        return results
+
+    def headquarter_of(self, swift_code: str) -> Optional[str]:
+        swift_code = swift_code.upper()
+        record = self._record(swift_code)
+        if record is None or record['is_headquarters']:
+            return None
+
+        hq_code = branch_headquarters(swift_code)
+        headquarter = self._record(hq_code) if hq_code else None
+        if headquarter is None or not headquarter['is_headquarters']:
+            return None
+        return hq_code
+
+    def _with_overlay(self, changes: List[tuple], country_names: Dict[str, str]) -> "SwiftCodeSnapshot":
+        """
+        A snapshot sharing this one's base, with (code, record or None) changes applied to a copy of the overlay.
+        """
+        overlay = dict(self._overlay)
+        size = self._size
+        new_codes = []
+
+        for swift_code, record in changes:
+            current = overlay[swift_code] if swift_code in overlay else self._records.get(swift_code)
+            size += (record is not None) - (current is not None)
+            if swift_code not in overlay:
+                new_codes.append(swift_code)
+            overlay[swift_code] = record
+
+        overlay_codes = self._overlay_codes
+        if new_codes:
+            overlay_codes = list(heapq.merge(overlay_codes, sorted(new_codes)))
+
+        return SwiftCodeSnapshot(self._records, self._sorted_codes, country_names, overlay, overlay_codes, size)
+
+    def with_record(self, record: Dict[str, Any]) -> "SwiftCodeSnapshot":
+        return self.with_records([record])
+
+    def with_records(self, records: List[Dict[str, Any]]) -> "SwiftCodeSnapshot":
+        return self._with_overlay(
+            [(record['swift_code'], self._stored(record)) for record in records],
+            self._merge_country_names(self._country_names, records)
+        )
+
+    def without_record(self, swift_code: str) -> "SwiftCodeSnapshot":
+        return self.without_records([swift_code])
+
+    def without_records(self, swift_codes: Iterable[str]) -> "SwiftCodeSnapshot":
+        removed = [(swift_code, None) for swift_code in dict.fromkeys(swift_codes) if self._record(swift_code) is not None]
+        if not removed:
+            return self
+
+        return self._with_overlay(removed, self._country_names)
+
+    def needs_compaction(self) -> bool:
+        return len(self._overlay) > self.OVERLAY_LIMIT
+
+    def compacted(self) -> "SwiftCodeSnapshot":
+        """
+        The same view with the overlay folded into a new base; O(dataset), so call it off the event loop.
+        """
+        if not self._overlay:
+            return self
+
+        records = dict(self._records)
+        removed = set()
+        for swift_code, record in self._overlay.items():
+            if record is not None:
+                records[swift_code] = record
+            elif records.pop(swift_code, None) is not None:
+                removed.add(swift_code)
+
+        new_codes = [
+            swift_code for swift_code in self._overlay_codes
+            if swift_code not in self._records and self._overlay[swift_code] is not None
+        ]
+        sorted_codes = heapq.merge(self._sorted_codes, new_codes)
+        if removed:
+            sorted_codes = (swift_code for swift_code in sorted_codes if swift_code not in removed)
+
+        return SwiftCodeSnapshot(records, list(sorted_codes), self._country_names)
+
+    def rebased(self, compacted: "SwiftCodeSnapshot", source: "SwiftCodeSnapshot") -> Optional["SwiftCodeSnapshot"]:
+        """
+        This snapshot on top of compacted (source.compacted()), its overlay reduced to the writes made since
+        source. None when this snapshot does not derive from source, e.g. a full rebuild replaced it meanwhile.
+        """
+        if self._records is not source._records:
+            return None
+
+        overlay = {
+            swift_code: record for swift_code, record in self._overlay.items()
+            if source._overlay.get(swift_code, _MISSING) is not record
+        }
+
+        return SwiftCodeSnapshot(compacted._records, compacted._sorted_codes, self._country_names, overlay,
+                                 size=self._size)
@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+Operation = Tuple[str, Any]
+
+
+class WriteBatcher:
+    """
+    Group commit for single-row writes.
+
+    Operations submitted concurrently are collected for up to `window` seconds or `max_size`
+    operations and handed to `apply_batch` together, which applies them in one transaction and
+    returns one result (or exception) per operation. Each caller awaits only its own outcome.
+    Batches are applied one at a time; while one is in flight the next keeps filling.
+    An operation whose caller gave up is still applied.
+    """
+
+    def __init__(self, apply_batch: Callable[[List[Operation]], Awaitable[List[Any]]], window: float, max_size: int):
+        self.apply_batch = apply_batch
+        self.window = window
+        self.max_size = max(1, max_size)
+        self._pending: List[Tuple[Operation, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lock = asyncio.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, kind: str, argument: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(((kind, argument), future))
+
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._apply(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _apply(self, batch: List[Tuple[Operation, asyncio.Future]]) -> None:
+        async with self._lock:
+            try:
+                results = await self.apply_batch([operation for operation, _ in batch])
+            except Exception as e:
+                results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """
+        Apply whatever is still pending and wait for the batches in flight.
+        """
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,264 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from typing import Any, Dict, Iterator, List, Optional
+
+# Layout, all integers little-endian:
+#   header    magic, format version, source file sha256, row count, country count,
+#             text count, heap length (code points), heap size (bytes), crc32 of everything after the header
+#   codes     row_count * 11 ASCII bytes, right-padded with spaces
+#   flags     row_count bytes, 1 for headquarters
+#   countries row_count * uint16 indexes into the country dictionary
+#   offsets   (text_count + 1) * uint32 code-point offsets into the heap
+#   heap      UTF-8 text: bank names, addresses, then the dictionary's ISO2 codes and country names
+MAGIC = b"SWIFTSNP"
+FORMAT_VERSION = 1
+CODE_WIDTH = 11
+HEADER = struct.Struct("<8sH32sIHIQQI")
+COPY_BLOCK_SIZE = 1 << 20
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class BinarySnapshot:
+    """
+    Columnar, versioned on-disk form of a normalized SWIFT dataset.
+
+    Codes are a fixed-width column, country ISO2/name pairs are dictionary-encoded and all
+    free text lives in one string heap addressed by offsets, so loading is a handful of
+    bulk decodes of a memory-mapped file instead of parsing the source spreadsheet.
+    """
+
+    def __init__(self, codes: str, flags: bytes, countries: array, offsets: array, heap: str):
+        self._codes = codes
+        self._flags = flags
+        self._countries = countries
+        self._offsets = offsets
+        self._heap = heap
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    def _text(self, index: int) -> str:
+        return self._heap[self._offsets[index]:self._offsets[index + 1]]
+
+    def iter_records(self, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        rows = len(self)
+        dictionary_start = 2 * rows
+        country_count = (len(self._offsets) - 1 - dictionary_start) // 2
+        country_pairs = [
+            (self._text(dictionary_start + index), self._text(dictionary_start + country_count + index))
+            for index in range(country_count)
+        ]
+
+        for start in range(0, rows, chunk_size):
+            records = []
+            for row in range(start, min(rows, start + chunk_size)):
+                country_iso2, country_name = country_pairs[self._countries[row]]
+                records.append({
+                    'swift_code': self._codes[row * CODE_WIDTH:(row + 1) * CODE_WIDTH].rstrip(' '),
+                    'bank_name': self._text(row),
+                    'address': self._text(rows + row),
+                    'country_iso2': country_iso2,
+                    'country_name': country_name,
+                    'is_headquarters': self._flags[row] == 1
+                })
+            yield records
+
+    @staticmethod
+    def write(path: str, records: List[Dict[str, Any]], source_checksum: str) -> None:
+        """
+        Write records to path; raises ValueError for data the format cannot hold (codes over 11 ASCII characters).
+        """
+        writer = BinarySnapshotWriter()
+        try:
+            writer.add(records)
+            writer.finish(path, source_checksum)
+        finally:
+            writer.close()
+
+    @staticmethod
+    def peek_row_count(path: str, source_checksum: str) -> Optional[int]:
+        """
+        Row count from the header of a snapshot of the given source, without reading the body.
+        """
+        try:
+            with open(path, "rb") as handle:
+                header = handle.read(HEADER.size)
+        except OSError:
+            return None
+
+        if len(header) < HEADER.size:
+            return None
+
+        magic, version, checksum, rows = HEADER.unpack(header)[:4]
+        if magic != MAGIC or version != FORMAT_VERSION or checksum != bytes.fromhex(source_checksum):
+            return None
+        return rows
+
+    @classmethod
+    def read(cls, path: str, source_checksum: str) -> Optional["BinarySnapshot"]:
+        """
+        Memory-map and decode path; None when it is missing, from another format version or
+        another source file, or corrupt.
+        """
+        try:
+            with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if len(mapped) < HEADER.size:
+                    return None
+
+                magic, version, checksum, rows, country_count, text_count, heap_length, heap_size, crc = \
+                    HEADER.unpack_from(mapped, 0)
+                if magic != MAGIC or version != FORMAT_VERSION or checksum != bytes.fromhex(source_checksum):
+                    return None
+
+                view = memoryview(mapped)
+                try:
+                    if zlib.crc32(view[HEADER.size:]) != crc:
+                        return None
+
+                    position = HEADER.size
+                    sections = []
+                    for size in (rows * CODE_WIDTH, rows, rows * 2, (text_count + 1) * 4, heap_size):
+                        sections.append(view[position:position + size])
+                        position += size
+
+                    codes = str(sections[0], "ascii")
+                    flags = bytes(sections[1])
+                    countries = _from_little_endian("H", sections[2])
+                    offsets = _from_little_endian("I", sections[3])
+                    heap = str(sections[4], "utf-8")
+                finally:
+                    sections = None
+                    view.release()
+        except (OSError, ValueError):
+            return None
+
+        if len(heap) != heap_length or text_count != 2 * rows + 2 * country_count:
+            return None
+
+        return cls(codes, flags, countries, offsets, heap)
+
+
+class BinarySnapshotWriter:
+    """
+    Builds a BinarySnapshot one batch of records at a time, so the dataset is never held whole.
+
+    The code, flag and country columns and the text offsets (22 bytes per row) stay in memory;
+    bank names and addresses are spooled to temporary files and copied into the heap by `finish`,
+    which writes the snapshot to a temporary file and renames it into place.
+    """
+
+    def __init__(self):
+        self._dictionary: Dict[tuple, int] = {}
+        self._codes = bytearray()
+        self._flags = bytearray()
+        self._countries = array("H")
+        self._bank_name_ends = array("I")
+        self._address_ends = array("I")
+        self._bank_names = tempfile.TemporaryFile()
+        self._addresses = tempfile.TemporaryFile()
+        self._bank_names_length = 0
+        self._addresses_length = 0
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    def add(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Append records; raises ValueError for data the format cannot hold (codes over 11 ASCII characters),
+        a guard only, as record_rejection already turns such rows away at ingest.
+        """
+        bank_names, addresses = [], []
+
+        for record in records:
+            swift_code = record['swift_code']
+            if len(swift_code) > CODE_WIDTH or not swift_code.isascii():
+                raise ValueError(f"SWIFT code {swift_code!r} does not fit the snapshot's code column")
+
+            self._codes += swift_code.ljust(CODE_WIDTH).encode("ascii")
+            self._flags.append(1 if record['is_headquarters'] else 0)
+            country = self._dictionary.setdefault((record['country_iso2'], record['country_name']), len(self._dictionary))
+            if country > 0xFFFF:
+                raise ValueError("More distinct countries than the snapshot's country column can index")
+            self._countries.append(country)
+
+            self._bank_names_length += len(record['bank_name'])
+            self._bank_name_ends.append(self._bank_names_length)
+            bank_names.append(record['bank_name'])
+            self._addresses_length += len(record['address'])
+            self._address_ends.append(self._addresses_length)
+            addresses.append(record['address'])
+
+        self._bank_names.write("".join(bank_names).encode("utf-8"))
+        self._addresses.write("".join(addresses).encode("utf-8"))
+
+    def finish(self, path: str, source_checksum: str) -> None:
+        dictionary_texts = [iso2 for iso2, _ in self._dictionary] + [name for _, name in self._dictionary]
+
+        offsets = array("I", [0])
+        offsets.extend(self._bank_name_ends)
+        offsets.extend(self._bank_names_length + end for end in self._address_ends)
+        position = self._bank_names_length + self._addresses_length
+        for text in dictionary_texts:
+            position += len(text)
+            offsets.append(position)
+
+        sections = [
+            self._codes,
+            self._flags,
+            _little_endian(self._countries),
+            _little_endian(offsets)
+        ]
+        dictionary_heap = "".join(dictionary_texts).encode("utf-8")
+        heap_size = self._bank_names.tell() + self._addresses.tell() + len(dictionary_heap)
+
+        temporary_path = f"{path}.tmp"
+        try:
+            with open(temporary_path, "wb") as handle:
+                handle.write(bytes(HEADER.size))
+                crc = 0
+                for section in sections + [self._bank_names, self._addresses, dictionary_heap]:
+                    for block in self._blocks(section):
+                        crc = zlib.crc32(block, crc)
+                        handle.write(block)
+
+                handle.seek(0)
+                handle.write(HEADER.pack(MAGIC, FORMAT_VERSION, bytes.fromhex(source_checksum), len(self),
+                                         len(self._dictionary), len(offsets) - 1, position, heap_size, crc))
+            os.replace(temporary_path, path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+    @staticmethod
+    def _blocks(section) -> Iterator[bytes]:
+        if isinstance(section, (bytes, bytearray)):
+            yield section
+            return
+
+        section.seek(0)
+        for block in iter(lambda: section.read(COPY_BLOCK_SIZE), b""):
+            yield block
+
+    def close(self) -> None:
+        self._bank_names.close()
+        self._addresses.close()
@@ -1,64 +1,217 @@
-import pandas as pd
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any, Iterator, Optional
+import hashlib
 import logging
 import os
+from app.config import Settings
+from app.utils.binary_snapshot import BinarySnapshot, BinarySnapshotWriter
+from app.utils.validation import headquarters_code
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+REQUIRED_COLUMNS = ['country_iso2_code', 'swift_code', 'name', 'address', 'country_name']
+
+
+def file_checksum(file_path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+
+    with open(file_path, 'rb') as handle:
+        for block in iter(lambda: handle.read(block_size), b''):
+            digest.update(block)
+
+    return digest.hexdigest()
 
 class SwiftCodeParser:
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, use_snapshot: Optional[bool] = None):
         self.file_path = file_path
         self.file_extension = os.path.splitext(file_path)[1].lower()
+        self.snapshot_path = f"{file_path}.snap"
+        self.use_snapshot = Settings.parser_snapshot if use_snapshot is None else use_snapshot
+        self._checksum: Optional[str] = None
 
+    def checksum(self) -> str:
+        """
+        SHA-256 of the source file, computed once per parser.
+        """
+        if self._checksum is None:
+            self._checksum = file_checksum(self.file_path)
+        return self._checksum
 
-    def parse_files(self) -> List[Dict[str, Any]]:
+
+    def _read_frame(self) -> 'pd.DataFrame':
+        # pandas (and numpy/openpyxl behind it) is imported only when a file is actually parsed.
+        import pandas as pd
+
+        if self.file_extension == '.csv':
+            logging.info(f"Parsing CSV file: {self.file_path}")
+            return pd.read_csv(self.file_path, dtype=str, keep_default_na=False)
+        elif self.file_extension in ['.xlsx', '.xls']:
+            logging.info(f"Parsing Excel file: {self.file_path}")
+            return pd.read_excel(self.file_path, dtype=str, keep_default_na=False)
+        else:
+            raise ValueError(f"Not a valid file type: {self.file_extension}. Only .csv and .xlsx are supported.")
+
+    @staticmethod
+    def normalize_frame(df: 'pd.DataFrame') -> 'pd.DataFrame':
         """
-        Parse SWIFT codes from file. Despite the name, this method handles both Excel and CSV.
+        Normalize a raw SWIFT frame column-wise into the record layout used by the repository.
+        """
+        import pandas as pd
+
+        df.columns = [str(col).strip().lower().replace(' ', '_') for col in df.columns]
+
+        for col in REQUIRED_COLUMNS:
+            if col not in df.columns:
+                raise ValueError(f"Required column '{col}' is missing in the file.")
+
+        text = df[REQUIRED_COLUMNS].fillna('').astype(str)
+
+        swift_codes = text['swift_code'].str.strip().str.upper()
+
+        return pd.DataFrame({
+            'swift_code': swift_codes,
+            'bank_name': text['name'].str.strip(),
+            'address': text['address'].str.strip(),
+            'country_iso2': text['country_iso2_code'].str.strip().str.upper(),
+            'country_name': text['country_name'].str.strip().str.upper(),
+            'is_headquarters': swift_codes.str.endswith('XXX')
+        })
+
+    @staticmethod
+    def frame_to_records(df: 'pd.DataFrame') -> List[Dict[str, Any]]:
+        columns = list(df.columns)
+        values = [df[col].tolist() for col in columns]
+
+        return [dict(zip(columns, row)) for row in zip(*values)]
+
+    def parse_frame(self) -> 'pd.DataFrame':
+        """
+        Parse SWIFT codes from file into a normalized DataFrame (one column per record field).
         """
         try:
-            if self.file_extension == '.csv':
-                df = pd.read_csv(self.file_path)
-                logging.info(f"Parsing CSV file: {self.file_path}")
-            elif self.file_extension in ['.xlsx', '.xls']:
-                df = pd.read_excel(self.file_path)
-                logging.info(f"Parsing Excel file: {self.file_path}")
-            else:
-                raise ValueError(f"Not a valid file type: {self.file_extension}. Only .csv and .xlsx are supported.")
-            
-            df.columns = [col.strip().lower().replace(' ', '_') for col in df.columns]
+            return self.normalize_frame(self._read_frame())
 
-            required_columns = ['country_iso2_code', 'swift_code', 'name', 'address', 'country_name']
+        except Exception as e:
+            logging.error(f"Error parsing file: {e}")
+            raise
 
-            for col in required_columns:
-                if col not in df.columns:
-                    raise ValueError(f"Required column '{col}' is missing in the file.")
-            
-            swift_data = []
+    def _iter_excel_frames(self, chunk_size: int) -> Iterator['pd.DataFrame']:
+        import openpyxl
+        import pandas as pd
 
-            for _, row in df.iterrows():
-                country_iso2 = row['country_iso2_code'].strip().upper()
-                country_name = row['country_name'].strip().upper()
-                swift_code = row['swift_code'].strip().upper()
+        workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                raise ValueError(f"Required column '{REQUIRED_COLUMNS[0]}' is missing in the file.")
 
-                is_headquarters = swift_code.endswith('XXX')
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    yield pd.DataFrame(chunk, columns=header)
+                    chunk = []
 
-                entry = {
-                    'swift_code': swift_code,
-                    'bank_name': row['name'].strip(),
-                    'address': row['address'].strip(),
-                    'country_iso2': country_iso2,
-                    'country_name': country_name,
-                    'is_headquarters': is_headquarters
-                }
+            if chunk:
+                yield pd.DataFrame(chunk, columns=header)
+        finally:
+            workbook.close()
 
-                swift_data.append(entry)
+    def iter_frames(self, chunk_size: int) -> Iterator['pd.DataFrame']:
+        """
+        Stream the file as normalized DataFrames of at most chunk_size rows, keeping memory flat.
+        """
+        import pandas as pd
 
+        try:
+            if self.file_extension == '.csv':
+                logging.info(f"Streaming CSV file: {self.file_path}")
+                chunks = pd.read_csv(self.file_path, dtype=str, keep_default_na=False, chunksize=chunk_size)
+            elif self.file_extension == '.xlsx':
+                logging.info(f"Streaming Excel file: {self.file_path}")
+                chunks = self._iter_excel_frames(chunk_size)
+            else:
+                frame = self._read_frame()
+                chunks = (frame.iloc[start:start + chunk_size] for start in range(0, len(frame), chunk_size))
 
-            logging.info(f"Successfully parsed {len(swift_data)} SWIFT codes from {self.file_path}")
-            return swift_data
+            for chunk in chunks:
+                yield self.normalize_frame(chunk)
 
         except Exception as e:
             logging.error(f"Error parsing file: {e}")
-            raise  
-    
+            raise
+
+    def iter_records(self, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream normalized record batches. With snapshots enabled, a binary snapshot matching the source
+        checksum is read instead of the source, and a full parse of the source writes one for next time,
+        batch by batch, so memory stays bounded by the batch size either way.
+        """
+        if not self.use_snapshot:
+            for frame in self.iter_frames(chunk_size):
+                yield self.frame_to_records(frame)
+            return
+
+        snapshot = BinarySnapshot.read(self.snapshot_path, self.checksum())
+        if snapshot is not None:
+            logging.info(f"Reading {len(snapshot)} SWIFT codes from snapshot {self.snapshot_path}")
+            yield from snapshot.iter_records(chunk_size)
+            return
+
+        writer = BinarySnapshotWriter()
+        try:
+            for frame in self.iter_frames(chunk_size):
+                records = self.frame_to_records(frame)
+                if writer is not None:
+                    writer = self._add_to_snapshot(writer, records)
+                yield records
+
+            if writer is not None:
+                self._finish_snapshot(writer)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def estimate_rows(self) -> Optional[int]:
+        """
+        Row count known without parsing (from this file's binary snapshot), else None.
+        """
+        if not self.use_snapshot:
+            return None
+        return BinarySnapshot.peek_row_count(self.snapshot_path, self.checksum())
+
+    def _add_to_snapshot(self, writer: BinarySnapshotWriter, records: List[Dict[str, Any]]) -> Optional[BinarySnapshotWriter]:
+        """
+        The writer with records appended, or None (writer closed) when they cannot go into a snapshot.
+        """
+        try:
+            writer.add(records)
+        except ValueError as e:
+            logging.warning(f"Not writing snapshot {self.snapshot_path}: {e}")
+            writer.close()
+            return None
+        return writer
+
+    def _finish_snapshot(self, writer: BinarySnapshotWriter) -> bool:
+        try:
+            writer.finish(self.snapshot_path, self.checksum())
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not write snapshot {self.snapshot_path}: {e}")
+            return False
+
+        logging.info(f"Wrote snapshot of {len(writer)} SWIFT codes to {self.snapshot_path}")
+        return True
+
+    def parse_files(self) -> List[Dict[str, Any]]:
+        """
+        Parse SWIFT codes from file. Despite the name, this method handles both Excel and CSV.
+        """
+        swift_data = self.frame_to_records(self.parse_frame())
+
+        logging.info(f"Successfully parsed {len(swift_data)} SWIFT codes from {self.file_path}")
+        return swift_data
+
     def get_headquarters_map(self, swift_data: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """
         Create a mapping of headquarters SWIFT codes to their branch offices.
@@ -72,10 +225,10 @@ class SwiftCodeParser:
 
         for entry in swift_data:
             if not entry['is_headquarters']:
-                potential_hq = entry['swift_code'][:-3] + 'XXX'
-                
+                potential_hq = headquarters_code(entry['swift_code'])
+
                 if potential_hq in hq_map:
                     branch_data = entry.copy()
                     hq_map[potential_hq].append(branch_data)
-        
+
         return hq_map
@@ -0,0 +1,194 @@
+import math
+import re
+import threading
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+_NON_ALPHANUMERIC = re.compile(r'[^0-9a-z]+')
+
+
+class TrigramIndex:
+    """
+    In-process fuzzy text index: a trigram inverted index over the distinct words of the
+    indexed texts, plus word -> document postings.
+
+    A query word matches every indexed word sharing at least `min_match` of its trigrams
+    (typos, prefixes, inflections), scored by trigram similarity. A document matches when
+    each query word matches one of its words; its score is the mean of those similarities.
+    Postings are kept ordered by text length so ranking can stop after `limit` results
+    instead of scoring every document that contains a common word.
+    """
+
+    def __init__(self, min_match: float = 0.5):
+        self.min_match = min_match
+        self._gram_words: Dict[str, Set[str]] = {}
+        self._word_grams: Dict[str, FrozenSet[str]] = {}
+        self._postings: Dict[str, List[str]] = {}
+        self._unsorted: Set[str] = set()
+        self._documents: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[str, str]], min_match: float = 0.5) -> "TrigramIndex":
+        """
+        Index (doc_id, text) pairs and order every posting list up front, so no query pays for it.
+        """
+        index = cls(min_match)
+        for doc_id, text in documents:
+            index.add(doc_id, text)
+
+        with index._lock:
+            for word in list(index._unsorted):
+                index._sorted_postings(word)
+
+        return index
+
+    @staticmethod
+    def words(text: str) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(_NON_ALPHANUMERIC.sub(' ', (text or '').lower()).split()))
+
+    @staticmethod
+    def trigrams(text: str) -> FrozenSet[str]:
+        grams = set()
+
+        for word in TrigramIndex.words(text):
+            padded = f"  {word} "
+            grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+
+        return frozenset(grams)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, doc_id: str, text: str) -> None:
+        words = self.words(text)
+
+        with self._lock:
+            self._remove(doc_id)
+            if not words:
+                return
+
+            self._documents[doc_id] = (len(' '.join(words)), words)
+            for word in words:
+                if word not in self._postings:
+                    self._add_word(word)
+                self._postings[word].append(doc_id)
+                self._unsorted.add(word)
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            self._remove(doc_id)
+
+    def _add_word(self, word: str) -> None:
+        grams = self.trigrams(word)
+        self._word_grams[word] = grams
+        self._postings[word] = []
+        for gram in grams:
+            self._gram_words.setdefault(gram, set()).add(word)
+
+    def _remove(self, doc_id: str) -> None:
+        document = self._documents.pop(doc_id, None)
+        if document is None:
+            return
+
+        for word in document[1]:
+            postings = self._postings[word]
+            postings.remove(doc_id)
+            if postings:
+                continue
+
+            del self._postings[word]
+            self._unsorted.discard(word)
+            for gram in self._word_grams.pop(word):
+                words = self._gram_words[gram]
+                words.discard(word)
+                if not words:
+                    del self._gram_words[gram]
+
+    def _sorted_postings(self, word: str) -> List[str]:
+        postings = self._postings[word]
+        if word in self._unsorted:
+            postings.sort(key=lambda doc_id: (self._documents[doc_id][0], doc_id))
+            self._unsorted.discard(word)
+        return postings
+
+    def _match_word(self, word: str) -> Dict[str, float]:
+        """
+        Indexed words sharing at least `min_match` of the word's trigrams, with their similarity.
+        """
+        grams = self.trigrams(word)
+        required = max(1, math.ceil(len(grams) * self.min_match))
+
+        # A word sharing `required` trigrams must appear in one of the rarest
+        # len - required + 1 posting lists, so the common ones are never scanned.
+        postings = sorted((self._gram_words.get(gram, ()) for gram in grams), key=len)
+        candidates = set().union(*postings[:len(postings) - required + 1])
+
+        matches = {}
+        for candidate in candidates:
+            candidate_grams = self._word_grams[candidate]
+            shared = len(grams & candidate_grams)
+            if shared >= required:
+                matches[candidate] = shared / (len(grams) + len(candidate_grams) - shared)
+
+        return matches
+
+    def _filter_postings(self, postings: List[str], others: List[Dict[str, float]]) -> List[str]:
+        """
+        Keep the documents (in posting order) that also contain a match for every other query word.
+        """
+        for words in others:
+            if not postings:
+                break
+
+            if sum(len(self._postings[word]) for word in words) < len(postings) * 8:
+                # Hashing the other word's postings is cheaper than visiting each document.
+                keep = set().union(*(self._postings[word] for word in words))
+                postings = [doc_id for doc_id in postings if doc_id in keep]
+            else:
+                keys = words.keys()
+                postings = [doc_id for doc_id in postings if not keys.isdisjoint(self._documents[doc_id][1])]
+
+        return postings
+
+    def search(self, query: str, limit: int,
+               accept: Optional[Callable[[str], bool]] = None) -> List[Tuple[str, float]]:
+        """
+        Return up to `limit` (doc_id, score) pairs, best first; ties go to the shorter text.
+        """
+        query_words = self.words(query)
+        if not query_words or limit < 1:
+            return []
+
+        with self._lock:
+            matches = [self._match_word(word) for word in query_words]
+            if not all(matches):
+                return []
+
+            # Walk the postings of the rarest query word; the others are checked per document.
+            pivot = min(matches, key=lambda words: sum(len(self._postings[word]) for word in words))
+            others = [words for words in matches if words is not pivot]
+
+            ranked: List[Tuple[float, int, str]] = []
+            seen = set()
+
+            for word, similarity in sorted(pivot.items(), key=lambda item: -item[1]):
+                bound = (similarity + len(others)) / len(matches)
+                if len(ranked) >= limit and ranked[-1][0] < -bound:
+                    break
+
+                for doc_id in self._filter_postings(self._sorted_postings(word), others):
+                    length, doc_words = self._documents[doc_id]
+                    if len(ranked) >= limit and (-bound, length) >= ranked[-1][:2]:
+                        break
+                    if doc_id in seen or (accept is not None and not accept(doc_id)):
+                        continue
+                    seen.add(doc_id)
+
+                    total = similarity + sum(
+                        max(words.get(doc_word, 0.0) for doc_word in doc_words) for words in others
+                    )
+                    ranked.append((-total / len(matches), length, doc_id))
+                    ranked.sort()
+                    del ranked[limit:]
+
+        return [(doc_id, round(-score, 4)) for score, _, doc_id in ranked]
@@ -0,0 +1,57 @@
+import re
+from typing import Any, Dict, Optional, Tuple
+
+SWIFT_CODE_PATTERN = re.compile(r'^[A-Z]{6}[A-Z0-9]{2}(?:[A-Z0-9]{3})?$')
+COUNTRY_ISO2_PATTERN = re.compile(r'^[A-Z]{2}$')
+INSTITUTION_CODE_LENGTH = 8
+SWIFT_CODE_LENGTHS = (INSTITUTION_CODE_LENGTH, 11)
+
+
+def record_rejection(record: Dict[str, Any]) -> Optional[str]:
+    """
+    Why a normalized record cannot be stored, or None when it is valid.
+    """
+    if len(record['swift_code']) not in SWIFT_CODE_LENGTHS:
+        return f"SWIFT code must be 8 or 11 characters: {record['swift_code']}"
+    if not SWIFT_CODE_PATTERN.match(record['swift_code']):
+        return f"Invalid SWIFT code format: {record['swift_code']}"
+    if not COUNTRY_ISO2_PATTERN.match(record['country_iso2']):
+        return f"Invalid country ISO2 code: {record['country_iso2']}"
+    if not record['bank_name']:
+        return f"Missing bank name for {record['swift_code']}"
+    if not record['country_name']:
+        return f"Missing country name for {record['swift_code']}"
+    return None
+
+
+def headquarters_code(swift_code: str) -> str:
+    """
+    The headquarters a code belongs to: its first 8 characters (bank, country, location) plus XXX.
+    """
+    return swift_code[:INSTITUTION_CODE_LENGTH] + 'XXX'
+
+
+def has_branches(swift_code: str) -> bool:
+    """
+    Whether a headquarters code can have branches, i.e. it is its own headquarters_code.
+    """
+    return headquarters_code(swift_code) == swift_code
+
+
+def branch_headquarters(swift_code: str) -> Optional[str]:
+    """
+    The headquarters code a branch code links to; None for codes shorter than 8 characters
+    or already in headquarters form.
+    """
+    hq_code = headquarters_code(swift_code)
+    if len(swift_code) < INSTITUTION_CODE_LENGTH or hq_code == swift_code:
+        return None
+    return hq_code
+
+
+def institution_range(swift_code: str) -> Tuple[str, str]:
+    """
+    Half-open [low, high) range of codes sharing the first 8 characters of swift_code, for a range scan.
+    """
+    prefix = swift_code[:INSTITUTION_CODE_LENGTH]
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
@@ -0,0 +1,79 @@
+"""
+Fuzzy bank-name search latency: trigram inverted index vs. a LIKE '%term%' scan.
+
+Run from the project root:
+    python -m benchmarks.bench_bank_search --rows 1000000
+"""
+import argparse
+import random
+import string
+import time
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import DatabaseManager
+from app.models.swift_code import SwiftCode
+from app.repositories.swift_code_repository import SwiftCodeRepository
+from app.utils.trigram_index import TrigramIndex
+
+WORDS = ["deutsche", "santander", "commerz", "national", "savings", "credit", "union", "trust",
+         "first", "royal", "bank", "banco", "banque", "cooperative", "investment", "capital",
+         "merchant", "agricultural", "industrial", "postal", "central", "regional", "city", "global"]
+
+
+def generate_names(rows: int) -> list:
+    rng = random.Random(7)
+    places = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 9))) for _ in range(50_000)]
+    names = []
+    for _ in range(rows):
+        words = rng.sample(WORDS, 2) + [rng.choice(places)]
+        rng.shuffle(words)
+        names.append(" ".join(words).upper())
+    return names
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=1_000_000)
+    arg_parser.add_argument("--queries", type=int, default=200)
+    arg_parser.add_argument("--sql-rows", type=int, default=200_000)
+    args = arg_parser.parse_args()
+
+    names = generate_names(args.rows)
+    rng = random.Random(11)
+    queries = [name.split()[rng.randrange(3)].lower() for name in rng.sample(names, args.queries)]
+    queries += [query[:-2] + query[-1] for query in queries[:args.queries // 2]]
+    queries += [" ".join(name.split()[:2]).lower() for name in rng.sample(names, args.queries // 2)]
+
+    start = time.perf_counter()
+    index = TrigramIndex.build((str(position), name) for position, name in enumerate(names))
+    print(f"{'index build':<20} {time.perf_counter() - start:10.2f} s for {args.rows} rows")
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, 10)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print(f"{'trigram p50':<20} {latencies[len(latencies) // 2] * 1e3:10.2f} ms/query")
+    print(f"{'trigram p95':<20} {latencies[int(len(latencies) * 0.95)] * 1e3:10.2f} ms/query")
+
+    engine = create_engine("sqlite:///:memory:")
+    DatabaseManager.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    SwiftCodeRepository(db).insert_swift_code_batch([
+        {"swift_code": f"{position:011d}", "bank_name": name, "address": "1 MAIN STREET",
+         "country_iso2": "PL", "country_name": "POLAND", "is_headquarters": False}
+        for position, name in enumerate(names[:args.sql_rows])
+    ])
+    sample = queries[:20]
+    start = time.perf_counter()
+    for query in sample:
+        list(db.scalars(select(SwiftCode).where(SwiftCode.bank_name.ilike(f"%{query}%")).limit(10)))
+    per_query = (time.perf_counter() - start) / len(sample)
+    print(f"{'SQL LIKE scan':<20} {per_query * 1e3:10.2f} ms/query over {args.sql_rows} rows (exact substrings only)")
+
+
+if __name__ == "__main__":
+    main()
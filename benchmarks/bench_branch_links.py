@@ -0,0 +1,134 @@
+"""
+Branch link storage benchmark: the branch_associations table with a UUID key per link and no indexes (before)
+vs. links derived from the first 8 characters through range scans of the swift_code primary key (after).
+Measures the bulk load, headquarters lookups with their branches, the snapshot read and the file size.
+
+Run from the project root:
+    python -m benchmarks.bench_branch_links --rows 100000 --lookups 2000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import DatabaseManager, apply_sqlite_pragmas
+from app.models.swift_code import SwiftCode
+from app.repositories.swift_code_repository import SQLITE_MAX_VARIABLES, SwiftCodeRepository
+from benchmarks.legacy_schema import association_row, branch_associations, create_legacy_tables
+
+
+def generate_rows(rows: int) -> list:
+    data = []
+    for i in range(rows):
+        suffix = "XXX" if i % 5 == 0 else f"{i % 5:03d}"
+        data.append({
+            "swift_code": f"B{i // 5:05d}PL{suffix}",
+            "bank_name": f"Bank {i // 5}",
+            "address": f"{i} Main Street",
+            "country_iso2": "PL",
+            "country_name": "POLAND",
+            "is_headquarters": suffix == "XXX",
+        })
+    return data
+
+
+def legacy_bulk_create(repository: SwiftCodeRepository, swift_data: list) -> None:
+    """The previous bulk path: codes, then one association row per branch whose headquarters exists."""
+    db = repository.db
+    rows = [repository._to_row(data) for data in swift_data]
+    codes = {row["swift_code"] for row in rows}
+    association_rows = [
+        association_row(row["swift_code"][:8] + "XXX", row["swift_code"])
+        for row in rows
+        if not row["is_headquarters"] and row["swift_code"][:8] + "XXX" in codes
+    ]
+    db.execute(insert(SwiftCode.__table__), rows)
+    db.execute(insert(branch_associations), association_rows)
+    db.commit()
+
+
+def legacy_get_swift_codes(repository: SwiftCodeRepository, swift_codes: list) -> dict:
+    """The previous batch lookup: codes by IN, then branches through a join on the association table."""
+    db = repository.read_db
+    results = {}
+    for entry in db.scalars(select(SwiftCode).where(SwiftCode.swift_code.in_(swift_codes))):
+        results[entry.swift_code] = dict(repository._to_record(entry), branches=[])
+
+    headquarters = [code for code, result in results.items() if result["is_headquarters"]]
+    for start in range(0, len(headquarters), SQLITE_MAX_VARIABLES):
+        rows = db.execute(
+            select(branch_associations.c.headquarter_swift, SwiftCode)
+            .join(SwiftCode, SwiftCode.swift_code == branch_associations.c.branch_swift)
+            .where(branch_associations.c.headquarter_swift.in_(headquarters[start:start + SQLITE_MAX_VARIABLES]))
+        )
+        for hq_code, branch in rows:
+            results[hq_code]["branches"].append(repository._to_record(branch))
+    return results
+
+
+def legacy_load_snapshot_data(repository: SwiftCodeRepository) -> tuple:
+    return repository.load_snapshot_data(), repository.read_db.execute(
+        select(branch_associations.c.headquarter_swift, branch_associations.c.branch_swift)
+    ).all()
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def measure(label: str, path: str, swift_data: list, lookups: list, bulk_create, get_swift_codes, load_snapshot) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    apply_sqlite_pragmas(engine, "performance")
+    DatabaseManager.Base.metadata.create_all(bind=engine)
+    create_legacy_tables(engine)
+    repository = SwiftCodeRepository(sessionmaker(bind=engine)())
+
+    load = timed(lambda: bulk_create(repository, swift_data))
+    branches = 0
+
+    def lookup_all() -> None:
+        nonlocal branches
+        for swift_code in lookups:
+            branches += len(get_swift_codes(repository, [swift_code])[swift_code]["branches"])
+
+    lookup = timed(lookup_all)
+    snapshot = timed(lambda: load_snapshot(repository))
+
+    repository.db.close()
+    engine.dispose()
+    size = os.path.getsize(path) + sum(
+        os.path.getsize(path + suffix) for suffix in ("-wal", "-shm") if os.path.exists(path + suffix)
+    )
+
+    print(f"{label:<22} load {load:7.3f}s  {len(lookups)} lookups {lookup:7.3f}s "
+          f"({lookup / len(lookups) * 1e6:7.1f} us each, {branches} branches)  "
+          f"snapshot read {snapshot:6.3f}s  file {size / 1e6:6.1f} MB")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=100_000)
+    arg_parser.add_argument("--lookups", type=int, default=2_000)
+    args = arg_parser.parse_args()
+
+    swift_data = generate_rows(args.rows)
+    headquarters = [data["swift_code"] for data in swift_data if data["is_headquarters"]]
+    lookups = random.Random(0).choices(headquarters, k=args.lookups)
+
+    with tempfile.TemporaryDirectory() as directory:
+        measure("association table", os.path.join(directory, "before.db"), swift_data, lookups,
+                legacy_bulk_create, legacy_get_swift_codes, legacy_load_snapshot_data)
+        measure("derived (after)", os.path.join(directory, "after.db"), swift_data, lookups,
+                lambda repository, data: repository.bulk_create_swift_codes(data),
+                lambda repository, codes: repository.get_swift_codes(codes),
+                lambda repository: repository.load_snapshot_data())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Bulk create API benchmark: one POST /v1/swift-codes/ per code (before) vs. POST /v1/swift-codes/bulk
+with JSON arrays and NDJSON bodies (after), end to end through the app against a fresh SQLite file.
+
+Run from the project root:
+    python -m benchmarks.bench_bulk_api --rows 50000 --batch 10000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+
+def generate_items(rows: int, prefix: str) -> list:
+    items = []
+    for i in range(rows):
+        suffix = "XXX" if i % 5 == 0 else f"{i % 5:03d}"
+        items.append({
+            "swift_code": f"{prefix}{i // 5:04d}PLA{suffix}",
+            "bank_name": f"Bank {i // 5}",
+            "address": f"{i} Main Street",
+            "country_iso2": "PL",
+            "country_name": "POLAND",
+            "is_headquarters": suffix == "XXX",
+        })
+    return items
+
+
+def measure(label: str, rows: int, post) -> None:
+    start = time.perf_counter()
+    created = post()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s  {rows / elapsed:12,.0f} rows/s  ({created} created)")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=50_000)
+    arg_parser.add_argument("--batch", type=int, default=10_000)
+    arg_parser.add_argument("--single-rows", type=int, default=1_000)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_PATH"] = os.path.join(directory, "bench.db")
+        os.environ["SWIFT_DATA_PATH"] = os.path.join(directory, "missing.csv")
+        os.environ["SWIFT_RELOAD_POLL_INTERVAL"] = "0"
+
+        from fastapi.testclient import TestClient
+        from app.main import create_app
+
+        with TestClient(create_app()) as client:
+            while client.get("/health/ready").status_code != 200:
+                time.sleep(0.01)
+
+            # Letters only in the prefixes: digit-only codes of different batches could collide.
+            single = generate_items(args.single_rows, "S")
+            measure("single POST (before)", len(single),
+                    lambda: sum(client.post("/v1/swift-codes/", json=item).status_code == 200 for item in single))
+
+            def post_batches(items, ndjson: bool) -> int:
+                created = 0
+                for start in range(0, len(items), args.batch):
+                    batch = items[start:start + args.batch]
+                    if ndjson:
+                        response = client.post(
+                            "/v1/swift-codes/bulk",
+                            content="".join(json.dumps(item) + "\n" for item in batch),
+                            headers={"Content-Type": "application/x-ndjson"}
+                        )
+                    else:
+                        response = client.post("/v1/swift-codes/bulk", json=batch)
+                    created += response.json()["created"]
+                return created
+
+            json_items = generate_items(args.rows, "J")
+            measure("bulk JSON (after)", len(json_items), lambda: post_batches(json_items, False))
+            ndjson_items = generate_items(args.rows, "N")
+            measure("bulk NDJSON (after)", len(ndjson_items), lambda: post_batches(ndjson_items, True))
+
+
+if __name__ == "__main__":
+    main()
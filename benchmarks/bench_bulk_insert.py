@@ -0,0 +1,89 @@
+"""
+Bulk load benchmark: ORM add_all + per-HQ SELECT (before) vs. Core executemany + set join (after).
+
+Run from the project root:
+    python -m benchmarks.bench_bulk_insert --rows 100000
+"""
+import argparse
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import DatabaseManager
+from app.models.swift_code import SwiftCode
+from app.repositories.swift_code_repository import SwiftCodeRepository
+from benchmarks.legacy_schema import association_row, branch_associations, count_links, create_legacy_tables
+
+
+def generate_rows(rows: int) -> list:
+    data = []
+    for i in range(rows):
+        institution = f"B{i // 5:05d}PL"
+        suffix = "XXX" if i % 5 == 0 else f"{i % 5:03d}"
+        data.append({
+            "swift_code": f"{institution}{suffix}",
+            "bank_name": f"Bank {i // 5}",
+            "address": f"{i} Main Street",
+            "country_iso2": "PL",
+            "country_name": "POLAND",
+            "is_headquarters": suffix == "XXX",
+        })
+    return data
+
+
+def new_session():
+    engine = create_engine("sqlite:///:memory:")
+    DatabaseManager.Base.metadata.create_all(bind=engine)
+    create_legacy_tables(engine)
+    return sessionmaker(bind=engine)()
+
+
+def legacy_bulk_create(db, swift_data) -> None:
+    """The original unit-of-work implementation, kept here as the baseline."""
+    branch_hq_map = {}
+    # country_name lives in the countries table now; the baseline's rows leave it out.
+    db.add_all([SwiftCode(**{key: value for key, value in data.items() if key != "country_name"}) for data in swift_data])
+    for data in swift_data:
+        if not data["is_headquarters"]:
+            branch_hq_map.setdefault(data["swift_code"][:8] + "XXX", []).append(data["swift_code"])
+    db.commit()
+
+    # The original added one ORM object per link, which the unit of work flushes as one executemany.
+    association_rows = []
+    for hq_code, branch_codes in branch_hq_map.items():
+        if db.query(SwiftCode).filter(SwiftCode.swift_code == hq_code).first():
+            association_rows.extend(association_row(hq_code, branch_code) for branch_code in branch_codes)
+    if association_rows:
+        db.execute(insert(branch_associations), association_rows)
+    db.commit()
+
+
+def measure(label: str, rows: int, func, count) -> float:
+    db = new_session()
+    start = time.perf_counter()
+    func(db)
+    elapsed = time.perf_counter() - start
+    links = count(db)
+    print(f"{label:<24} {elapsed:8.3f}s  {rows / elapsed:12,.0f} rows/s  ({links} links)")
+    db.close()
+    return elapsed
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=100_000)
+    args = arg_parser.parse_args()
+
+    swift_data = generate_rows(args.rows)
+
+    before = measure("ORM add_all (before)", args.rows, lambda db: legacy_bulk_create(db, swift_data), count_links)
+    after = measure("Core bulk (after)", args.rows,
+                    lambda db: SwiftCodeRepository(db).bulk_create_swift_codes(swift_data),
+                    lambda db: SwiftCodeRepository(db).count_branch_links())
+
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Cold-start benchmark: time from an empty database to the first served lookup when the dataset
+comes from .xlsx, .csv, or the binary snapshot written next to the source on the first parse.
+
+Run from the project root:
+    python -m benchmarks.bench_cold_start --rows 100000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import DatabaseManager, apply_sqlite_pragmas
+from app.repositories.swift_code_repository import SwiftCodeRepository
+from app.services.ingest_service import SwiftCodeIngestService
+from app.services.swift_service import SwiftCodeService
+from app.utils.parser import SwiftCodeParser
+
+
+def generate_frame(rows: int) -> pd.DataFrame:
+    data = {"COUNTRY ISO2 CODE": [], "SWIFT CODE": [], "NAME": [], "ADDRESS": [], "COUNTRY NAME": []}
+    countries = [("PL", "Poland"), ("DE", "Germany"), ("US", "United States"), ("GB", "United Kingdom")]
+
+    for i in range(rows):
+        iso2, name = countries[i % len(countries)]
+        suffix = "XXX" if i % 5 == 0 else f"{i % 5:03d}"
+        data["COUNTRY ISO2 CODE"].append(iso2)
+        data["SWIFT CODE"].append(f"B{i // 5:05d}{iso2}{suffix}")
+        data["NAME"].append(f"Bank Number {i // 5}")
+        data["ADDRESS"].append(f"{i} Main Street, Suite {i % 97}")
+        data["COUNTRY NAME"].append(name)
+
+    return pd.DataFrame(data)
+
+
+def time_to_first_request(directory: str, label: str, file_path: str, use_snapshot: bool) -> None:
+    engine = create_engine(f"sqlite:///{os.path.join(directory, label + '.db')}")
+    apply_sqlite_pragmas(engine, "performance")
+    DatabaseManager.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    start = time.perf_counter()
+    parsed = sum(len(batch) for batch in SwiftCodeParser(file_path, use_snapshot).iter_records(5000))
+    parse_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    SwiftCodeIngestService(SwiftCodeRepository(db)).sync(SwiftCodeParser(file_path, use_snapshot))
+    service = SwiftCodeService(SwiftCodeRepository(db))
+    asyncio.run(service.refresh_snapshot())
+    assert asyncio.run(service.get_swift_code("B00000PLXXX")) is not None
+    total = time.perf_counter() - start
+
+    print(f"{label:<10} parse alone {parse_elapsed:8.2f}s   empty DB to first request {total:8.2f}s   ({parsed} rows)")
+    db.close()
+    engine.dispose()
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=100_000)
+    args = arg_parser.parse_args()
+
+    frame = generate_frame(args.rows)
+
+    with tempfile.TemporaryDirectory() as directory:
+        xlsx_path, csv_path = os.path.join(directory, "swift.xlsx"), os.path.join(directory, "swift.csv")
+        frame.to_excel(xlsx_path, index=False)
+        frame.to_csv(csv_path, index=False)
+
+        time_to_first_request(directory, "xlsx", xlsx_path, use_snapshot=False)
+        time_to_first_request(directory, "csv", csv_path, use_snapshot=False)
+
+        # The first parse with snapshots enabled writes swift.xlsx.snap; a fresh container then reads it.
+        list(SwiftCodeParser(xlsx_path, use_snapshot=True).iter_records(5000))
+        print(f"snapshot size {os.path.getsize(xlsx_path + '.snap') / 1e6:.1f} MB vs xlsx {os.path.getsize(xlsx_path) / 1e6:.1f} MB")
+        time_to_first_request(directory, "snapshot", xlsx_path, use_snapshot=True)
+
+
+if __name__ == "__main__":
+    main()
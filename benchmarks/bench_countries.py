@@ -0,0 +1,128 @@
+"""
+Country name storage benchmark: country_name repeated on every swift_codes row (before) vs. a
+countries table joined in memory (after). Measures the database file size and the memory held by
+the read snapshot and by the largest country listing, on a dataset spread over ten countries.
+
+Run from the project root:
+    python -m benchmarks.bench_countries --rows 100000
+"""
+import argparse
+import gc
+import os
+import tempfile
+import tracemalloc
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import DatabaseManager, apply_sqlite_pragmas
+from app.repositories.swift_code_repository import SwiftCodeRepository
+from app.services.swift_snapshot import SwiftCodeSnapshot
+from benchmarks.legacy_schema import create_legacy_swift_codes, swift_codes_with_country_name
+
+COUNTRIES = [
+    ("PL", "POLAND"), ("DE", "GERMANY"), ("US", "UNITED STATES"), ("GB", "UNITED KINGDOM"),
+    ("FR", "FRANCE"), ("BA", "BOSNIA AND HERZEGOVINA"), ("CN", "CHINA"), ("BR", "BRAZIL"),
+    ("ZA", "SOUTH AFRICA"), ("NZ", "NEW ZEALAND"),
+]
+
+
+def generate_rows(rows: int) -> list:
+    data = []
+    for i in range(rows):
+        suffix = "XXX" if i % 5 == 0 else f"{i % 5:03d}"
+        country_iso2, country_name = COUNTRIES[(i // 5) % len(COUNTRIES)]
+        data.append({
+            "swift_code": f"B{i // 5:05d}{country_iso2}{suffix}",
+            "bank_name": f"Bank {i // 5}",
+            "address": f"{i} Main Street",
+            "country_iso2": country_iso2,
+            "country_name": country_name,
+            "is_headquarters": suffix == "XXX",
+        })
+    return data
+
+
+def retained(build) -> int:
+    """Bytes still allocated by what build() returns, once its temporaries are freed."""
+    build()
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def file_size(path: str) -> int:
+    return os.path.getsize(path) + sum(
+        os.path.getsize(path + suffix) for suffix in ("-wal", "-shm") if os.path.exists(path + suffix)
+    )
+
+
+def legacy_snapshot(db) -> SwiftCodeSnapshot:
+    """The previous snapshot: every record carries its own country_name string, read with its row."""
+    table = swift_codes_with_country_name
+    rows = db.execute(select(
+        table.c.swift_code, table.c.bank_name, table.c.address,
+        table.c.country_iso2, table.c.country_name, table.c.is_headquarters
+    )).all()
+    return SwiftCodeSnapshot({row.swift_code: dict(row._mapping) for row in rows})
+
+
+def legacy_country_listing(db, country_iso2: str) -> list:
+    table = swift_codes_with_country_name
+    rows = db.execute(select(
+        table.c.swift_code, table.c.bank_name, table.c.address,
+        table.c.country_iso2, table.c.country_name, table.c.is_headquarters
+    ).where(table.c.country_iso2 == country_iso2)).all()
+    return [dict(row._mapping) for row in rows]
+
+
+def report(label: str, path: str, snapshot: int, listing: int) -> None:
+    """Called once the engine is disposed, so the WAL has been checkpointed into the file."""
+    print(f"{label:<24} file {file_size(path) / 1e6:7.2f} MB   snapshot {snapshot / 1e6:7.2f} MB   "
+          f"largest country listing {listing / 1e6:6.2f} MB")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=100_000)
+    args = arg_parser.parse_args()
+
+    swift_data = generate_rows(args.rows)
+    country_iso2 = COUNTRIES[0][0]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "before.db")
+        engine = create_engine(f"sqlite:///{path}")
+        apply_sqlite_pragmas(engine, "performance")
+        create_legacy_swift_codes(engine)
+        db = sessionmaker(bind=engine)()
+        db.execute(insert(swift_codes_with_country_name), [
+            dict(SwiftCodeRepository._to_row(data), country_name=data["country_name"]) for data in swift_data
+        ])
+        db.commit()
+        snapshot = retained(lambda: legacy_snapshot(db))
+        listing = retained(lambda: legacy_country_listing(db, country_iso2))
+        db.close()
+        engine.dispose()
+        report("country_name per row", path, snapshot, listing)
+
+        path = os.path.join(directory, "after.db")
+        engine = create_engine(f"sqlite:///{path}")
+        apply_sqlite_pragmas(engine, "performance")
+        DatabaseManager.Base.metadata.create_all(bind=engine)
+        repository = SwiftCodeRepository(sessionmaker(bind=engine)())
+        repository.bulk_create_swift_codes(swift_data)
+        snapshot = retained(lambda: SwiftCodeSnapshot.build(*repository.load_snapshot_data()))
+        listing = retained(lambda: repository.get_country_swift_codes(country_iso2))
+        repository.db.close()
+        engine.dispose()
+        report("countries table (after)", path, snapshot, listing)
+
+
+if __name__ == "__main__":
+    main()
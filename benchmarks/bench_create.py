@@ -0,0 +1,91 @@
+"""
+Single-code create benchmark: existence check through get_swift_code + ORM insert, refresh, HQ query
+and a second commit (before) vs. one transaction of INSERT ... ON CONFLICT and INSERT ... SELECT (after).
+
+Run from the project root:
+    python -m benchmarks.bench_create --rows 5000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import DatabaseManager, apply_sqlite_pragmas
+from app.models.swift_code import SwiftCode
+from app.repositories.swift_code_repository import SwiftCodeRepository
+from benchmarks.legacy_schema import association_row, branch_associations, count_links, create_legacy_tables
+
+
+def generate_rows(rows: int, country_iso2: str) -> list:
+    data = []
+    for i in range(rows):
+        suffix = "XXX" if i % 5 == 0 else f"{i % 5:02d}"
+        data.append({
+            "swift_code": f"{i // 5:04d}{country_iso2}AA{suffix}",
+            "bank_name": f"Bank {i // 5}",
+            "address": f"{i} Main Street",
+            "country_iso2": "PL",
+            "country_name": "POLAND",
+            "is_headquarters": suffix == "XXX",
+        })
+    return data
+
+
+def legacy_create(repository: SwiftCodeRepository, swift_data: dict) -> None:
+    """The original controller pre-check plus repository create, kept here as the baseline."""
+    db = repository.db
+    swift_code = swift_data["swift_code"].upper()
+    if repository.get_swift_code(swift_code):
+        raise ValueError(f"Swift code {swift_code} already exists.")
+    if db.query(SwiftCode).filter(SwiftCode.swift_code == swift_code).first():
+        raise ValueError(f"Swift code {swift_code} already exists.")
+
+    # country_name lives in the countries table now; the baseline's row leaves it out.
+    new_swift_code = SwiftCode(**{key: value for key, value in swift_data.items() if key != "country_name"})
+    db.add(new_swift_code)
+    db.commit()
+    db.refresh(new_swift_code)
+
+    if not swift_data["is_headquarters"]:
+        hq_code = swift_code[:8] + "XXX"
+        if db.query(SwiftCode).filter(SwiftCode.swift_code == hq_code).first():
+            db.execute(insert(branch_associations).values(association_row(hq_code, swift_code)))
+            db.commit()
+
+
+def measure(label: str, directory: str, rows: list, create, count) -> None:
+    engine = create_engine(f"sqlite:///{os.path.join(directory, label.split()[0] + '.db')}")
+    apply_sqlite_pragmas(engine, "performance")
+    DatabaseManager.Base.metadata.create_all(bind=engine)
+    create_legacy_tables(engine)
+    repository = SwiftCodeRepository(sessionmaker(bind=engine)())
+
+    start = time.perf_counter()
+    for swift_data in rows:
+        create(repository, swift_data)
+    elapsed = time.perf_counter() - start
+
+    links = count(repository)
+    print(f"{label:<20} {elapsed:8.3f}s  {len(rows) / elapsed:10,.0f} creates/s  ({links} links)")
+    repository.db.close()
+    engine.dispose()
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=5_000)
+    args = arg_parser.parse_args()
+
+    rows = generate_rows(args.rows, "PL")
+
+    with tempfile.TemporaryDirectory() as directory:
+        measure("legacy (before)", directory, rows, legacy_create, lambda repository: count_links(repository.db))
+        measure("upsert-path (after)", directory, rows, lambda repository, data: repository.create_swift_code(data),
+                lambda repository: repository.count_branch_links())
+
+
+if __name__ == "__main__":
+    main()
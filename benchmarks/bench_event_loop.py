@@ -0,0 +1,96 @@
+"""
+Event-loop stall benchmark: concurrent country listings through the synchronous repository
+(queries run on the event loop) vs. AsyncSwiftCodeRepository (queries run on a thread pool).
+
+A heartbeat task sleeps 1 ms in a loop and records how late it wakes up; with the blocking
+repository its worst-case lag grows with the number of requests in flight.
+
+Run from the project root:
+    python -m benchmarks.bench_event_loop --rows 50000 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import DatabaseManager
+from app.repositories.async_swift_code_repository import AsyncSwiftCodeRepository
+from app.repositories.swift_code_repository import SwiftCodeRepository
+from app.services.swift_service import SwiftCodeService
+
+
+def populate(session_factory, rows: int) -> None:
+    countries = ["PL", "DE", "US", "GB", "FR"]
+    data = [
+        {
+            "swift_code": f"BANK{countries[i % 5]}{i:05d}",
+            "bank_name": f"Bank {i}",
+            "address": f"{i} Main Street",
+            "country_iso2": countries[i % 5],
+            "country_name": f"COUNTRY {countries[i % 5]}",
+            "is_headquarters": False,
+        }
+        for i in range(rows)
+    ]
+    db = session_factory()
+    SwiftCodeRepository(db).bulk_create_swift_codes(data)
+    db.close()
+
+
+async def run(service: SwiftCodeService, concurrency: int) -> tuple:
+    lags = []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    beat = asyncio.create_task(heartbeat())
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        service.get_country_swift_codes(["PL", "DE", "US", "GB", "FR"][i % 5]) for i in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+    done.set()
+    await beat
+    return elapsed, max(lags) if lags else elapsed, statistics.median(lags) if lags else elapsed, len(lags)
+
+
+def report(label: str, result: tuple) -> None:
+    elapsed, worst, median, beats = result
+    print(f"{label:<22} total {elapsed:7.3f}s  heartbeats {beats:6d}  "
+          f"median lag {median * 1000:8.2f} ms  worst lag {worst * 1000:8.2f} ms")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=50_000)
+    arg_parser.add_argument("--concurrency", type=int, default=50)
+    arg_parser.add_argument("--threads", type=int, default=8)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}",
+                               connect_args={"check_same_thread": False})
+        DatabaseManager.Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        populate(session_factory, args.rows)
+
+        sync_service = SwiftCodeService(SwiftCodeRepository(session_factory()))
+        report("sync (before)", asyncio.run(run(sync_service, args.concurrency)))
+
+        async_repository = AsyncSwiftCodeRepository(session_factory, args.threads)
+        report("threaded (after)", asyncio.run(run(SwiftCodeService(async_repository), args.concurrency)))
+        async_repository.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
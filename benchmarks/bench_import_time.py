@@ -0,0 +1,60 @@
+"""
+Import-time regression check for `import app.main`, measured with `python -X importtime`.
+
+Fails (exit code 1) when a module that only a data load needs is imported eagerly, or when the
+median cumulative import time exceeds --budget-ms.
+
+Run from the project root:
+    python -m benchmarks.bench_import_time --runs 5 --budget-ms 2000
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+LAZY_MODULES = ("pandas", "numpy", "openpyxl", "uvicorn")
+
+
+def import_profile(module: str) -> dict:
+    """Cumulative microseconds per module from one fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--module", default="app.main")
+    arg_parser.add_argument("--runs", type=int, default=5)
+    arg_parser.add_argument("--budget-ms", type=float, default=None)
+    args = arg_parser.parse_args()
+
+    profiles = [import_profile(args.module) for _ in range(args.runs)]
+    median_ms = statistics.median(profile[args.module] for profile in profiles) / 1000
+
+    last = profiles[-1]
+    heaviest = sorted((name for name in last if "." not in name and name != args.module), key=last.get, reverse=True)[:8]
+    print(f"import {args.module}: median {median_ms:.0f} ms over {args.runs} runs")
+    for name in heaviest:
+        print(f"  {name:<24} {last[name] / 1000:8.1f} ms")
+
+    failures = [f"{name} is imported eagerly" for name in LAZY_MODULES if name in last]
+    if args.budget_ms is not None and median_ms > args.budget_ms:
+        failures.append(f"median {median_ms:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Parser throughput benchmark: row-wise iterrows normalization vs. column-wise pandas string ops.
+
+Run from the project root:
+    python -m benchmarks.bench_parser --rows 200000
+"""
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+
+import pandas as pd
+
+from app.utils.parser import SwiftCodeParser
+
+
+def generate_csv(path: str, rows: int) -> None:
+    rng = random.Random(42)
+    countries = [("PL", "Poland"), ("DE", "Germany"), ("US", "United States"), ("GB", "United Kingdom")]
+    data = {"country_iso2_code": [], "swift_code": [], "name": [], "address": [], "country_name": []}
+
+    for i in range(rows):
+        iso2, name = countries[i % len(countries)]
+        bank = "".join(rng.choices(string.ascii_uppercase, k=4))
+        branch = "XXX" if i % 5 == 0 else "".join(rng.choices(string.ascii_uppercase + string.digits, k=3))
+        data["country_iso2_code"].append(f" {iso2.lower()} ")
+        data["swift_code"].append(f" {bank}{iso2}{i % 100:02d}{branch} ")
+        data["name"].append(f" Bank {bank} ")
+        data["address"].append(f" {i} Main Street ")
+        data["country_name"].append(f" {name} ")
+
+    pd.DataFrame(data).to_csv(path, index=False)
+
+
+def legacy_parse(file_path: str) -> list:
+    """The original per-row implementation, kept here as the baseline."""
+    df = pd.read_csv(file_path)
+    df.columns = [col.strip().lower().replace(' ', '_') for col in df.columns]
+    swift_data = []
+
+    for _, row in df.iterrows():
+        swift_code = row['swift_code'].strip().upper()
+        swift_data.append({
+            'swift_code': swift_code,
+            'bank_name': row['name'].strip(),
+            'address': row['address'].strip(),
+            'country_iso2': row['country_iso2_code'].strip().upper(),
+            'country_name': row['country_name'].strip().upper(),
+            'is_headquarters': swift_code.endswith('XXX')
+        })
+
+    return swift_data
+
+
+def measure(label: str, rows: int, func) -> float:
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    assert len(result) == rows
+    print(f"{label:<28} {elapsed:8.3f}s  {rows / elapsed:12,.0f} rows/s")
+    return elapsed
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=200_000)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "swift_codes.csv")
+        generate_csv(path, args.rows)
+
+        before = measure("iterrows (before)", args.rows, lambda: legacy_parse(path))
+        after = measure("parse_files (after)", args.rows, lambda: SwiftCodeParser(path).parse_files())
+        measure("parse_frame (frame only)", args.rows, lambda: SwiftCodeParser(path).parse_frame())
+
+        print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
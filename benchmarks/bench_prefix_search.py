@@ -0,0 +1,66 @@
+"""
+Prefix search latency: bisect over the snapshot's sorted code array vs. a LIKE 'prefix%' query.
+
+Run from the project root:
+    python -m benchmarks.bench_prefix_search --rows 500000
+"""
+import argparse
+import random
+import string
+import time
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import DatabaseManager
+from app.models.swift_code import SwiftCode
+from app.repositories.swift_code_repository import SwiftCodeRepository
+from app.services.swift_snapshot import SwiftCodeSnapshot
+
+
+def generate_records(rows: int) -> list:
+    rng = random.Random(7)
+    records = {}
+    while len(records) < rows:
+        code = "".join(rng.choices(string.ascii_uppercase, k=6)) + "".join(rng.choices(string.ascii_uppercase + string.digits, k=5))
+        records[code] = {
+            "swift_code": code,
+            "bank_name": f"Bank {code[:4]}",
+            "address": "1 Main Street",
+            "country_iso2": code[4:6],
+            "country_name": "COUNTRY",
+            "is_headquarters": False,
+        }
+    return list(records.values())
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=500_000)
+    arg_parser.add_argument("--queries", type=int, default=1000)
+    args = arg_parser.parse_args()
+
+    records = generate_records(args.rows)
+    prefixes = [record["swift_code"][:length] for record, length in zip(records[:args.queries], [4, 6, 8] * args.queries)]
+
+    snapshot = SwiftCodeSnapshot.build(records)
+    start = time.perf_counter()
+    for prefix in prefixes:
+        snapshot.search_prefix(prefix, 10)
+    per_query = (time.perf_counter() - start) / len(prefixes)
+    print(f"{'snapshot bisect':<20} {per_query * 1e6:10.1f} us/query")
+
+    engine = create_engine("sqlite:///:memory:")
+    DatabaseManager.Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    SwiftCodeRepository(db).insert_swift_code_batch(records)
+    sample = prefixes[:100]
+    start = time.perf_counter()
+    for prefix in sample:
+        list(db.scalars(select(SwiftCode).where(SwiftCode.swift_code.like(f"{prefix}%")).limit(10)))
+    per_query = (time.perf_counter() - start) / len(sample)
+    print(f"{'SQL LIKE scan':<20} {per_query * 1e6:10.1f} us/query")
+
+
+if __name__ == "__main__":
+    main()
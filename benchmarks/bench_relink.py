@@ -0,0 +1,129 @@
+"""
+Orphan-branch reconciliation benchmark on a dataset whose branches are loaded before their headquarters.
+Before: the association-table pass that linked unlinked branches with INSERT ... SELECT ... NOT IN, run
+after the headquarters load and again (after clearing the table) for a full rebuild. After: the bulk load
+adopting stored orphans with primary key range scans, and the admin relink (one counting statement).
+
+Run from the project root:
+    python -m benchmarks.bench_relink --rows 100000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy import String, create_engine, delete, func, insert, select
+from sqlalchemy.orm import aliased, sessionmaker
+
+from app.database import DatabaseManager, apply_sqlite_pragmas
+from app.models.swift_code import SwiftCode
+from app.repositories.swift_code_repository import SwiftCodeRepository
+from app.services.swift_service import SwiftCodeService
+from benchmarks.legacy_schema import branch_associations, count_links, create_legacy_tables
+
+
+def generate_rows(rows: int) -> tuple:
+    """Branches and headquarters of the same institutions; every tenth institution has no headquarters."""
+    branches, headquarters = [], []
+    for i in range(rows):
+        suffix = "XXX" if i % 5 == 0 else f"{i % 5:03d}"
+        data = {
+            "swift_code": f"R{i // 5:05d}PL{suffix}",
+            "bank_name": f"Bank {i // 5}",
+            "address": f"{i} Main Street",
+            "country_iso2": "PL",
+            "country_name": "POLAND",
+            "is_headquarters": suffix == "XXX",
+        }
+        if not data["is_headquarters"]:
+            branches.append(data)
+        elif (i // 5) % 10:
+            headquarters.append(data)
+    return branches, headquarters
+
+
+def legacy_link_branches(db) -> int:
+    """The previous reconciliation: one INSERT ... SELECT of every branch not yet in the association table."""
+    branch = aliased(SwiftCode)
+    headquarter = aliased(SwiftCode)
+    hq_code = func.substr(branch.swift_code, 1, 8, type_=String).concat("XXX")
+
+    unlinked = (
+        select(func.lower(func.hex(func.randomblob(16))), headquarter.swift_code, branch.swift_code)
+        .join(headquarter, headquarter.swift_code == hq_code)
+        .where(branch.is_headquarters.is_(False))
+        .where(branch.swift_code.not_in(select(branch_associations.c.branch_swift)))
+    )
+    result = db.execute(insert(branch_associations).from_select(["id", "headquarter_swift", "branch_swift"], unlinked))
+    db.commit()
+    return result.rowcount
+
+
+def timed(func) -> tuple:
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def open_repository(path: str) -> tuple:
+    engine = create_engine(f"sqlite:///{path}")
+    apply_sqlite_pragmas(engine, "performance")
+    DatabaseManager.Base.metadata.create_all(bind=engine)
+    create_legacy_tables(engine)
+    return engine, SwiftCodeRepository(sessionmaker(bind=engine)())
+
+
+def measure_legacy(path: str, branches: list, headquarters: list) -> None:
+    engine, repository = open_repository(path)
+    db = repository.db
+    db.execute(insert(SwiftCode.__table__), [repository._to_row(data) for data in branches])
+    db.commit()
+
+    def load_and_link() -> int:
+        db.execute(insert(SwiftCode.__table__), [repository._to_row(data) for data in headquarters])
+        db.commit()
+        return legacy_link_branches(db)
+
+    adopt, adopted = timed(load_and_link)
+
+    def rebuild() -> int:
+        db.execute(delete(branch_associations))
+        return legacy_link_branches(db)
+
+    relink, linked = timed(rebuild)
+    assert count_links(db) == linked
+
+    print(f"{'association (before)':<22} HQ load + link {adopt:7.3f}s ({adopted} adopted)  "
+          f"full relink {relink:7.3f}s ({linked} linked)")
+    db.close()
+    engine.dispose()
+
+
+def measure_derived(path: str, branches: list, headquarters: list) -> None:
+    engine, repository = open_repository(path)
+    repository.bulk_create_swift_codes(branches)
+
+    adopt, links = timed(lambda: repository.bulk_create_swift_codes(headquarters))
+    relink, stats = timed(lambda: asyncio.run(SwiftCodeService(repository).relink_branches()))
+
+    print(f"{'derived (after)':<22} HQ load + adopt {adopt:6.3f}s ({len(links)} adopted)  "
+          f"full relink {relink:7.3f}s ({stats['linked']} linked, {stats['orphaned']} orphaned)")
+    repository.db.close()
+    engine.dispose()
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=100_000)
+    args = arg_parser.parse_args()
+
+    branches, headquarters = generate_rows(args.rows)
+
+    with tempfile.TemporaryDirectory() as directory:
+        measure_legacy(os.path.join(directory, "before.db"), branches, headquarters)
+        measure_derived(os.path.join(directory, "after.db"), branches, headquarters)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Dataset reload benchmark: wipe + full reimport (before) vs. diff-based sync of a file with ~1% changed rows (after).
+
+Run from the project root:
+    python -m benchmarks.bench_reload --rows 200000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import DatabaseManager, apply_sqlite_pragmas
+from app.repositories.swift_code_repository import SwiftCodeRepository
+from app.services.ingest_service import SwiftCodeIngestService
+from app.utils.parser import SwiftCodeParser
+
+
+def generate_csv(path: str, rows: int, revision: int = 0) -> None:
+    """Revision n renames every 200th bank, drops every 300th row and appends rows/500 new ones."""
+    data = {"country_iso2_code": [], "swift_code": [], "name": [], "address": [], "country_name": []}
+    total = rows + (rows // 500 if revision else 0)
+
+    for i in range(total):
+        if revision and i < rows and i % 300 == 299:
+            continue
+        suffix = "XXX" if i % 5 == 0 else f"{i % 5:03d}"
+        data["country_iso2_code"].append("PL")
+        data["swift_code"].append(f"{i // 5:06d}PL{suffix}"[-11:])
+        data["name"].append(f"Bank {i // 5}" + (f" rev {revision}" if revision and i % 200 == 0 else ""))
+        data["address"].append(f"{i} Main Street")
+        data["country_name"].append("Poland")
+
+    pd.DataFrame(data).to_csv(path, index=False)
+
+
+def new_session(database_path: str):
+    engine = create_engine(f"sqlite:///{database_path}")
+    apply_sqlite_pragmas(engine, "performance")
+    DatabaseManager.Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=200_000)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        original, revised = os.path.join(directory, "v1.csv"), os.path.join(directory, "v2.csv")
+        generate_csv(original, args.rows)
+        generate_csv(revised, args.rows, revision=1)
+
+        db = new_session(os.path.join(directory, "full.db"))
+        SwiftCodeIngestService(SwiftCodeRepository(db)).sync(SwiftCodeParser(original))
+        start = time.perf_counter()
+        db.execute(DatabaseManager.Base.metadata.tables["swift_codes"].delete())
+        db.commit()
+        SwiftCodeIngestService(SwiftCodeRepository(db)).ingest(SwiftCodeParser(revised))
+        before = time.perf_counter() - start
+        print(f"{'wipe + reimport':<20} {before:8.2f}s")
+        db.close()
+
+        db = new_session(os.path.join(directory, "sync.db"))
+        service = SwiftCodeIngestService(SwiftCodeRepository(db))
+        service.sync(SwiftCodeParser(original))
+        start = time.perf_counter()
+        counts = service.sync(SwiftCodeParser(revised))
+        after = time.perf_counter() - start
+        print(f"{'diff sync':<20} {after:8.2f}s  {counts}")
+
+        start = time.perf_counter()
+        service.sync(SwiftCodeParser(revised))
+        print(f"{'same file again':<20} {time.perf_counter() - start:8.2f}s")
+        db.close()
+
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Country listing latency: dict + response_model validation per request (before) vs.
+pre-rendered JSON bytes returned as a Response (after).
+
+Run from the project root:
+    python -m benchmarks.bench_response_cache --rows 20000 --requests 50
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.controllers.swift_controllers import SwiftCodeController
+from app.database import DatabaseManager
+from app.models.types import CountrySwiftCodesResponse
+from app.repositories.swift_code_repository import SwiftCodeRepository
+from app.routes.swift_codes import SwiftCodesRoutes
+from app.services.swift_service import SwiftCodeService
+
+
+def build_controller(tmp_dir: str, rows: int) -> SwiftCodeController:
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}", connect_args={"check_same_thread": False})
+    DatabaseManager.Base.metadata.create_all(bind=engine)
+    repository = SwiftCodeRepository(sessionmaker(bind=engine)())
+    repository.bulk_create_swift_codes([
+        {
+            "swift_code": f"BANKPL{i:05d}",
+            "bank_name": f"Bank Polski {i}",
+            "address": f"ul. Marszałkowska {i}, Warszawa",
+            "country_iso2": "PL",
+            "country_name": "POLAND",
+            "is_headquarters": False,
+        }
+        for i in range(rows)
+    ])
+    return SwiftCodeController(SwiftCodeService(repository))
+
+
+def measure(label: str, client: TestClient, requests: int) -> float:
+    client.get("/v1/swift-codes/country/PL")
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get("/v1/swift-codes/country/PL")
+        assert response.status_code == 200
+    elapsed = (time.perf_counter() - start) / requests
+    print(f"{label:<30} {elapsed * 1000:9.2f} ms/request  ({len(response.content):,} bytes)")
+    return elapsed
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=20_000)
+    arg_parser.add_argument("--requests", type=int, default=50)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        controller = build_controller(tmp_dir, args.rows)
+
+        legacy_app = FastAPI()
+        legacy_app.add_api_route("/v1/swift-codes/country/{country_iso2}", controller.get_country_swift_codes,
+                                 methods=["GET"], response_model=CountrySwiftCodesResponse)
+        cached_app = FastAPI()
+        cached_app.include_router(SwiftCodesRoutes(controller).router)
+
+        before = measure("validated dicts (before)", TestClient(legacy_app), args.requests)
+        after = measure("cached JSON bytes (after)", TestClient(cached_app), args.requests)
+        print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Cost of publishing one write to the read snapshot, i.e. the time the event loop is blocked per create
+or delete. Before: copying the whole records map and sorted code array for every write. After: copying
+the overlay of recent writes only, with the overlay folded into the base once it outgrows its limit.
+
+Run from the project root:
+    python -m benchmarks.bench_snapshot_writes --rows 500000 --writes 2000
+"""
+import argparse
+import time
+from bisect import bisect_left
+
+from app.services.swift_snapshot import SwiftCodeSnapshot
+
+
+def generate_records(rows: int) -> list:
+    return [
+        {
+            "swift_code": f"BANK{i // 5:05d}PL{'XXX' if i % 5 == 0 else f'{i % 5:03d}'}",
+            "bank_name": f"Bank {i // 5}",
+            "address": f"{i} Main Street",
+            "country_iso2": "PL",
+            "country_name": "POLAND",
+            "is_headquarters": i % 5 == 0,
+        }
+        for i in range(rows)
+    ]
+
+
+def legacy_with_record(records: dict, sorted_codes: list, record: dict) -> tuple:
+    """The previous with_record: a full copy of the map, and of the code array for a new code."""
+    records = dict(records)
+    records[record["swift_code"]] = record
+    sorted_codes = list(sorted_codes)
+    sorted_codes.insert(bisect_left(sorted_codes, record["swift_code"]), record["swift_code"])
+    return records, sorted_codes
+
+
+def legacy_without_record(records: dict, sorted_codes: list, swift_code: str) -> tuple:
+    records = dict(records)
+    del records[swift_code]
+    sorted_codes = list(sorted_codes)
+    del sorted_codes[bisect_left(sorted_codes, swift_code)]
+    return records, sorted_codes
+
+
+def report(label: str, create: list, delete: list) -> None:
+    print(f"{label:<20} create {sum(create) / len(create) * 1e3:8.3f} ms avg {max(create) * 1e3:8.3f} ms max   "
+          f"delete {sum(delete) / len(delete) * 1e3:8.3f} ms avg {max(delete) * 1e3:8.3f} ms max")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=500_000)
+    arg_parser.add_argument("--writes", type=int, default=2000)
+    args = arg_parser.parse_args()
+
+    records = generate_records(args.rows)
+    new_records = [dict(record, swift_code=f"NEWB{i:07d}") for i, record in enumerate(records[:args.writes])]
+    deleted = [record["swift_code"] for record in records[:args.writes]]
+
+    records_map = {record["swift_code"]: record for record in records}
+    sorted_codes = sorted(records_map)
+    create, delete = [], []
+    for record, swift_code in zip(new_records[:50], deleted[:50]):
+        start = time.perf_counter()
+        records_map, sorted_codes = legacy_with_record(records_map, sorted_codes, record)
+        create.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        records_map, sorted_codes = legacy_without_record(records_map, sorted_codes, swift_code)
+        delete.append(time.perf_counter() - start)
+    report("full copy (before)", create, delete)
+
+    snapshot = SwiftCodeSnapshot.build(records)
+    create, delete, compactions = [], [], []
+    for record, swift_code in zip(new_records, deleted):
+        start = time.perf_counter()
+        snapshot = snapshot.with_record(record)
+        create.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        snapshot = snapshot.without_record(swift_code)
+        delete.append(time.perf_counter() - start)
+
+        if snapshot.needs_compaction():
+            # In the service this runs on a worker thread, not on the event loop.
+            start = time.perf_counter()
+            snapshot = snapshot.rebased(snapshot.compacted(), snapshot)
+            compactions.append(time.perf_counter() - start)
+    report("overlay (after)", create, delete)
+    if compactions:
+        print(f"{'':<20} {len(compactions)} compactions off the loop, "
+              f"{sum(compactions) / len(compactions) * 1e3:.1f} ms each")
+
+    assert len(snapshot) == args.rows
+    assert [record["swift_code"] for record in snapshot.search_prefix("NEWB", 3)] == [
+        record["swift_code"] for record in new_records[:3]
+    ]
+
+
+if __name__ == "__main__":
+    main()
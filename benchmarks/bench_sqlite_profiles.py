@@ -0,0 +1,53 @@
+"""
+Single-row write benchmark per SQLite pragma profile (one INSERT + commit per SWIFT code).
+
+Run from the project root:
+    python -m benchmarks.bench_sqlite_profiles --writes 2000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import DatabaseManager, SQLITE_PRAGMA_PROFILES, apply_sqlite_pragmas
+from app.repositories.swift_code_repository import SwiftCodeRepository
+
+
+def measure(profile: str, writes: int, tmp_dir: str) -> None:
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, f'{profile}.db')}")
+    apply_sqlite_pragmas(engine, profile)
+    DatabaseManager.Base.metadata.create_all(bind=engine)
+    repository = SwiftCodeRepository(sessionmaker(bind=engine)())
+
+    start = time.perf_counter()
+    for i in range(writes):
+        repository.create_swift_code({
+            "swift_code": f"PROF{i:07d}",
+            "bank_name": f"Bank {i}",
+            "address": f"{i} Main Street",
+            "country_iso2": "PL",
+            "country_name": "POLAND",
+            "is_headquarters": True,
+        })
+    elapsed = time.perf_counter() - start
+
+    print(f"{profile:<12} {elapsed:8.3f}s  {writes / elapsed:10,.0f} writes/s")
+    repository.db.close()
+    engine.dispose()
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--writes", type=int, default=2000)
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for profile in SQLITE_PRAGMA_PROFILES:
+            measure(profile, args.writes, tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Concurrent single-code writes through SwiftCodeService on the threaded repository: one transaction
+per create (before) vs. group commit through the write batcher (after), at 1, 10 and 100 clients.
+
+Run from the project root:
+    python -m benchmarks.bench_write_batching --writes 2000 --profile durable
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import DatabaseManager, apply_sqlite_pragmas
+from app.repositories.async_swift_code_repository import AsyncSwiftCodeRepository
+from app.services.swift_service import SwiftCodeService
+
+
+def generate_rows(rows: int, run_letter: str) -> list:
+    data = []
+    for i in range(rows):
+        suffix = "XXX" if i % 5 == 0 else f"{i % 5:02d}"
+        data.append({
+            "swift_code": f"{run_letter}{i // 5:03d}PLAA{suffix}",
+            "bank_name": f"Bank {i // 5}",
+            "address": f"{i} Main Street",
+            "country_iso2": "PL",
+            "country_name": "POLAND",
+            "is_headquarters": suffix == "XXX",
+        })
+    return data
+
+
+async def run(service: SwiftCodeService, rows: list, clients: int) -> float:
+    queue = iter(rows)
+
+    async def client() -> None:
+        for swift_data in queue:
+            await service.create_swift_code(swift_data)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    await service.close()
+    return elapsed
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--writes", type=int, default=2_000, help="per run, at most 5000")
+    arg_parser.add_argument("--profile", default="durable")
+    arg_parser.add_argument("--threads", type=int, default=8)
+    arg_parser.add_argument("--window-ms", type=float, default=2.0)
+    arg_parser.add_argument("--batch-size", type=int, default=100)
+    args = arg_parser.parse_args()
+
+    # Concurrent clients create some branches before their headquarters; skip the per-branch warnings.
+    logging.getLogger().setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}",
+                               connect_args={"check_same_thread": False})
+        apply_sqlite_pragmas(engine, args.profile)
+        DatabaseManager.Base.metadata.create_all(bind=engine)
+        repository = AsyncSwiftCodeRepository(sessionmaker(autocommit=False, autoflush=False, bind=engine), args.threads)
+
+        # One leading letter per run keeps every run's codes unique in the shared database.
+        run_letters = iter("ABCDEF")
+        for clients in (1, 10, 100):
+            for label, window_ms in (("per-write (before)", 0), ("batched (after)", args.window_ms)):
+                service = SwiftCodeService(repository, write_batch_window_ms=window_ms, write_batch_size=args.batch_size)
+                elapsed = asyncio.run(run(service, generate_rows(args.writes, next(run_letters)), clients))
+                print(f"{clients:4d} clients  {label:<20} {elapsed:8.3f}s  {args.writes / elapsed:10,.0f} writes/s")
+
+        repository.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Tables of earlier schema versions, kept for the "before" side of the benchmarks:
+- branch_associations, used before branch links were derived from the code prefix: a random
+  UUID string key per link and no indexes. Its foreign keys are left out (SQLite did not
+  enforce them) so it needs no shared metadata.
+- swift_codes as it was before the countries table, with country_name on every row. It has
+  its own metadata and is created with create_legacy_swift_codes, in a database of its own.
+"""
+import uuid
+
+from sqlalchemy import Boolean, Column, Index, MetaData, String, Table, select
+
+metadata = MetaData()
+
+swift_codes_metadata = MetaData()
+
+swift_codes_with_country_name = Table(
+    "swift_codes",
+    swift_codes_metadata,
+    Column("swift_code", String, primary_key=True, index=True),
+    Column("bank_name", String, nullable=False),
+    Column("address", String, nullable=False),
+    Column("country_iso2", String(2), nullable=False, index=True),
+    Column("country_name", String, nullable=False),
+    Column("is_headquarters", Boolean, default=False),
+    Column("row_hash", String(40), nullable=True),
+    Index("ix_swift_codes_country_iso2_swift_code", "country_iso2", "swift_code"),
+)
+
+branch_associations = Table(
+    "branch_associations",
+    metadata,
+    Column("id", String, primary_key=True),
+    Column("headquarter_swift", String),
+    Column("branch_swift", String),
+)
+
+
+def create_legacy_tables(engine) -> None:
+    metadata.create_all(bind=engine)
+
+
+def association_row(hq_code: str, branch_code: str) -> dict:
+    return {"id": str(uuid.uuid4()), "headquarter_swift": hq_code, "branch_swift": branch_code}
+
+
+def count_links(db) -> int:
+    return len(db.execute(select(branch_associations.c.id)).all())
+
+
+def create_legacy_swift_codes(engine) -> None:
+    swift_codes_metadata.create_all(bind=engine)
@@ -1,4 +1,5 @@
 import os
+import time
 import pytest
 import pandas as pd
 from sqlalchemy import create_engine
@@ -7,7 +8,6 @@ from fastapi.testclient import TestClient
 from app.database import DatabaseManager
 from app.main import app
 from app.models.swift_code import SwiftCode
-from app.models.branch_association import BranchAssociation
 from app.repositories.swift_code_repository import SwiftCodeRepository
 from app.services.swift_service import SwiftCodeService
 from app.controllers.swift_controllers import SwiftCodeController
@@ -18,7 +18,6 @@ def test_db():
     TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
     SwiftCode.metadata.create_all(bind=engine)
-    BranchAssociation.metadata.create_all(bind=engine)
 
     db = TestSessionLocal()
     yield db
@@ -39,6 +38,10 @@ def swift_controller(swift_service):
 @pytest.fixture
 def test_client():
     with TestClient(app) as client:
+        for _ in range(500):
+            if client.get("/health/ready").status_code == 200:
+                break
+            time.sleep(0.01)
         yield client
 
 @pytest.fixture
@@ -53,7 +56,7 @@ def sample_swift_data():
             "is_headquarters": True
         },
         {
-            "swift_code": "AAAAUS33",
+            "swift_code": "AAAAUSXX033",
             "bank_name": "Test Bank Branch",
             "address": "456 Second St, Boston",
             "country_iso2": "US",
@@ -79,7 +82,7 @@ def create_test_excel():
     
     data = {
         "country_iso2_code": ["US", "US", "GB"],
-        "swift_code": ["AAAAUSXXXXX", "AAAAUS33", "BBBBGBXXXXX"],
+        "swift_code": ["AAAAUSXXXXX", "AAAAUSXX033", "BBBBGBXXXXX"],
         "name": ["Test Bank HQ", "Test Bank Branch", "Euro Bank HQ"],
         "address": ["123 Main St, New York", "456 Second St, Boston", "1 London Road"],
         "country_name": ["United States", "United States", "United Kingdom"]
@@ -99,7 +102,7 @@ def create_test_csv():
     
     data = {
         "country_iso2_code": ["US", "US", "GB"],
-        "swift_code": ["AAAAUSXXXXX", "AAAAUS33", "BBBBGBXXXXX"],
+        "swift_code": ["AAAAUSXXXXX", "AAAAUSXX033", "BBBBGBXXXXX"],
         "name": ["Test Bank HQ", "Test Bank Branch", "Euro Bank HQ"],
         "address": ["123 Main St, New York", "456 Second St, Boston", "1 London Road"],
         "country_name": ["United States", "United States", "United Kingdom"]
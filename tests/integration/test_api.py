@@ -1,10 +1,57 @@
+import json
+import time
+import pytest
 from unittest.mock import patch
 from fastapi import HTTPException
+from app.config import Settings
 
 def test_health_endpoint(test_client):
     response = test_client.get("/health")
     assert response.status_code == 200
-    assert response.json() == {"status": "healthy"}
+    assert response.json()["status"] == "healthy"
+    assert "dataset_version" in response.json()
+
+def test_health_live_and_ready(test_client):
+    assert test_client.get("/health/live").json() == {"status": "alive"}
+
+    response = test_client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+def test_data_endpoints_wait_for_dataset(test_client, monkeypatch):
+    reloader = test_client.app.state.dataset_reloader
+    monkeypatch.setattr(reloader, "ready", False)
+
+    response = test_client.get("/v1/swift-codes/AAAAUSXXXXX")
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+
+    ready = test_client.get("/health/ready")
+    assert ready.status_code == 503
+    assert ready.headers["Retry-After"] == response.headers["Retry-After"]
+    assert test_client.get("/health").json()["status"] == "loading"
+    assert test_client.get("/health/live").status_code == 200
+
+def test_admin_reload(test_client, monkeypatch):
+    result = {"status": "unchanged", "changes": None, "version": None}
+
+    with patch("app.services.dataset_reloader.DatasetReloader.reload", return_value=result) as reload:
+        assert test_client.post("/v1/admin/reload").json() == result
+        reload.assert_called_once()
+
+        monkeypatch.setattr(Settings, "admin_token", "secret")
+        assert test_client.post("/v1/admin/reload").status_code == 401
+        assert test_client.post("/v1/admin/reload", headers={"X-Admin-Token": "secret"}).status_code == 200
+
+def test_admin_relink(test_client, monkeypatch):
+    result = {"headquarters": 2, "branches": 5, "linked": 4, "orphaned": 1, "elapsed_seconds": 0.01}
+
+    with patch("app.services.swift_service.SwiftCodeService.relink_branches", return_value=result) as relink:
+        assert test_client.post("/v1/admin/relink").json() == result
+        relink.assert_called_once()
+
+        monkeypatch.setattr(Settings, "admin_token", "secret")
+        assert test_client.post("/v1/admin/relink").status_code == 401
 
 def test_get_swift_code(test_client):
     mock_swift_code = {
@@ -48,6 +95,102 @@ def test_create_swift_code(test_client):
         assert response.status_code == 200
         assert "created successfully" in response.json()["message"]
 
+def test_bulk_create_swift_codes(test_client):
+    items = [
+        {"swift_code": "BLKAMTMTXXX", "bank_name": "Bulk API HQ", "address": "1 Bulk Street",
+         "country_iso2": "MT", "country_name": "MALTA", "is_headquarters": True},
+        {"swift_code": "BLKAMTMT001", "bank_name": "Bulk API Branch", "address": "2 Bulk Street",
+         "country_iso2": "MT", "country_name": "MALTA", "is_headquarters": False}
+    ]
+
+    try:
+        response = test_client.post("/v1/swift-codes/bulk", json=items)
+        assert response.status_code == 200
+        assert (response.json()["created"], response.json()["linked"]) == (2, 1)
+
+        ndjson = "\n".join(json.dumps(item) for item in items) + "\n{\"swift_code\": \"BLKAMTMT002\"}\n"
+        response = test_client.post(
+            "/v1/swift-codes/bulk", content=ndjson, headers={"Content-Type": "application/x-ndjson"}
+        )
+        assert [item["status"] for item in response.json()["results"]] == ["exists", "exists", "invalid"]
+
+        response = test_client.post("/v1/swift-codes/bulk", json=[dict(items[0], swift_code="BLKAMTMTXXXXXX")])
+        assert response.json()["results"][0]["status"] == "invalid"
+        assert test_client.get("/v1/swift-codes/BLKAMTMTXXXXXX").status_code == 404
+
+        branches = test_client.get("/v1/swift-codes/BLKAMTMTXXX").json()["branches"]
+        assert [branch["swift_code"] for branch in branches] == ["BLKAMTMT001"]
+    finally:
+        test_client.delete("/v1/swift-codes/BLKAMTMT001")
+        test_client.delete("/v1/swift-codes/BLKAMTMTXXX")
+
+def test_bulk_create_rejects_malformed_body(test_client):
+    assert test_client.post("/v1/swift-codes/bulk", json={"swift_code": "X"}).status_code == 400
+    response = test_client.post(
+        "/v1/swift-codes/bulk", content="{}\nnot json\n", headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 400
+    assert "line 2" in response.json()["detail"]
+
+def test_import_swift_codes(test_client):
+    upload = (
+        "COUNTRY ISO2 CODE,SWIFT CODE,NAME,ADDRESS,COUNTRY NAME\n"
+        "MT,IMPTMTMTXXX,Import Test HQ,1 Upload Street,Malta\n"
+        "MT,IMPTMTMT001,Import Test Branch,2 Upload Street,Malta\n"
+        "MT,NOT-VALID,Rejected Row,3 Upload Street,Malta\n"
+    )
+
+    response = test_client.post("/v1/swift-codes/import", files={"file": ("codes.csv", upload, "text/csv")})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    for _ in range(300):
+        job = test_client.get(f"/v1/swift-codes/import/{job_id}").json()
+        if job["status"] in ("completed", "failed"):
+            break
+        time.sleep(0.05)
+
+    try:
+        assert job["status"] == "completed"
+        assert job["rejected"] == 1
+        assert job["rejections"][0]["row"] == 3
+        branches = test_client.get("/v1/swift-codes/IMPTMTMTXXX").json()["branches"]
+        assert [branch["swift_code"] for branch in branches] == ["IMPTMTMT001"]
+    finally:
+        test_client.delete("/v1/swift-codes/IMPTMTMT001")
+        test_client.delete("/v1/swift-codes/IMPTMTMTXXX")
+
+def test_import_swift_codes_unsupported_file(test_client):
+    response = test_client.post("/v1/swift-codes/import", files={"file": ("codes.txt", b"x", "text/plain")})
+    assert response.status_code == 400
+    assert test_client.get("/v1/swift-codes/import/unknown").status_code == 404
+
+def test_upsert_swift_code(test_client):
+    swift_data = {
+        "swift_code": "UPSRMTMTXXX",
+        "bank_name": "Upsert API Bank",
+        "address": "1 Put Street",
+        "country_iso2": "MT",
+        "country_name": "MALTA",
+        "is_headquarters": True
+    }
+
+    try:
+        response = test_client.put("/v1/swift-codes/upsrmtmtxxx", json=swift_data)
+        assert (response.status_code, response.json()["status"]) == (201, "created")
+
+        response = test_client.put("/v1/swift-codes/UPSRMTMTXXX", json=swift_data)
+        assert (response.status_code, response.json()["status"]) == (200, "unchanged")
+
+        response = test_client.put("/v1/swift-codes/UPSRMTMTXXX", json=dict(swift_data, bank_name="Renamed"))
+        assert response.json()["status"] == "updated"
+        assert test_client.get("/v1/swift-codes/UPSRMTMTXXX").json()["bank_name"] == "Renamed"
+
+        assert test_client.post("/v1/swift-codes/", json=swift_data).status_code == 409
+        assert test_client.put("/v1/swift-codes/OTHERCODEXXX", json=swift_data).status_code == 400
+    finally:
+        test_client.delete("/v1/swift-codes/UPSRMTMTXXX")
+
 def test_create_swift_code_invalid(test_client):
     swift_data = {
         "swift_code": "INCOMPLETE",
@@ -55,4 +198,102 @@ def test_create_swift_code_invalid(test_client):
     
     response = test_client.post("/v1/swift-codes/", json=swift_data)
     
-    assert response.status_code == 422 
\ No newline at end of file
+    assert response.status_code == 422 
+
+def test_lookup_swift_codes(test_client):
+    mock_result = {"swift_codes": [], "missing": ["NOPE1234"]}
+
+    with patch("app.services.swift_service.SwiftCodeService.get_swift_codes", return_value=mock_result) as lookup:
+        response = test_client.post("/v1/swift-codes/lookup", json={"swift_codes": ["NOPE1234"]})
+
+        assert response.status_code == 200
+        assert response.json() == mock_result
+        lookup.assert_called_once_with(["NOPE1234"])
+
+def test_lookup_swift_codes_over_limit(test_client):
+    with patch("app.controllers.swift_controllers.Settings.lookup_max_codes", 2):
+        response = test_client.post("/v1/swift-codes/lookup", json={"swift_codes": ["A1234", "B1234", "C1234"]})
+
+        assert response.status_code == 400
+        assert "limit 2" in response.json()["detail"]
+
+def test_get_country_swift_codes_page(test_client):
+    mock_page = {"country_iso2": "PL", "country_name": "POLAND", "swift_codes": [], "next_cursor": None}
+
+    with patch("app.services.swift_service.SwiftCodeService.get_country_swift_codes_page", return_value=mock_page) as page:
+        response = test_client.get("/v1/swift-codes/country/PL", params={"limit": 2, "after": "AAAAPLPW"})
+
+        assert response.status_code == 200
+        assert response.json() == mock_page
+        page.assert_called_once_with("PL", 2, "AAAAPLPW")
+
+def test_get_country_swift_codes_ndjson(test_client):
+    async def mock_stream(self, country_iso2):
+        yield b'{"swift_code": "AAAAPLPWXXX"}\n'
+        yield b'{"swift_code": "AAAAPLPW123"}\n'
+
+    with patch("app.services.swift_service.SwiftCodeService.stream_country_swift_codes", mock_stream):
+        response = test_client.get("/v1/swift-codes/country/PL", params={"format": "ndjson"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert len(response.text.splitlines()) == 2
+
+def test_search_prefix(test_client):
+    mock_result = [{
+        "swift_code": "AAAAPLPWXXX",
+        "bank_name": "Prefix Bank",
+        "address": "1 Prefix St",
+        "country_iso2": "PL",
+        "country_name": "POLAND",
+        "is_headquarters": True
+    }]
+
+    with patch("app.services.swift_service.SwiftCodeService.search_prefix", return_value=mock_result) as search:
+        response = test_client.get("/v1/swift-codes/search", params={"prefix": "aaaapl", "limit": 5})
+
+        assert response.status_code == 200
+        assert response.json() == {"query": "AAAAPL", "swift_codes": mock_result}
+        search.assert_called_once_with("AAAAPL", 5)
+
+def test_search_bank_name(test_client):
+    mock_result = [{
+        "swift_code": "AAAAPLPWXXX",
+        "bank_name": "Santander Bank Polska",
+        "address": "1 Prefix St",
+        "country_iso2": "PL",
+        "country_name": "POLAND",
+        "is_headquarters": True,
+        "score": 0.8
+    }]
+
+    with patch("app.services.swift_service.SwiftCodeService.search_bank_name", return_value=mock_result) as search:
+        response = test_client.get("/v1/swift-codes/search/bank", params={"q": "santandr", "country": "pl", "limit": 3})
+
+        assert response.status_code == 200
+        assert response.json() == {"query": "santandr", "swift_codes": mock_result}
+        search.assert_called_once_with("santandr", 3, "pl")
+
+def test_search_bank_name_requires_query(test_client):
+    response = test_client.get("/v1/swift-codes/search/bank", params={"q": "a"})
+
+    assert response.status_code == 422
+
+def test_search_prefix_invalid(test_client):
+    response = test_client.get("/v1/swift-codes/search", params={"prefix": "AB-C"})
+
+    assert response.status_code == 400
+
+@pytest.mark.parametrize("swift_code", ["ABCD", "ABCDPLPW1", "AAAAPLPWXXXXXX"])
+def test_create_rejects_partial_codes(test_client, swift_code):
+    swift_data = {
+        "swift_code": swift_code,
+        "bank_name": "Partial Bank",
+        "address": "1 Partial St",
+        "country_iso2": "PL",
+        "country_name": "POLAND",
+        "is_headquarters": True
+    }
+
+    assert test_client.post("/v1/swift-codes/", json=swift_data).status_code == 400
+    assert test_client.get("/v1/swift-codes/search", params={"prefix": swift_code[:4]}).json()["swift_codes"] == []
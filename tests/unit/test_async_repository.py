@@ -0,0 +1,70 @@
+import json
+import asyncio
+import threading
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import DatabaseManager
+from app.repositories.async_swift_code_repository import AsyncSwiftCodeRepository
+from app.repositories.swift_code_repository import SwiftCodeRepository
+from app.services.swift_service import SwiftCodeService
+
+@pytest.fixture
+def async_repository(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'async.db'}", connect_args={"check_same_thread": False})
+    DatabaseManager.Base.metadata.create_all(bind=engine)
+
+    repository = AsyncSwiftCodeRepository(sessionmaker(autocommit=False, autoflush=False, bind=engine), max_workers=4)
+    yield repository
+    repository.close()
+    engine.dispose()
+
+class TestAsyncSwiftCodeRepository:
+
+    @pytest.mark.asyncio
+    async def test_crud_runs_off_the_event_loop(self, async_repository, sample_swift_data):
+        """Test that repository calls run on the worker pool, not the event loop thread."""
+        loop_thread = threading.get_ident()
+        worker_threads = set()
+        original_call = async_repository._call
+
+        def tracking_call(method_name, *args):
+            worker_threads.add(threading.get_ident())
+            return original_call(method_name, *args)
+
+        async_repository._call = tracking_call
+
+        await async_repository.create_swift_code(sample_swift_data[0])
+        results = await asyncio.gather(*[
+            async_repository.get_swift_code("AAAAUSXXXXX") for _ in range(10)
+        ])
+
+        assert all(result["bank_name"] == "Test Bank HQ" for result in results)
+        assert loop_thread not in worker_threads
+        assert await async_repository.delete_swift_code("AAAAUSXXXXX") == True
+        assert await async_repository.get_swift_code("AAAAUSXXXXX") is None
+
+    @pytest.mark.asyncio
+    async def test_service_over_async_repository(self, async_repository, sample_swift_data):
+        """Test the service awaiting an asynchronous repository."""
+        service = SwiftCodeService(async_repository)
+        await async_repository.bulk_create_swift_codes(sample_swift_data)
+
+        country = await service.get_country_swift_codes("us")
+        assert len(country["swift_codes"]) == 2
+
+        snapshot = await service.refresh_snapshot()
+        assert len(snapshot) == 3
+
+    @pytest.mark.asyncio
+    async def test_stream_country_over_async_repository(self, async_repository, sample_swift_data, monkeypatch):
+        """Test NDJSON streaming pulling batches through the worker pool, with the shared country name map."""
+        service = SwiftCodeService(async_repository)
+        await async_repository.bulk_create_swift_codes(sample_swift_data)
+        monkeypatch.setattr(SwiftCodeRepository, "_load_country_names", lambda repository: pytest.fail("countries reloaded"))
+
+        chunks = [chunk async for chunk in service.stream_country_swift_codes("US")]
+        lines = b"".join(chunks).decode().splitlines()
+
+        assert [json.loads(line)["swift_code"] for line in lines] == ["AAAAUSXX033", "AAAAUSXXXXX"]
+        assert {json.loads(line)["country_name"] for line in lines} == {"UNITED STATES"}
@@ -1,14 +1,17 @@
+import json
 import pytest
 from unittest.mock import MagicMock, patch
 from fastapi import HTTPException
 from unittest.mock import AsyncMock
 from app.models.types import SwiftCodeBase
+from app.repositories.swift_code_repository import SwiftCodeAlreadyExistsError
 
 class TestSwiftCodeController:
     
     def test_validate_swift_code_valid(self, swift_controller):
-        assert swift_controller.validate_swift_code("ABCDEFG123") == True
-        assert swift_controller.validate_swift_code("ABCDXXX") == True
+        assert swift_controller.validate_swift_code("ABCDEFG1123") == True
+        assert swift_controller.validate_swift_code("ABCDEFXXXXX") == True
+        assert swift_controller.validate_swift_code("ABCDEFG1") == True
     
     def test_validate_swift_code_invalid(self, swift_controller):
         with pytest.raises(ValueError):
@@ -19,6 +22,11 @@ class TestSwiftCodeController:
         
         with pytest.raises(ValueError):
             swift_controller.validate_swift_code("ABC DEF12") 
+
+    @pytest.mark.parametrize("swift_code", ["ABCD", "ABCDEFG12", "AAAAPLPWXXXXXX", "1BCDEFXXXXX"])
+    def test_validate_swift_code_rejects_partial_codes(self, swift_controller, swift_code):
+        with pytest.raises(ValueError):
+            swift_controller.validate_swift_code(swift_code)
     
     def test_is_headquarters(self, swift_controller):
         assert swift_controller.is_headquarters("ABCDXXX") == True
@@ -58,7 +66,7 @@ class TestSwiftCodeController:
         swift_controller.swift_service.create_swift_code = AsyncMock()
         
         swift_data = SwiftCodeBase(
-            swift_code="CREATETEST",
+            swift_code="CREATETSXXX",
             bank_name="Create Test Bank",
             address="123 Create St",
             country_iso2="US",
@@ -68,23 +76,17 @@ class TestSwiftCodeController:
         
         result = await swift_controller.create_swift_code(swift_data)
         
-        assert result["message"] == "SWIFT code CREATETEST created successfully"
+        assert result["message"] == "SWIFT code CREATETSXXX created successfully"
         swift_controller.swift_service.create_swift_code.assert_called_once()
     
     @pytest.mark.asyncio
     async def test_create_swift_code_duplicate(self, swift_controller):
-        mock_existing = {
-            "swift_code": "DUPLICATE",
-            "bank_name": "Duplicate Bank",
-            "address": "123 Dupe St",
-            "country_iso2": "US",
-            "country_name": "UNITED STATES",
-            "is_headquarters": True
-        }
-        swift_controller.swift_service.get_swift_code = AsyncMock(return_value=mock_existing)
+        swift_controller.swift_service.create_swift_code = AsyncMock(
+            side_effect=SwiftCodeAlreadyExistsError("Swift code DUPLICTEXXX already exists.")
+        )
         
         swift_data = SwiftCodeBase(
-            swift_code="DUPLICATE",
+            swift_code="DUPLICTEXXX",
             bank_name="New Dupe Bank",
             address="456 Dupe St",
             country_iso2="US",
@@ -95,4 +97,87 @@ class TestSwiftCodeController:
         with pytest.raises(HTTPException) as excinfo:
             await swift_controller.create_swift_code(swift_data)
         
-        assert excinfo.value.status_code == 409
\ No newline at end of file
+        assert excinfo.value.status_code == 409
+
+    @pytest.mark.asyncio
+    async def test_get_swift_code_response_is_cached(self, swift_controller):
+        mock_result = {
+            "swift_code": "CACHETEST",
+            "bank_name": "Cache Bank",
+            "address": "123 Cache St",
+            "country_iso2": "US",
+            "country_name": "UNITED STATES",
+            "is_headquarters": True,
+            "branches": []
+        }
+        swift_controller.swift_service.get_swift_code = AsyncMock(return_value=mock_result)
+
+        first = await swift_controller.get_swift_code_response("cachetest")
+        second = await swift_controller.get_swift_code_response("CACHETEST")
+
+        assert first.media_type == "application/json"
+        assert json.loads(first.body) == mock_result
+        assert second.body == first.body
+        swift_controller.swift_service.get_swift_code.assert_called_once_with("cachetest")
+
+    @pytest.mark.asyncio
+    async def test_get_country_response_invalidated_by_create(self, swift_controller):
+        swift_data = SwiftCodeBase(
+            swift_code="CACHEFRRXXX",
+            bank_name="Cache France",
+            address="1 Rue du Cache",
+            country_iso2="FR",
+            country_name="FRANCE",
+            is_headquarters=True
+        )
+        await swift_controller.create_swift_code(swift_data)
+
+        first = await swift_controller.get_country_swift_codes_response("fr")
+        await swift_controller.create_swift_code(swift_data.model_copy(update={"swift_code": "CACHEFR2XXX"}))
+        second = await swift_controller.get_country_swift_codes_response("FR")
+
+        assert len(json.loads(first.body)["swift_codes"]) == 1
+        assert len(json.loads(second.body)["swift_codes"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_country_response_not_cached(self, swift_controller):
+        response = await swift_controller.get_country_swift_codes_response("zz-random")
+
+        assert json.loads(response.body)["swift_codes"] == []
+        assert swift_controller.swift_service.response_cache.get_country("zz-random") is None
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_swift_codes(self, swift_controller):
+        """Test that a bulk create inserts the valid items together and reports every item."""
+        swift_service = swift_controller.swift_service
+        await swift_service.refresh_snapshot()
+        await swift_controller.create_swift_code(SwiftCodeBase(
+            swift_code="BULKPLPWXXX", bank_name="Bulk HQ", address="1 Street",
+            country_iso2="PL", country_name="POLAND", is_headquarters=True
+        ))
+        branch = {
+            "swift_code": "bulkplpw001", "bank_name": "Bulk Branch", "address": "2 Street",
+            "country_iso2": "pl", "country_name": "Poland", "is_headquarters": False
+        }
+
+        response = await swift_controller.bulk_create_swift_codes([
+            branch,
+            dict(branch, swift_code="BULKDEFFXXX", bank_name="Bulk Germany", country_iso2="DE", is_headquarters=True),
+            dict(branch),
+            dict(branch, swift_code="BULKPLPWXXX"),
+            dict(branch, swift_code="BAD-CODE"),
+            {"swift_code": 42},
+            "not an object"
+        ])
+        result = json.loads(response.body)
+
+        assert (result["created"], result["rejected"]) == (2, 5)
+        assert [item["status"] for item in result["results"]] == [
+            "created", "created", "duplicate", "exists", "invalid", "invalid", "invalid"
+        ]
+        assert result["results"][0]["swift_code"] == "BULKPLPW001"
+        assert [b["swift_code"] for b in swift_service.snapshot.get("BULKPLPWXXX")["branches"]] == ["BULKPLPW001"]
+        assert [r["swift_code"] for r in swift_service.snapshot.search_prefix("BULK", 10)] == [
+            "BULKDEFFXXX", "BULKPLPW001", "BULKPLPWXXX"
+        ]
+        assert (await swift_service.search_bank_name("bulk branch", 5))[0]["swift_code"] == "BULKPLPW001"
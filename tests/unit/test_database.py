@@ -0,0 +1,232 @@
+import os
+import subprocess
+import sys
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.config import Settings
+from app.database import (DatabaseManager, apply_sqlite_pragmas, engine_options, resolve_database_url,
+                          resolve_read_database_url)
+from app.repositories.swift_code_repository import SwiftCodeRepository
+
+class TestDatabaseManager:
+
+    def test_engine_uses_configured_pool(self):
+        """Test that the engine pool honours the pool settings."""
+        pool = DatabaseManager.init_engine().pool
+
+        assert pool.size() == Settings.db_pool_size
+        assert pool._max_overflow == Settings.db_max_overflow
+        assert pool._timeout == Settings.db_pool_timeout
+
+    def test_session_scope_gives_each_request_its_own_session(self):
+        """Test that ScopedSession resolves to a fresh session per request and releases it afterwards."""
+        app = FastAPI()
+        sessions = []
+
+        @app.get("/session", dependencies=[Depends(DatabaseManager.session_scope)])
+        async def session_endpoint():
+            session = DatabaseManager.ScopedSession()
+            assert DatabaseManager.ScopedSession() is session
+            sessions.append(session)
+            return {}
+
+        with TestClient(app) as client:
+            client.get("/session")
+            client.get("/session")
+
+        assert len(sessions) == 2
+        assert sessions[0] is not sessions[1]
+        assert not DatabaseManager.ScopedSession.registry.registry
+
+    def test_database_url_honours_database_path(self, tmp_path, monkeypatch):
+        """Test that DATABASE_PATH selects the SQLite file and DATABASE_URL overrides it."""
+        database_path = tmp_path / "nested" / "swift.db"
+        monkeypatch.setattr(Settings, "database_url", None)
+        monkeypatch.setattr(Settings, "database_path", str(database_path))
+
+        assert resolve_database_url() == f"sqlite:///{database_path}"
+        assert database_path.parent.is_dir()
+
+        monkeypatch.setattr(Settings, "database_url", "sqlite:///:memory:")
+        assert resolve_database_url() == "sqlite:///:memory:"
+
+    @pytest.mark.parametrize("database_url", ["sqlite://", "sqlite:///:memory:"])
+    def test_in_memory_database_url(self, database_url, monkeypatch):
+        """Test that in-memory SQLite URLs get an engine, without the QueuePool sizing they do not accept."""
+        monkeypatch.setattr(Settings, "database_url", database_url)
+        monkeypatch.setattr(DatabaseManager, "engine", None)
+        monkeypatch.setattr(DatabaseManager, "read_engine", None)
+        monkeypatch.setattr(DatabaseManager, "database_url", None)
+        monkeypatch.setattr(DatabaseManager, "read_database_url", None)
+        binds = DatabaseManager.SessionLocal.kw.get("bind"), DatabaseManager.ReadSessionLocal.kw.get("bind")
+
+        try:
+            engine = DatabaseManager.init_engine()
+            assert DatabaseManager.read_engine is engine
+            with engine.connect() as connection:
+                assert connection.exec_driver_sql("SELECT 1").scalar() == 1
+        finally:
+            DatabaseManager.SessionLocal.configure(bind=binds[0])
+            DatabaseManager.ReadSessionLocal.configure(bind=binds[1])
+
+        assert "pool_size" in engine_options("sqlite:///swift.db", 3, 4)
+
+    def test_performance_profile_pragmas(self, tmp_path):
+        """Test that the performance profile is applied on every new connection."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'pragmas.db'}")
+        apply_sqlite_pragmas(engine, "performance")
+
+        with engine.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+            assert connection.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+            assert connection.exec_driver_sql("PRAGMA temp_store").scalar() == 2
+
+        engine.dispose()
+
+    def test_unknown_profile(self):
+        """Test that an unknown profile name is rejected."""
+        with pytest.raises(ValueError) as excinfo:
+            apply_sqlite_pragmas(create_engine("sqlite://"), "turbo")
+
+        assert "Unknown SQLite profile" in str(excinfo.value)
+
+    def test_read_database_url(self):
+        """Test the read-only URL derived from the write URL."""
+        assert resolve_read_database_url("sqlite:////data/swift.db") == "sqlite:///file:/data/swift.db?mode=ro&uri=true"
+        assert resolve_read_database_url("sqlite:///:memory:") is None
+        assert resolve_read_database_url("sqlite://") is None
+        assert resolve_read_database_url("postgresql://db/swift") == "postgresql://db/swift"
+
+    def test_read_engine_is_read_only(self, tmp_path, sample_swift_data):
+        """Test that lookups work through the read-only engine while writes are rejected."""
+        database_path = tmp_path / "split.db"
+        write_engine = create_engine(f"sqlite:///{database_path}")
+        apply_sqlite_pragmas(write_engine, "performance")
+        DatabaseManager.Base.metadata.create_all(bind=write_engine)
+
+        read_engine = create_engine(resolve_read_database_url(f"sqlite:///{database_path}"))
+        apply_sqlite_pragmas(read_engine, "performance", read_only=True)
+
+        write_db = sessionmaker(bind=write_engine)()
+        read_db = sessionmaker(bind=read_engine)()
+        repository = SwiftCodeRepository(write_db, read_db)
+
+        repository.create_swift_code(sample_swift_data[0])
+        assert repository.get_swift_code("AAAAUSXXXXX")["bank_name"] == "Test Bank HQ"
+
+        with pytest.raises(OperationalError):
+            SwiftCodeRepository(read_db).create_swift_code(sample_swift_data[2])
+
+        read_db.close()
+        write_db.close()
+        read_engine.dispose()
+        write_engine.dispose()
+
+    def test_add_missing_columns(self, tmp_path, monkeypatch):
+        """Test that a table created before row_hash existed gets the column added on startup."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "CREATE TABLE swift_codes (swift_code VARCHAR PRIMARY KEY, bank_name VARCHAR NOT NULL, "
+                "address VARCHAR NOT NULL, country_iso2 VARCHAR(2) NOT NULL, country_name VARCHAR NOT NULL, "
+                "is_headquarters BOOLEAN)"
+            )
+            connection.exec_driver_sql("INSERT INTO swift_codes VALUES ('AAAAUSXXXXX', 'Bank', 'Street', 'US', 'UNITED STATES', 1)")
+        monkeypatch.setattr(DatabaseManager, "engine", engine)
+
+        DatabaseManager.create_tables()
+        DatabaseManager.create_tables()
+
+        with engine.connect() as connection:
+            columns = [row[1] for row in connection.exec_driver_sql("PRAGMA table_info(swift_codes)")]
+            assert "row_hash" in columns
+            assert connection.exec_driver_sql("SELECT row_hash FROM swift_codes").scalar() is None
+        engine.dispose()
+
+    def test_move_country_names(self, tmp_path, monkeypatch):
+        """Test that country_name of earlier versions is moved into the countries table on startup."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "CREATE TABLE swift_codes (swift_code VARCHAR PRIMARY KEY, bank_name VARCHAR NOT NULL, "
+                "address VARCHAR NOT NULL, country_iso2 VARCHAR(2) NOT NULL, country_name VARCHAR NOT NULL, "
+                "is_headquarters BOOLEAN, row_hash VARCHAR(40))"
+            )
+            connection.exec_driver_sql(
+                "INSERT INTO swift_codes VALUES ('AAAAUSXXXXX', 'Bank', 'Street', 'US', 'UNITED STATES', 1, NULL), "
+                "('AAAAUSXX033', 'Bank', 'Street', 'US', 'UNITED STATES', 0, NULL), "
+                "('BBBBGBXXXXX', 'Bank', 'Street', 'GB', 'UNITED KINGDOM', 1, NULL)"
+            )
+        monkeypatch.setattr(DatabaseManager, "engine", engine)
+
+        DatabaseManager.create_tables()
+        DatabaseManager.create_tables()
+
+        assert "country_name" not in {column["name"] for column in inspect(engine).get_columns("swift_codes")}
+        db = sessionmaker(bind=engine)()
+        repository = SwiftCodeRepository(db)
+        assert repository.country_names() == {"US": "UNITED STATES", "GB": "UNITED KINGDOM"}
+        assert repository.get_swift_code("AAAAUSXXXXX")["branches"][0]["country_name"] == "UNITED STATES"
+        db.close()
+        engine.dispose()
+
+    def test_move_country_names_without_models_imported(self, tmp_path):
+        """Test that the migration creates the countries table itself when only app.database was imported."""
+        database_path = tmp_path / "legacy.db"
+        engine = create_engine(f"sqlite:///{database_path}")
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "CREATE TABLE swift_codes (swift_code VARCHAR PRIMARY KEY, bank_name VARCHAR NOT NULL, "
+                "address VARCHAR NOT NULL, country_iso2 VARCHAR(2) NOT NULL, country_name VARCHAR NOT NULL, "
+                "is_headquarters BOOLEAN, row_hash VARCHAR(40))"
+            )
+            connection.exec_driver_sql(
+                "INSERT INTO swift_codes VALUES ('AAAAUSXXXXX', 'Bank', 'Street', 'US', 'UNITED STATES', 1, NULL)"
+            )
+        engine.dispose()
+        code = (
+            "from app.database import DatabaseManager\n"
+            "DatabaseManager.init_engine()\n"
+            "DatabaseManager.move_country_names()\n"
+        )
+        subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                       env=dict(os.environ, DATABASE_URL=f"sqlite:///{database_path}"))
+
+        engine = create_engine(f"sqlite:///{database_path}")
+        with engine.connect() as connection:
+            assert connection.exec_driver_sql("SELECT iso2, name FROM countries").all() == [("US", "UNITED STATES")]
+        assert "country_name" not in {column["name"] for column in inspect(engine).get_columns("swift_codes")}
+        engine.dispose()
+
+    def test_drop_retired_tables(self, tmp_path, monkeypatch):
+        """Test that the branch_associations table of earlier versions is dropped on startup."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "CREATE TABLE branch_associations (id VARCHAR PRIMARY KEY, headquarter_swift VARCHAR, branch_swift VARCHAR)"
+            )
+        monkeypatch.setattr(DatabaseManager, "engine", engine)
+
+        DatabaseManager.create_tables()
+        DatabaseManager.create_tables()
+
+        assert not inspect(engine).has_table("branch_associations")
+        assert inspect(engine).has_table("swift_codes")
+        engine.dispose()
+
+    def test_import_is_lazy(self):
+        """Test that importing the app creates no engine and loads no parsing stack."""
+        code = (
+            "import sys, app.main\n"
+            "from app.database import DatabaseManager\n"
+            "assert DatabaseManager.engine is None\n"
+            "print(sorted(m for m in ('pandas', 'numpy', 'openpyxl') if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == "[]"
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import DatabaseManager
+from app.repositories.swift_code_repository import SwiftCodeRepository
+from app.services.dataset_reloader import DatasetReloader
+from app.services.swift_service import SwiftCodeService
+
+HEADER = "COUNTRY ISO2 CODE,SWIFT CODE,NAME,ADDRESS,COUNTRY NAME\n"
+
+@pytest.fixture
+def reloader(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'reload.db'}", connect_args={"check_same_thread": False})
+    DatabaseManager.Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+
+    db = session_factory()
+    data_path = tmp_path / "swift.csv"
+    data_path.write_text(HEADER + "PL,BANKPLPWXXX,Bank HQ,2 Street,Poland\n")
+
+    yield DatasetReloader(SwiftCodeService(SwiftCodeRepository(db)), session_factory, str(data_path), poll_interval=0.01)
+
+    db.close()
+    engine.dispose()
+
+class TestDatasetReloader:
+
+    @pytest.mark.asyncio
+    async def test_reload_swaps_snapshot(self, reloader):
+        """Test that a reload publishes a new snapshot while the old one stays intact for in-flight readers."""
+        first = await reloader.reload()
+        old_snapshot = reloader.swift_service.snapshot
+
+        assert first["status"] == "reloaded"
+        assert first["version"]["row_count"] == 1
+        assert "BANKPLPWXXX" in old_snapshot
+
+        with open(reloader.data_path, "a") as handle:
+            handle.write("PL,BANKPLPW123,Bank Branch,1 Street,Poland\n")
+
+        second = await reloader.reload()
+
+        assert second["changes"]["inserted"] == 1
+        assert second["version"]["version"] != first["version"]["version"]
+        assert [b["swift_code"] for b in reloader.swift_service.snapshot.get("BANKPLPWXXX")["branches"]] == ["BANKPLPW123"]
+        assert "BANKPLPW123" not in old_snapshot
+
+        third = await reloader.reload()
+
+        assert third["status"] == "unchanged"
+        assert third["version"] == second["version"]
+
+    @pytest.mark.asyncio
+    async def test_watch_reloads_changed_file(self, reloader):
+        """Test that the watcher picks up a rewritten file once its mtime settles."""
+        await reloader.reload()
+        reloader.start()
+
+        with open(reloader.data_path, "a") as handle:
+            handle.write("PL,BANKPLPW456,Bank Branch,3 Street,Poland\n")
+        mtime = os.stat(reloader.data_path).st_mtime
+        os.utime(reloader.data_path, (mtime + 5, mtime + 5))
+
+        for _ in range(200):
+            if "BANKPLPW456" in reloader.swift_service.snapshot:
+                break
+            await asyncio.sleep(0.01)
+
+        await reloader.stop()
+        assert "BANKPLPW456" in reloader.swift_service.snapshot
+
+    @pytest.mark.asyncio
+    async def test_start_loads_in_background(self, reloader):
+        """Test that start returns before the load and that progress reports it until ready."""
+        assert not reloader.ready
+        reloader.start()
+        assert reloader.progress()["state"] in ("idle", "loading")
+
+        for _ in range(200):
+            if reloader.ready:
+                break
+            await asyncio.sleep(0.01)
+
+        await reloader.stop()
+        progress = reloader.progress()
+        assert reloader.ready
+        assert progress["state"] == "ready"
+        assert progress["rows_parsed"] == progress["rows_staged"] == progress["rows_applied"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_load_serves_previous_import(self, reloader):
+        """Test that a broken data file at startup falls back to the dataset already in the database."""
+        await reloader.reload()
+        reloader.ready = False
+
+        with open(reloader.data_path, "w") as handle:
+            handle.write("not,a,swift,file\n")
+        await reloader.load()
+
+        assert reloader.ready
+        assert reloader.progress()["state"] == "failed"
+        assert "BANKPLPWXXX" in reloader.swift_service.snapshot
@@ -73,12 +73,12 @@ class TestEdgeCases:
     
     def test_minimum_swift_code_length(self, swift_controller):
         """Test handling of minimum length SWIFT codes."""
-        # Test minimum valid length (4)
-        assert swift_controller.validate_swift_code("ABCD") == True
+        # Test minimum valid length (8, the code without a branch part)
+        assert swift_controller.validate_swift_code("ABCDEFGH") == True
         
         # Test too short
         with pytest.raises(ValueError):
-            swift_controller.validate_swift_code("ABC")
+            swift_controller.validate_swift_code("ABCDEFG")
     
     def test_non_ascii_characters(self, swift_repository):
         """Test handling of non-ASCII characters in data."""
@@ -0,0 +1,63 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from sqlalchemy import create_engine
+from app.database import DatabaseManager
+from app.services.import_jobs import ImportJobManager
+
+UPLOAD = (
+    "COUNTRY ISO2 CODE,SWIFT CODE,NAME,ADDRESS,COUNTRY NAME\n"
+    "PL,BANKPLPWXXX,Bank HQ,2 Street,Poland\n"
+    "PL,BANKPLPW123,Bank Branch,1 Street,Poland\n"
+    "PL,BAD-CODE,Bad Code,4 Street,Poland\n"
+).encode()
+
+@pytest.fixture
+def import_jobs(tmp_path, swift_service):
+    database_url = f"sqlite:///{tmp_path / 'import.db'}"
+    engine = create_engine(database_url)
+    DatabaseManager.Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    manager = ImportJobManager(swift_service, lambda: database_url, lambda: ThreadPoolExecutor(max_workers=1))
+    yield manager
+    manager.executor and manager.executor.shutdown()
+
+async def _read(data: bytes):
+    stream = io.BytesIO(data)
+
+    async def read(size: int) -> bytes:
+        return stream.read(size)
+    return read
+
+class TestImportJobManager:
+
+    @pytest.mark.asyncio
+    async def test_import_job_reports_counts(self, import_jobs, tmp_path):
+        """Test that an upload becomes a job that inserts the valid rows and reports the rejected ones."""
+        job = await import_jobs.submit("codes.csv", await _read(UPLOAD))
+
+        assert job["status"] in ("queued", "running")
+        assert job["size_bytes"] == len(UPLOAD)
+
+        job = await import_jobs.wait(job["job_id"])
+
+        assert job["status"] == "completed"
+        assert (job["row_count"], job["inserted"], job["rejected"], job["linked"]) == (3, 2, 1, 1)
+        assert job["rows_per_second"] > 0
+        assert not list(tmp_path.glob("swift-import-*"))
+
+    @pytest.mark.asyncio
+    async def test_import_rejects_unsupported_files(self, import_jobs):
+        """Test that only CSV and XLSX uploads are accepted."""
+        with pytest.raises(ValueError):
+            await import_jobs.submit("codes.txt", await _read(UPLOAD))
+
+    @pytest.mark.asyncio
+    async def test_failed_import_is_reported(self, import_jobs):
+        """Test that a file missing required columns ends as a failed job with its error."""
+        job = await import_jobs.submit("codes.csv", await _read(b"swift,name\nBANKPLPWXXX,Bank\n"))
+        job = await import_jobs.wait(job["job_id"])
+
+        assert job["status"] == "failed"
+        assert "Required column" in job["error"]
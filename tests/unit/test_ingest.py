@@ -0,0 +1,176 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.orm import sessionmaker
+from app.models.swift_code import SwiftCode
+from app.repositories.swift_code_repository import SwiftCodeRepository
+from app.services.ingest_service import SwiftCodeIngestService
+from app.utils.parser import SwiftCodeParser
+
+class TestSwiftCodeIngestService:
+
+    @pytest.mark.parametrize("fixture_name", ["create_test_csv", "create_test_excel"])
+    def test_iter_frames_chunks(self, request, fixture_name):
+        """Test streaming the source file in bounded chunks."""
+        parser = SwiftCodeParser(request.getfixturevalue(fixture_name))
+
+        chunks = list(parser.iter_records(2))
+
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        assert chunks[0][0]["swift_code"] == "AAAAUSXXXXX"
+        assert chunks[0][0]["country_name"] == "UNITED STATES"
+        assert chunks[1][0]["is_headquarters"] == True
+
+    def test_ingest_links_branches(self, swift_repository, tmp_path):
+        """Test batched ingest; branches resolve to the headquarters sharing their first 8 characters."""
+        file_path = tmp_path / "swift.csv"
+        file_path.write_text(
+            "COUNTRY ISO2 CODE,SWIFT CODE,NAME,ADDRESS,COUNTRY NAME\n"
+            "PL,BANKPLPW123,Bank Branch A,1 Street,Poland\n"
+            "PL,BANKPLPWXXX,Bank HQ,2 Street,Poland\n"
+            "PL,BANKPLPW456,Bank Branch B,3 Street,Poland\n"
+            "PL,ORPHPLPW789,Orphan Branch,4 Street,Poland\n"
+        )
+
+        ingested = SwiftCodeIngestService(swift_repository, batch_size=2).ingest(SwiftCodeParser(str(file_path)))
+
+        assert ingested == 4
+        result = swift_repository.get_swift_code("BANKPLPWXXX")
+        assert sorted(b["swift_code"] for b in result["branches"]) == ["BANKPLPW123", "BANKPLPW456"]
+
+        assert swift_repository.count_branch_links() == 2
+        assert swift_repository.get_headquarter_swift("ORPHPLPW789") is None
+
+    def test_sync_applies_only_changes(self, swift_repository, tmp_path):
+        """Test the diff-based reload: inserts, updates and deletes in one pass, same file skipped."""
+        header = "COUNTRY ISO2 CODE,SWIFT CODE,NAME,ADDRESS,COUNTRY NAME\n"
+        file_path = tmp_path / "swift.csv"
+        file_path.write_text(
+            header +
+            "PL,BANKPLPWXXX,Bank HQ,2 Street,Poland\n"
+            "PL,BANKPLPW123,Bank Branch A,1 Street,Poland\n"
+            "PL,GONEPLPWXXX,Gone HQ,5 Street,Poland\n"
+            "PL,GONEPLPW001,Gone Branch,6 Street,Poland\n"
+        )
+        service = SwiftCodeIngestService(swift_repository, batch_size=2)
+
+        first = service.sync(SwiftCodeParser(str(file_path)))
+
+        assert (first["inserted"], first["updated"], first["deleted"], first["linked"]) == (4, 0, 0, 2)
+        assert service.sync(SwiftCodeParser(str(file_path))) is None
+
+        file_path.write_text(
+            header +
+            "PL,BANKPLPWXXX,Bank HQ Renamed,2 Street,Poland\n"
+            "PL,BANKPLPW123,Bank Branch A,1 Street,Poland\n"
+            "PL,BANKPLPW456,Bank Branch B,3 Street,Poland\n"
+            "PL,GONEPLPW001,Gone Branch,6 Street,Poland\n"
+        )
+
+        second = service.sync(SwiftCodeParser(str(file_path)))
+
+        assert (second["inserted"], second["updated"], second["deleted"], second["linked"]) == (1, 1, 1, 1)
+        result = swift_repository.get_swift_code("BANKPLPWXXX")
+        assert result["bank_name"] == "Bank HQ Renamed"
+        assert sorted(b["swift_code"] for b in result["branches"]) == ["BANKPLPW123", "BANKPLPW456"]
+        assert swift_repository.get_swift_code("GONEPLPWXXX") is None
+        assert swift_repository.get_headquarter_swift("GONEPLPW001") is None
+
+        manifest = swift_repository.get_latest_import_manifest()
+        assert (manifest["row_count"], manifest["inserted"], manifest["updated"], manifest["deleted"]) == (4, 1, 1, 1)
+
+    def test_sync_rejects_invalid_rows(self, swift_repository, tmp_path):
+        """Test that the sync applies the import validation: blank and invalid rows are counted, not stored."""
+        file_path = tmp_path / "swift.csv"
+        file_path.write_text(
+            "COUNTRY ISO2 CODE,SWIFT CODE,NAME,ADDRESS,COUNTRY NAME\n"
+            "PL,BANKPLPWXXX,Bank HQ,2 Street,Poland\n"
+            ",,,,\n"
+            "POL,BAD CODE!,Bad Code,4 Street,Poland\n"
+            "PL,BANKPLPWXXXXXX,Long Code,5 Street,Poland\n"
+        )
+
+        result = SwiftCodeIngestService(swift_repository).sync(SwiftCodeParser(str(file_path), use_snapshot=False))
+
+        assert (result["row_count"], result["inserted"], result["rejected"]) == (4, 1, 3)
+        assert set(swift_repository.db.scalars(select(SwiftCode.swift_code))) == {"BANKPLPWXXX"}
+        assert swift_repository.country_names() == {"PL": "POLAND"}
+
+    def test_sync_rolls_back_on_error(self, swift_repository, sample_swift_data):
+        """Test that a dataset failing midway leaves the table and manifest untouched."""
+        swift_repository.bulk_create_swift_codes(sample_swift_data)
+
+        def batches():
+            yield [dict(sample_swift_data[0], bank_name="Changed")]
+            raise ValueError("broken file")
+
+        with pytest.raises(ValueError):
+            swift_repository.sync_swift_codes(batches(), {"file_path": "x.csv", "checksum": "0" * 64, "started_at": datetime.now()})
+
+        assert swift_repository.get_swift_code("AAAAUSXXXXX")["bank_name"] == "Test Bank HQ"
+        assert swift_repository.get_swift_code("BBBBGBXXXXX") is not None
+        assert swift_repository.get_latest_import_manifest() is None
+
+    def test_sync_leaves_writes_unblocked_while_parsing(self, tmp_path, sample_swift_data):
+        """Test that API writes commit while a sync is still reading its batches, and the staging table goes away."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'swift.db'}", connect_args={"timeout": 0})
+        SwiftCode.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        sync_db, api_db = Session(), Session()
+        api_repository = SwiftCodeRepository(api_db)
+
+        def batches():
+            yield sample_swift_data[:1]
+            api_repository.create_swift_code(sample_swift_data[1])
+            yield sample_swift_data[1:]
+
+        counts = SwiftCodeRepository(sync_db).sync_swift_codes(
+            batches(), {"file_path": "x.csv", "checksum": "0" * 64, "started_at": datetime.now()}
+        )
+
+        assert (counts["inserted"], counts["updated"], counts["deleted"]) == (len(sample_swift_data) - 1, 0, 0)
+        assert api_repository.get_existing_codes([data["swift_code"] for data in sample_swift_data]) == {
+            data["swift_code"] for data in sample_swift_data
+        }
+        assert set(inspect(engine).get_table_names()) == set(SwiftCode.metadata.tables)
+        sync_db.close()
+        api_db.close()
+        engine.dispose()
+
+    def test_sync_reports_staged_rows_as_progress(self, swift_repository, sample_swift_data):
+        """Test that on_batch sees staged rows grow while the file is read, and the applied counts at the end."""
+        progress = []
+
+        swift_repository.sync_swift_codes(
+            [sample_swift_data[:2], sample_swift_data[2:]],
+            {"file_path": "x.csv", "checksum": "0" * 64, "started_at": datetime.now()},
+            progress.append
+        )
+
+        assert [(counts["staged"], counts["inserted"]) for counts in progress] == [(2, 0), (3, 0), (3, 3)]
+
+    def test_import_file_counts_duplicates_and_rejections(self, swift_repository, tmp_path):
+        """Test that an import keeps existing codes, skips invalid rows and reports both."""
+        swift_repository.insert_swift_code_batch([{
+            "swift_code": "BANKPLPWXXX", "bank_name": "Bank HQ", "address": "2 Street",
+            "country_iso2": "PL", "country_name": "POLAND", "is_headquarters": True
+        }])
+        file_path = tmp_path / "upload.csv"
+        file_path.write_text(
+            "COUNTRY ISO2 CODE,SWIFT CODE,NAME,ADDRESS,COUNTRY NAME\n"
+            "PL,BANKPLPW123,Bank Branch,1 Street,Poland\n"
+            "PL,BANKPLPWXXX,Renamed HQ,2 Street,Poland\n"
+            "PL,BANKPLPW123,Bank Branch,1 Street,Poland\n"
+            "POL,BANKPLPW456,Bad Country,3 Street,Poland\n"
+            "PL,BAD-CODE,Bad Code,4 Street,Poland\n"
+        )
+
+        result = SwiftCodeIngestService(swift_repository, batch_size=2).import_file(
+            SwiftCodeParser(str(file_path), use_snapshot=False)
+        )
+
+        assert {key: result[key] for key in ("row_count", "inserted", "duplicates", "rejected", "linked")} == {
+            "row_count": 5, "inserted": 1, "duplicates": 2, "rejected": 2, "linked": 1
+        }
+        assert [rejection["row"] for rejection in result["rejections"]] == [4, 5]
+        assert swift_repository.get_swift_code("BANKPLPWXXX")["bank_name"] == "Bank HQ"
@@ -1,5 +1,8 @@
 import pytest
+from unittest.mock import patch
+from app.utils.binary_snapshot import BinarySnapshot, BinarySnapshotWriter
 from app.utils.parser import SwiftCodeParser
+from app.utils.validation import record_rejection
 
 class TestSwiftCodeParser:
     
@@ -52,6 +55,98 @@ class TestSwiftCodeParser:
         hq_map = parser.get_headquarters_map(swift_data)
         
         assert "AAAAUSXXXXX" in hq_map
-        assert len(hq_map["AAAAUSXXXXX"]) == 0  
+        assert [branch["swift_code"] for branch in hq_map["AAAAUSXXXXX"]] == ["AAAAUSXX033"]
         assert "BBBBGBXXXXX" in hq_map
-        assert len(hq_map["BBBBGBXXXXX"]) == 0
\ No newline at end of file
+        assert len(hq_map["BBBBGBXXXXX"]) == 0
+
+    def test_parse_normalizes_columns(self, tmp_path):
+        """Test column-wise normalization of whitespace, case and missing values."""
+        file_path = tmp_path / "messy.csv"
+        file_path.write_text(
+            "COUNTRY ISO2 CODE,SWIFT CODE,NAME,ADDRESS,COUNTRY NAME\n"
+            " pl ,  bankplpwxxx , Bank Polski ,, poland \n"
+            "PL,bankplpw123,Bank Polski Branch, 1 Street ,Poland\n"
+        )
+
+        parser = SwiftCodeParser(str(file_path))
+        frame = parser.parse_frame()
+        result = parser.parse_files()
+
+        assert list(frame["is_headquarters"]) == [True, False]
+        assert result[0] == {
+            "swift_code": "BANKPLPWXXX",
+            "bank_name": "Bank Polski",
+            "address": "",
+            "country_iso2": "PL",
+            "country_name": "POLAND",
+            "is_headquarters": True
+        }
+        assert result[1]["address"] == "1 Street"
+        assert type(result[1]["is_headquarters"]) is bool
+
+    def test_binary_snapshot_round_trip(self, tmp_path):
+        """Test that a full parse writes a snapshot which later parses read instead of the source."""
+        file_path = tmp_path / "swift.csv"
+        file_path.write_text(
+            "COUNTRY ISO2 CODE,SWIFT CODE,NAME,ADDRESS,COUNTRY NAME\n"
+            "PL,BANKPLPWXXX,Bank Zażółć,\"1 Street, Warsaw\",Poland\n"
+            "PL,BANKPLPW123,Bank Branch,,Poland\n"
+            "DE,DEUTDEFF,Deutsche Bank,2 Straße,Germany\n"
+        )
+        parsed = [record for batch in SwiftCodeParser(str(file_path), use_snapshot=True).iter_records(2) for record in batch]
+
+        assert (tmp_path / "swift.csv.snap").exists()
+
+        parser = SwiftCodeParser(str(file_path), use_snapshot=True)
+        with patch.object(SwiftCodeParser, "iter_frames", side_effect=AssertionError("source re-parsed")):
+            batches = list(parser.iter_records(2))
+
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert [record for batch in batches for record in batch] == parsed
+        assert parsed[0]["bank_name"] == "Bank Zażółć"
+        assert parsed[2]["swift_code"] == "DEUTDEFF"
+
+    def test_binary_snapshot_ignored_when_stale_or_corrupt(self, tmp_path):
+        """Test that a snapshot from another source file or with a bad checksum is not used."""
+        file_path = tmp_path / "swift.csv"
+        file_path.write_text("COUNTRY ISO2 CODE,SWIFT CODE,NAME,ADDRESS,COUNTRY NAME\nPL,BANKPLPWXXX,Bank,1 Street,Poland\n")
+        parser = SwiftCodeParser(str(file_path), use_snapshot=True)
+        list(parser.iter_records(10))
+
+        assert BinarySnapshot.read(parser.snapshot_path, "0" * 64) is None
+
+        data = bytearray((tmp_path / "swift.csv.snap").read_bytes())
+        data[-1] ^= 0xFF
+        (tmp_path / "swift.csv.snap").write_bytes(bytes(data))
+
+        assert BinarySnapshot.read(parser.snapshot_path, parser.checksum()) is None
+        assert list(parser.iter_records(10))[0][0]["bank_name"] == "Bank"
+        assert BinarySnapshot.read(parser.snapshot_path, parser.checksum()) is not None
+
+    def test_binary_snapshot_written_batch_by_batch(self, tmp_path):
+        """Test that a snapshot written batch by batch while parsing matches one written from all records."""
+        file_path = tmp_path / "swift.csv"
+        file_path.write_text(
+            "COUNTRY ISO2 CODE,SWIFT CODE,NAME,ADDRESS,COUNTRY NAME\n" +
+            "".join(f"{iso2},BANK{iso2}PW{i:03d},Bänk {i},{i} Street,{name}\n"
+                    for i, (iso2, name) in enumerate([("PL", "Poland"), ("DE", "Germany")] * 5))
+        )
+        parsed = [record for batch in SwiftCodeParser(str(file_path), use_snapshot=True).iter_records(3) for record in batch]
+
+        BinarySnapshot.write(str(tmp_path / "whole.snap"), parsed, SwiftCodeParser(str(file_path)).checksum())
+
+        assert (tmp_path / "swift.csv.snap").read_bytes() == (tmp_path / "whole.snap").read_bytes()
+        assert not (tmp_path / "swift.csv.snap.tmp").exists()
+
+    def test_binary_snapshot_writer_guards_code_width(self):
+        """Guard only: record_rejection keeps codes over 11 characters out at ingest, so valid data never trips this."""
+        writer = BinarySnapshotWriter()
+        record = {"swift_code": "BANKPLPWXXXTOOLONG", "bank_name": "Bank", "address": "1 Street",
+                  "country_iso2": "PL", "country_name": "POLAND", "is_headquarters": True}
+
+        try:
+            assert record_rejection(record) is not None
+            with pytest.raises(ValueError):
+                writer.add([record])
+        finally:
+            writer.close()
@@ -1,6 +1,6 @@
 import pytest
 from app.models.swift_code import SwiftCode
-from app.models.branch_association import BranchAssociation
+from app.repositories.swift_code_repository import SwiftCodeAlreadyExistsError
 
 class TestSwiftCodeRepository:
     
@@ -47,6 +47,72 @@ class TestSwiftCodeRepository:
         
         assert "already exists" in str(excinfo.value)
     
+    def test_create_links_headquarters(self, swift_repository):
+        """Test that create returns the headquarters it linked the branch to in the same transaction."""
+        hq = {
+            "swift_code": "LINKDEFFXXX",
+            "bank_name": "Link HQ",
+            "address": "1 Link St",
+            "country_iso2": "de",
+            "country_name": "Germany",
+            "is_headquarters": True
+        }
+
+        assert swift_repository.create_swift_code(hq)["headquarter_swift"] is None
+        created = swift_repository.create_swift_code(dict(hq, swift_code="LINKDEFF012", is_headquarters=False))
+
+        assert created["headquarter_swift"] == "LINKDEFFXXX"
+        assert created["country_iso2"] == "DE"
+        assert swift_repository.create_swift_code(dict(hq, swift_code="LONEDEFF012", is_headquarters=False))["headquarter_swift"] is None
+        assert [b["swift_code"] for b in swift_repository.get_swift_code("LINKDEFFXXX")["branches"]] == ["LINKDEFF012"]
+
+    def test_branches_follow_code_prefix(self, swift_repository):
+        """Test that branches are resolved from the first 8 characters, whichever was created first."""
+        branch = {
+            "swift_code": "PRFXDEFF012",
+            "bank_name": "Prefix Branch",
+            "address": "1 Prefix St",
+            "country_iso2": "DE",
+            "country_name": "GERMANY",
+            "is_headquarters": False
+        }
+        swift_repository.create_swift_code(branch)
+        swift_repository.create_swift_code(dict(branch, swift_code="PRFXDEFG012"))
+        swift_repository.create_swift_code(dict(branch, swift_code="PRFXDEFFXXX", is_headquarters=True))
+
+        assert [b["swift_code"] for b in swift_repository.get_swift_code("PRFXDEFFXXX")["branches"]] == ["PRFXDEFF012"]
+        assert swift_repository.get_headquarter_swift("PRFXDEFF012") == "PRFXDEFFXXX"
+        assert swift_repository.get_branch_links() == [("PRFXDEFFXXX", "PRFXDEFF012")]
+
+        swift_repository.delete_swift_code("PRFXDEFFXXX")
+        assert swift_repository.get_headquarter_swift("PRFXDEFF012") is None
+
+    def test_upsert_swift_code(self, swift_repository):
+        """Test create, update, no-op and headquarters-flag change through the upsert."""
+        branch = {
+            "swift_code": "UPSTDEFF012",
+            "bank_name": "Upsert Branch",
+            "address": "1 Upsert St",
+            "country_iso2": "DE",
+            "country_name": "GERMANY",
+            "is_headquarters": False
+        }
+        swift_repository.create_swift_code(dict(branch, swift_code="UPSTDEFFXXX", is_headquarters=True))
+
+        created = swift_repository.upsert_swift_code(branch)
+        assert (created["status"], created["headquarter_swift"], created["previous"]) == ("created", "UPSTDEFFXXX", None)
+        assert swift_repository.upsert_swift_code(branch)["status"] == "unchanged"
+
+        updated = swift_repository.upsert_swift_code(dict(branch, bank_name="Renamed Branch"))
+        assert (updated["status"], updated["headquarter_swift"]) == ("updated", "UPSTDEFFXXX")
+        assert swift_repository.get_swift_code("UPSTDEFF012")["bank_name"] == "Renamed Branch"
+        assert swift_repository.get_headquarter_swift("UPSTDEFF012") == "UPSTDEFFXXX"
+
+        promoted = swift_repository.upsert_swift_code(dict(branch, is_headquarters=True))
+        assert promoted["previous"] == {"is_headquarters": False, "country_iso2": "DE"}
+        assert swift_repository.get_swift_code("UPSTDEFFXXX")["branches"] == []
+        assert swift_repository.get_headquarter_swift("UPSTDEFF012") is None
+
     def test_delete_swift_code(self, swift_repository):
         """Test deleting a SWIFT code."""
         swift_data = {
@@ -70,6 +136,33 @@ class TestSwiftCodeRepository:
         result = swift_repository.delete_swift_code("NONEXISTENT")
         assert result == False
     
+    def test_apply_writes(self, swift_repository):
+        """Test that a batch of writes shares one transaction and reports each operation's own outcome."""
+        hq = {
+            "swift_code": "GRPCDEFFXXX",
+            "bank_name": "Group HQ",
+            "address": "1 Group St",
+            "country_iso2": "DE",
+            "country_name": "GERMANY",
+            "is_headquarters": True
+        }
+        swift_repository.create_swift_code(dict(hq, swift_code="GONEDEXXX"))
+
+        results = swift_repository.apply_writes([
+            ("create", hq),
+            ("create", dict(hq, swift_code="GRPCDEFF012", is_headquarters=False)),
+            ("create", hq),
+            ("delete", "GONEDEXXX"),
+            ("delete", "NONEXISTENT")
+        ])
+
+        assert results[0]["headquarter_swift"] is None
+        assert results[1]["headquarter_swift"] == "GRPCDEFFXXX"
+        assert isinstance(results[2], SwiftCodeAlreadyExistsError)
+        assert results[3:] == [True, False]
+        assert swift_repository.get_swift_code("GONEDEXXX") is None
+        assert [b["swift_code"] for b in swift_repository.get_swift_code("GRPCDEFFXXX")["branches"]] == ["GRPCDEFF012"]
+
     def test_get_country_swift_codes(self, swift_repository):
         """Test getting SWIFT codes by country."""
         swift_data1 = {
@@ -107,11 +200,43 @@ class TestSwiftCodeRepository:
         assert result["country_name"] == ""
         assert len(result["swift_codes"]) == 0
     
+    def test_country_names_stored_once(self, swift_repository):
+        """Test that country names live in the countries table and are joined back into records."""
+        swift_data = {
+            "swift_code": "CNTRDEFFXXX",
+            "bank_name": "Country Bank",
+            "address": "1 Country St",
+            "country_iso2": "DE",
+            "country_name": "Germany",
+            "is_headquarters": True
+        }
+        swift_repository.bulk_create_swift_codes([
+            swift_data,
+            dict(swift_data, swift_code="CNTRDEFF012", is_headquarters=False),
+            dict(swift_data, swift_code="CNTRFRPPXXX", country_iso2="FR", country_name="France")
+        ])
+
+        assert "country_name" not in SwiftCode.__table__.columns
+        assert swift_repository.country_names() == {"DE": "GERMANY", "FR": "FRANCE"}
+        assert swift_repository.get_swift_code("CNTRDEFFXXX")["branches"][0]["country_name"] == "GERMANY"
+        assert {record["country_name"] for record in swift_repository.get_country_swift_codes("DE")["swift_codes"]} == {"GERMANY"}
+
+        created = swift_repository.create_swift_code(dict(swift_data, swift_code="CNTRDEFF345", country_name="Federal Republic of Germany"))
+
+        assert created["country_name"] == "GERMANY"
+        assert swift_repository.get_swift_code("CNTRDEFF012")["country_name"] == "GERMANY"
+        records, country_names = swift_repository.load_snapshot_data()
+        assert "country_name" not in records[0]
+        assert country_names == {"DE": "GERMANY", "FR": "FRANCE"}
+
+        swift_repository.countries.invalidate()
+        assert swift_repository.get_swift_code("CNTRFRPPXXX")["country_name"] == "FRANCE"
+
     def test_bulk_create_swift_codes(self, swift_repository):
         """Test bulk creation of SWIFT codes."""
         swift_data = [
             {
-                "swift_code": "BULK1USXXX",
+                "swift_code": "BULKUSNYXXX",
                 "bank_name": "Bulk Test Bank HQ",
                 "address": "123 Bulk St",
                 "country_iso2": "US",
@@ -119,7 +244,7 @@ class TestSwiftCodeRepository:
                 "is_headquarters": True
             },
             {
-                "swift_code": "BULK1US123",
+                "swift_code": "BULKUSNY123",
                 "bank_name": "Bulk Test Branch",
                 "address": "456 Bulk St",
                 "country_iso2": "US",
@@ -128,15 +253,136 @@ class TestSwiftCodeRepository:
             }
         ]
 
-        branch_map = {"BULK1USXXX": ["BULK1US123"]}
-        
-        swift_repository.bulk_create_swift_codes(swift_data, branch_map)
+        links = swift_repository.bulk_create_swift_codes(swift_data)
+
+        assert links == [("BULKUSNYXXX", "BULKUSNY123")]
 
-        result1 = swift_repository.get_swift_code("BULK1USXXX")
-        result2 = swift_repository.get_swift_code("BULK1US123")
+        result1 = swift_repository.get_swift_code("BULKUSNYXXX")
+        result2 = swift_repository.get_swift_code("BULKUSNY123")
         
         assert result1 is not None
         assert result2 is not None
 
         assert len(result1["branches"]) == 1
-        assert result1["branches"][0]["swift_code"] == "BULK1US123"
\ No newline at end of file
+        assert result1["branches"][0]["swift_code"] == "BULKUSNY123"
+
+    def test_bulk_create_links_existing_headquarters(self, swift_repository):
+        """Test bulk creation resolving HQs from the batch and, failing that, the database."""
+        swift_repository.create_swift_code({
+            "swift_code": "BULKDEFFXXX",
+            "bank_name": "Existing HQ",
+            "address": "1 Bulk St",
+            "country_iso2": "DE",
+            "country_name": "GERMANY",
+            "is_headquarters": True
+        })
+
+        swift_data = [
+            {
+                "swift_code": "BULKDEFF012",
+                "bank_name": "Late Branch",
+                "address": "2 Bulk St",
+                "country_iso2": "DE",
+                "country_name": "GERMANY",
+                "is_headquarters": False
+            },
+            {
+                "swift_code": "NOHQDEFF456",
+                "bank_name": "Branch Without HQ",
+                "address": "3 Bulk St",
+                "country_iso2": "DE",
+                "country_name": "GERMANY",
+                "is_headquarters": False
+            }
+        ]
+
+        links = swift_repository.bulk_create_swift_codes(swift_data)
+
+        result = swift_repository.get_swift_code("BULKDEFFXXX")
+        assert [b["swift_code"] for b in result["branches"]] == ["BULKDEFF012"]
+        assert links == [("BULKDEFFXXX", "BULKDEFF012")]
+        assert swift_repository.count_branch_links() == 1
+        assert swift_repository.count_branch_links({"BULKDEFF012"}) == 1
+        assert swift_repository.count_branch_links({"NOHQDEFF456"}) == 0
+
+    def test_bulk_create_adopts_orphan_branches(self, swift_repository):
+        """Test that a headquarters loaded after its branches adopts them and the link stats follow."""
+        branch = {
+            "swift_code": "ORPHDEFF012",
+            "bank_name": "Orphan Branch",
+            "address": "1 Orphan St",
+            "country_iso2": "DE",
+            "country_name": "GERMANY",
+            "is_headquarters": False
+        }
+        swift_repository.create_swift_code(branch)
+        swift_repository.create_swift_code(dict(branch, swift_code="ORPHDEFF345"))
+        swift_repository.create_swift_code(dict(branch, swift_code="ORPHDEFG012"))
+
+        assert swift_repository.get_branch_link_stats() == {
+            "headquarters": 0, "branches": 3, "linked": 0, "orphaned": 3
+        }
+
+        links = swift_repository.bulk_create_swift_codes([
+            dict(branch, swift_code="ORPHDEFFXXX", is_headquarters=True),
+            dict(branch, swift_code="ORPHDEFF678")
+        ])
+
+        assert sorted(links) == [
+            ("ORPHDEFFXXX", "ORPHDEFF012"), ("ORPHDEFFXXX", "ORPHDEFF345"), ("ORPHDEFFXXX", "ORPHDEFF678")
+        ]
+        assert swift_repository.get_branch_link_stats() == {
+            "headquarters": 1, "branches": 4, "linked": 3, "orphaned": 1
+        }
+
+    def test_bulk_create_is_atomic(self, swift_repository, sample_swift_data):
+        """Test that a failing bulk insert leaves nothing behind."""
+        swift_repository.create_swift_code(sample_swift_data[2])
+
+        with pytest.raises(Exception):
+            swift_repository.bulk_create_swift_codes(sample_swift_data)
+
+        assert swift_repository.get_swift_code("AAAAUSXXXXX") is None
+        assert swift_repository.get_existing_codes(["AAAAUSXXXXX", "BBBBGBXXXXX"]) == {"BBBBGBXXXXX"}
+
+    def test_get_swift_codes_batch(self, swift_repository, sample_swift_data):
+        """Test batch lookup across more codes than fit in one IN query."""
+        swift_repository.bulk_create_swift_codes(sample_swift_data)
+        requested = ["aaaausxxxxx", "BBBBGBXXXXX"] + [f"MISSING{i:04d}" for i in range(600)]
+
+        result = swift_repository.get_swift_codes(requested)
+
+        assert set(result) == {"AAAAUSXXXXX", "BBBBGBXXXXX"}
+        assert [b["swift_code"] for b in result["AAAAUSXXXXX"]["branches"]] == ["AAAAUSXX033"]
+        assert result["BBBBGBXXXXX"]["branches"] == []
+
+    def test_country_pagination_and_streaming(self, swift_repository):
+        """Test keyset pages and batched streaming of a country, ordered by SWIFT code."""
+        codes = ["PAGEPLC3", "PAGEPLA1", "PAGEPLB2", "PAGEPLD4", "PAGEPLE5"]
+        swift_repository.bulk_create_swift_codes([
+            {
+                "swift_code": code,
+                "bank_name": f"Bank {code}",
+                "address": "1 Page St",
+                "country_iso2": "PL",
+                "country_name": "POLAND",
+                "is_headquarters": False
+            }
+            for code in codes
+        ])
+
+        pages = []
+        cursor = None
+        while True:
+            page = swift_repository.get_country_swift_codes_page("pl", 2, cursor)
+            pages.append([entry["swift_code"] for entry in page["swift_codes"]])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert pages == [["PAGEPLA1", "PAGEPLB2"], ["PAGEPLC3", "PAGEPLD4"], ["PAGEPLE5"]]
+        assert page["country_name"] == "POLAND"
+
+        batches = list(swift_repository.iter_country_swift_codes("PL", 2))
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert [entry["swift_code"] for batch in batches for entry in batch] == sorted(codes)
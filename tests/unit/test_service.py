@@ -1,5 +1,9 @@
+import asyncio
 import pytest
 from unittest.mock import MagicMock
+from app.repositories.swift_code_repository import SwiftCodeAlreadyExistsError
+from app.services.swift_service import SwiftCodeService
+from app.services.swift_snapshot import SwiftCodeSnapshot
 
 class TestSwiftCodeService:
     
@@ -47,4 +51,264 @@ class TestSwiftCodeService:
         result = await swift_service.create_swift_code(swift_data)
         
         assert result == mock_result
-        swift_service.swift_code_repository.create_swift_code.assert_called_once_with(swift_data)
\ No newline at end of file
+        swift_service.swift_code_repository.create_swift_code.assert_called_once_with(swift_data)
+
+    @pytest.mark.asyncio
+    async def test_get_swift_code_from_snapshot(self, swift_service, sample_swift_data):
+        swift_service.swift_code_repository.bulk_create_swift_codes(
+            sample_swift_data
+        )
+        await swift_service.refresh_snapshot()
+        swift_service.swift_code_repository.get_swift_code = MagicMock()
+
+        result = await swift_service.get_swift_code("aaaausxxxxx")
+
+        assert result["swift_code"] == "AAAAUSXXXXX"
+        assert [branch["swift_code"] for branch in result["branches"]] == ["AAAAUSXX033"]
+        swift_service.swift_code_repository.get_swift_code.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_snapshot_follows_writes(self, swift_service):
+        await swift_service.refresh_snapshot()
+        hq = {
+            "swift_code": "SNAPDEFFXXX",
+            "bank_name": "Snapshot Bank HQ",
+            "address": "1 Snapshot St",
+            "country_iso2": "de",
+            "country_name": "germany",
+            "is_headquarters": True
+        }
+        branch = dict(hq, swift_code="SNAPDEFF012", bank_name="Snapshot Bank Branch", is_headquarters=False)
+
+        await swift_service.create_swift_code(hq)
+        await swift_service.create_swift_code(branch)
+        old_snapshot = swift_service.snapshot
+
+        result = await swift_service.get_swift_code("SNAPDEFFXXX")
+        assert result["country_name"] == "GERMANY"
+        assert [b["swift_code"] for b in result["branches"]] == ["SNAPDEFF012"]
+
+        assert await swift_service.delete_swift_code("SNAPDEFF012") == True
+        result = await swift_service.get_swift_code("SNAPDEFFXXX")
+        assert result["branches"] == []
+        assert await swift_service.get_swift_code("SNAPDEFF012") is None
+        assert old_snapshot.get("SNAPDEFF012") is not None
+
+    @pytest.mark.asyncio
+    async def test_snapshot_branches_match_repository(self, swift_service):
+        await swift_service.refresh_snapshot()
+        branch = {
+            "swift_code": "ORDRDEFF012",
+            "bank_name": "Early Branch",
+            "address": "1 Order St",
+            "country_iso2": "DE",
+            "country_name": "GERMANY",
+            "is_headquarters": False
+        }
+
+        await swift_service.create_swift_code(branch)
+        await swift_service.create_swift_code(dict(branch, swift_code="ORDRDEFFXXX", bank_name="Late HQ", is_headquarters=True))
+
+        from_snapshot = await swift_service.get_swift_code("ORDRDEFFXXX")
+        assert from_snapshot == swift_service.swift_code_repository.get_swift_code("ORDRDEFFXXX")
+        assert [b["swift_code"] for b in from_snapshot["branches"]] == ["ORDRDEFF012"]
+        assert swift_service.snapshot.headquarter_of("ORDRDEFF012") == "ORDRDEFFXXX"
+
+    @pytest.mark.asyncio
+    async def test_batched_writes(self, swift_repository):
+        service = SwiftCodeService(swift_repository, write_batch_window_ms=50, write_batch_size=3)
+        await service.refresh_snapshot()
+        swift_repository.apply_writes = MagicMock(wraps=swift_repository.apply_writes)
+        hq = {
+            "swift_code": "BTCHDEFFXXX",
+            "bank_name": "Batch HQ",
+            "address": "1 Batch St",
+            "country_iso2": "DE",
+            "country_name": "GERMANY",
+            "is_headquarters": True
+        }
+        branch = dict(hq, swift_code="BTCHDEFF012", bank_name="Batch Branch", is_headquarters=False)
+
+        writes = service._writes
+        results = await asyncio.gather(
+            service.create_swift_code(hq),
+            service.create_swift_code(branch),
+            service.create_swift_code(hq),
+            return_exceptions=True
+        )
+
+        assert swift_repository.apply_writes.call_count == 1
+        assert service._writes == writes + 1
+        assert results[1]["headquarter_swift"] == "BTCHDEFFXXX"
+        assert isinstance(results[2], SwiftCodeAlreadyExistsError)
+        assert [b["swift_code"] for b in (await service.get_swift_code("BTCHDEFFXXX"))["branches"]] == ["BTCHDEFF012"]
+
+        assert await service.delete_swift_code("BTCHDEFF012") == True
+        assert await service.get_swift_code("BTCHDEFF012") is None
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_upsert_follows_snapshot(self, swift_service):
+        await swift_service.refresh_snapshot()
+        hq = {
+            "swift_code": "UPSNDEFFXXX",
+            "bank_name": "Upsert HQ",
+            "address": "1 Upsert St",
+            "country_iso2": "DE",
+            "country_name": "GERMANY",
+            "is_headquarters": True
+        }
+        branch = dict(hq, swift_code="UPSNDEFF012", bank_name="Upsert Branch", is_headquarters=False)
+
+        assert await swift_service.upsert_swift_code(hq) == "created"
+        assert await swift_service.upsert_swift_code(branch) == "created"
+        assert await swift_service.upsert_swift_code(dict(branch, bank_name="Moved Branch", country_iso2="AT")) == "updated"
+
+        result = await swift_service.get_swift_code("UPSNDEFFXXX")
+        assert [(b["swift_code"], b["bank_name"], b["country_iso2"]) for b in result["branches"]] == [
+            ("UPSNDEFF012", "Moved Branch", "AT")
+        ]
+        assert (await swift_service.search_bank_name("moved", 5))[0]["swift_code"] == "UPSNDEFF012"
+
+        cache = swift_service.response_cache
+        cache.put_swift_code("UPSNDEFFXXX", await swift_service.get_swift_code("UPSNDEFFXXX"), cache.generation)
+
+        assert await swift_service.upsert_swift_code(dict(branch, is_headquarters=True)) == "updated"
+        assert cache.get_swift_code("UPSNDEFFXXX") is None
+        assert (await swift_service.get_swift_code("UPSNDEFFXXX"))["branches"] == []
+
+    @pytest.mark.asyncio
+    async def test_write_keeps_stored_country_name(self, swift_service):
+        await swift_service.refresh_snapshot()
+        hq = {
+            "swift_code": "RNAMDEFFXXX",
+            "bank_name": "Rename HQ",
+            "address": "1 Rename St",
+            "country_iso2": "DE",
+            "country_name": "GERMANY",
+            "is_headquarters": True
+        }
+        await swift_service.create_swift_code(hq)
+        cache = swift_service.response_cache
+        cache.put_swift_code("RNAMDEFFXXX", await swift_service.get_swift_code("RNAMDEFFXXX"), cache.generation)
+
+        created = await swift_service.create_swift_code(dict(hq, swift_code="RNAMDEFG012", country_name="Deutschland", is_headquarters=False))
+        await swift_service.bulk_create_swift_codes([dict(hq, swift_code="RNAMDEFH012", country_name="Allemagne", is_headquarters=False)])
+
+        assert created["country_name"] == "GERMANY"
+        assert cache.get_swift_code("RNAMDEFFXXX") is not None
+        for swift_code in ("RNAMDEFFXXX", "RNAMDEFG012", "RNAMDEFH012"):
+            result = await swift_service.get_swift_code(swift_code)
+            assert result["country_name"] == "GERMANY"
+            assert result == swift_service.swift_code_repository.get_swift_code(swift_code)
+
+        await swift_service.refresh_snapshot()
+        assert (await swift_service.get_swift_code("RNAMDEFG012"))["country_name"] == "GERMANY"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_snapshot", [False, True])
+    async def test_get_swift_codes(self, swift_service, sample_swift_data, use_snapshot):
+        swift_service.swift_code_repository.bulk_create_swift_codes(
+            sample_swift_data
+        )
+        if use_snapshot:
+            await swift_service.refresh_snapshot()
+
+        result = await swift_service.get_swift_codes(["bbbbgbxxxxx", "NOPE1234", "AAAAUSXXXXX", "BBBBGBXXXXX"])
+
+        assert [r["swift_code"] for r in result["swift_codes"]] == ["BBBBGBXXXXX", "AAAAUSXXXXX"]
+        assert len(result["swift_codes"][1]["branches"]) == 1
+        assert result["missing"] == ["NOPE1234"]
+
+    @pytest.mark.asyncio
+    async def test_search_prefix_follows_writes(self, swift_service, sample_swift_data):
+        swift_service.swift_code_repository.bulk_create_swift_codes(sample_swift_data)
+
+        result = await swift_service.search_prefix("aaaa", 10)
+        assert [r["swift_code"] for r in result] == ["AAAAUSXX033", "AAAAUSXXXXX"]
+
+        await swift_service.create_swift_code(dict(sample_swift_data[0], swift_code="AAAAUS12"))
+        await swift_service.delete_swift_code("AAAAUSXX033")
+
+        result = await swift_service.search_prefix("AAAAUS", 10)
+        assert [r["swift_code"] for r in result] == ["AAAAUS12", "AAAAUSXXXXX"]
+        assert [r["swift_code"] for r in await swift_service.search_prefix("AAAAUS", 1)] == ["AAAAUS12"]
+        assert await swift_service.search_prefix("ZZZZ", 10) == []
+
+    @pytest.mark.asyncio
+    async def test_search_bank_name(self, swift_service, sample_swift_data):
+        swift_service.swift_code_repository.bulk_create_swift_codes(sample_swift_data)
+
+        result = await swift_service.search_bank_name("test bank", 10)
+        assert [r["swift_code"] for r in result] == ["AAAAUSXXXXX", "AAAAUSXX033"]
+        assert [r["score"] for r in result] == [1.0, 1.0]
+
+        result = await swift_service.search_bank_name("euro bnk", 10)
+        assert [r["swift_code"] for r in result] == ["BBBBGBXXXXX"]
+        assert 0 < result[0]["score"] < 1
+
+        assert await swift_service.search_bank_name("bank", 10, "gb") == [
+            dict(sample_swift_data[2], score=1.0)
+        ]
+        assert len(await swift_service.search_bank_name("bank", 1)) == 1
+
+    @pytest.mark.asyncio
+    async def test_search_bank_name_follows_writes(self, swift_service, sample_swift_data):
+        swift_service.swift_code_repository.bulk_create_swift_codes(sample_swift_data)
+        await swift_service.refresh_snapshot()
+
+        await swift_service.create_swift_code(dict(sample_swift_data[2], swift_code="CCCCGBXXXXX", bank_name="Santander UK"))
+        await swift_service.delete_swift_code("BBBBGBXXXXX")
+
+        assert [r["swift_code"] for r in await swift_service.search_bank_name("santandr", 10)] == ["CCCCGBXXXXX"]
+        assert await swift_service.search_bank_name("euro", 10) == []
+
+    @pytest.mark.asyncio
+    async def test_snapshot_overlay_compaction(self, swift_service, sample_swift_data, monkeypatch):
+        monkeypatch.setattr(SwiftCodeSnapshot, "OVERLAY_LIMIT", 2)
+        swift_service.swift_code_repository.bulk_create_swift_codes(sample_swift_data)
+        await swift_service.refresh_snapshot()
+        base = swift_service.snapshot
+
+        await swift_service.create_swift_code(dict(sample_swift_data[1], swift_code="AAAAUSXX044"))
+        await swift_service.delete_swift_code("AAAAUSXX033")
+        assert swift_service.snapshot._records is base._records
+        assert base.get("AAAAUSXX033") is not None
+
+        await swift_service.create_swift_code(dict(sample_swift_data[2], swift_code="CCCCGBXXXXX"))
+        compaction = swift_service._compaction
+        # Published while the compaction runs; carried over onto the compacted base.
+        await swift_service.delete_swift_code("BBBBGBXXXXX")
+        await compaction
+
+        snapshot = swift_service.snapshot
+        assert snapshot._records is not base._records
+        assert "AAAAUSXX033" not in snapshot._records
+        assert list(snapshot._overlay) == ["BBBBGBXXXXX"]
+        assert len(snapshot) == 3
+        assert [b["swift_code"] for b in snapshot.get("AAAAUSXXXXX")["branches"]] == ["AAAAUSXX044"]
+        assert [r["swift_code"] for r in snapshot.search_prefix("", 10)] == ["AAAAUSXX044", "AAAAUSXXXXX", "CCCCGBXXXXX"]
+        await swift_service.close()
+
+    @pytest.mark.asyncio
+    async def test_search_on_empty_dataset_keeps_snapshot(self, swift_service):
+        swift_service.swift_code_repository.load_snapshot_data = MagicMock(
+            wraps=swift_service.swift_code_repository.load_snapshot_data
+        )
+
+        for prefix in ("AAAA", "BBBB", "CCCC"):
+            assert await swift_service.search_prefix(prefix, 10) == []
+
+        assert swift_service.swift_code_repository.load_snapshot_data.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_relink_only_counts(self, swift_service, sample_swift_data):
+        await swift_service.bulk_create_swift_codes(sample_swift_data)
+        await swift_service.refresh_snapshot()
+        snapshot = swift_service.snapshot
+
+        stats = await swift_service.relink_branches()
+
+        assert stats["linked"] == swift_service.swift_code_repository.count_branch_links()
+        assert "elapsed_seconds" in stats
+        assert swift_service.snapshot is snapshot
@@ -0,0 +1,52 @@
+from app.utils.trigram_index import TrigramIndex
+
+
+class TestTrigramIndex:
+
+    def test_trigrams_are_padded_per_word(self):
+        assert TrigramIndex.words("Ab-C ab") == ("ab", "c")
+        assert TrigramIndex.trigrams("Ab-C") == {"  a", " ab", "ab ", "  c", " c "}
+        assert TrigramIndex.trigrams("") == frozenset()
+
+    def test_search_ranks_closer_matches_first(self):
+        index = TrigramIndex()
+        index.add("1", "Deutsche Bank AG")
+        index.add("2", "Deutsche Bundesbank")
+        index.add("3", "Banco Santander")
+
+        result = index.search("deutsche bank", 10)
+
+        assert result[0] == ("1", 1.0)
+        assert result[1][0] == "2" and result[1][1] < 1
+        assert index.search("santnder", 10)[0][0] == "3"
+        assert [doc_id for doc_id, _ in index.search("deut", 10)] == ["1", "2"]
+        assert index.search("deutsche xyz", 10) == []
+
+    def test_accept_filter_and_limit(self):
+        index = TrigramIndex()
+        for doc_id in ("1", "2", "3"):
+            index.add(doc_id, "Common Bank " * int(doc_id))
+
+        assert [doc_id for doc_id, _ in index.search("common", 2)] == ["1", "2"]
+        assert index.search("common", 10, accept=lambda doc_id: doc_id == "3") == [("3", 1.0)]
+
+    def test_add_replaces_and_remove_drops(self):
+        index = TrigramIndex()
+        index.add("1", "Old Name")
+        index.add("1", "New Name")
+
+        assert index.search("old", 10) == []
+        assert index.search("new", 10) == [("1", 1.0)]
+
+        index.remove("1")
+        index.remove("missing")
+
+        assert len(index) == 0
+        assert index.search("new", 10) == []
+
+    def test_build_requires_every_query_word(self):
+        index = TrigramIndex.build([("1", "First National Bank"), ("2", "National Savings"), ("3", "First Credit Union")])
+
+        assert len(index) == 3
+        assert [doc_id for doc_id, _ in index.search("national", 10)] == ["2", "1"]
+        assert [doc_id for doc_id, _ in index.search("firts nationl", 10)] == ["1"]